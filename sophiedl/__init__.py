@@ -4,23 +4,55 @@ from .agent.AgentDiscreteActorCritic import AgentDiscreteActorCritic
 from .agent.AgentDQN import AgentDQN
 from .agent.AgentPGO import AgentPGO
 from .agent.EpsilonGreedyStrategy import EpsilonGreedyStrategy
+from .agent.LearnScheduler import LearnScheduler
+from .agent.returns import discounted_returns, generalized_advantage_estimates
 from .domain.exceptions import TreeVerificationError, LexingError
+from .domain.FrameStack import FrameRing, FrameStack
 from .domain.Repr import Repr
 from .domain.Shape import Shape
 from .environment.EnvironmentBase import EnvironmentBase
 from .environment.EnvironmentGymWrapper import EnvironmentGymWrapper
+from .environment.EnvironmentRemote import EnvironmentRemote
+from .environment.EnvironmentRemoteServer import EnvironmentRemoteServer
+from .environment.EnvironmentTraceReplay import EnvironmentTraceReplay
 from .environment.EnvironmentTransformBase import EnvironmentTransformBase
 from .environment.EnvironmentTransformCopyNDArray import EnvironmentTransformCopyNDArray
+from .environment.EnvironmentTransformCrop import EnvironmentTransformCrop
+from .environment.EnvironmentTransformFrameStack import EnvironmentTransformFrameStack
+from .environment.EnvironmentTransformFused import EnvironmentTransformFused
+from .environment.EnvironmentTransformGrayscale import EnvironmentTransformGrayscale
+from .environment.EnvironmentTransformObservationBase import EnvironmentTransformObservationBase
 from .environment.EnvironmentTransformPyTorchTransforms import EnvironmentTransformPyTorchTransforms
+from .environment.EnvironmentTransformRecordTrace import EnvironmentTransformRecordTrace
+from .environment.EnvironmentTransformResetPool import EnvironmentTransformResetPool
+from .environment.EnvironmentTransformResize import EnvironmentTransformResize
 from .environment.EnvironmentTransformSkipFrames import EnvironmentTransformSkipFrames
+from .environment.EnvironmentVectorBase import EnvironmentVectorBase
+from .environment.EnvironmentVectorCartPole import EnvironmentVectorCartPole
+from .environment.EnvironmentVectorMountainCarContinuous import EnvironmentVectorMountainCarContinuous
+from .environment.EnvironmentVectorNumPyBase import EnvironmentVectorNumPyBase
+from .environment.EnvironmentVectorRemote import EnvironmentVectorRemote
+from .environment.EnvironmentVectorSubprocess import EnvironmentVectorSubprocess
 from .hyperparameters.Hyperparameter import Hyperparameter
 from .hyperparameters.HyperparameterSet import HyperparameterSet
 from .memory.Memory import Memory
 from .memory.MemoryBuffer import MemoryBuffer
+from .memory.MemoryBufferBase import MemoryBufferBase
+from .memory.MemoryFrameReplayBuffer import MemoryFrameReplayBuffer
+from .memory.MemoryFrameStackReplayBuffer import MemoryFrameStackReplayBuffer
+from .memory.MemoryMappedFrameReplayBuffer import MemoryMappedFrameReplayBuffer
+from .memory.MemoryMappedReplayBuffer import MemoryMappedReplayBuffer
+from .memory.MemoryPrioritizedFrameReplayBuffer import MemoryPrioritizedFrameReplayBuffer
+from .memory.MemoryPrioritizedFrameStackReplayBuffer import MemoryPrioritizedFrameStackReplayBuffer
+from .memory.MemoryPrioritizedReplayBuffer import MemoryPrioritizedReplayBuffer
+from .memory.MemoryReplayBuffer import MemoryReplayBuffer
+from .memory.SumTree import SumTree
 from .network.CNNCell import CNNCell
 from .network.LSTMCell import LSTMCell
 from .network.OptimizedModule import OptimizedModule
 from .network.OptimizedSequential import OptimizedSequential
+from .network.Scale import Scale
+from .network.SharedParameters import SharedParameters
 from .parsing.LexerBase import LexerBase
 from .parsing.TextReaderBase import TextReaderBase
 from .parsing.TextReaderString import TextReaderString
@@ -37,6 +69,7 @@ from .runner_factory.network.RunnerNetworkTorchDataLoaderFactoryMNIST import Run
 from .runner_factory.network.RunnerNetworkTreeToNLPresentationFactory import RunnerNetworkTreeToNLPresentationFactory
 from .runner_factory.pgo.RunnerRLFactoryPGOLunarLanderV2 import RunnerRLFactoryPGOLunarLanderV2
 from .runner_factory.rnn.RunnerRNNTorchDataLoaderFactoryText import RunnerRNNTorchDataLoaderFactoryText
+from .running.RolloutPool import RolloutPool, RolloutTrajectories
 from .running.RunnerBase import RunnerBase
 from .running.RunnerContextBase import RunnerContextBase
 from .running.RunnerNetworkBase import RunnerNetworkBase
@@ -44,3 +77,5 @@ from .running.RunnerNetworkTorchDataLoader import RunnerNetworkTorchDataLoader
 from .running.RunnerNetworkTreeToNLPresentation import RunnerNetworkTreeToNLPresentation
 from .running.RunnerRL import RunnerRL
 from .running.RunnerRLContext import RunnerRLContext
+from .running.RunnerRLDistributed import RunnerRLDistributed
+from .running.RunnerRLRolloutPool import RunnerRLRolloutPool
@@ -2,26 +2,42 @@
 import abc
 
 # Typing
-from typing import cast, Optional, Tuple, Union
+from typing import cast, List, Optional, Tuple, Union
 
 # PyTorch
 import torch as T
 
 # Internal
 from ..memory.MemoryBuffer import MemoryBuffer
+from ..memory.MemoryBufferBase import MemoryBufferBase
+from ..network.OptimizedModule import OptimizedModule
 from ..running.RunnerRLContext import RunnerRLContext
 from ..hyperparameters.HyperparameterSet import HyperparameterSet
 
 class AgentBase(abc.ABC):
     hyperparameter_set: HyperparameterSet
-    memory_buffer: MemoryBuffer
+    memory_buffer: MemoryBufferBase
 
     def __init__(
         self,
-        hyperparameter_set: HyperparameterSet):
+        hyperparameter_set: HyperparameterSet,
+        memory_buffer: Optional[MemoryBufferBase] = None):
         self.hyperparameter_set = hyperparameter_set
-        self.memory_buffer = MemoryBuffer()
+        self.memory_buffer = memory_buffer if memory_buffer is not None else MemoryBuffer()
     
+    @property
+    def acting_networks(self) -> List[OptimizedModule]:
+        return self.on_get_acting_networks()
+
+    @property
+    def recompute_log_probabilities(self) -> bool:
+        return "recompute_log_probabilities" in self.hyperparameter_set and bool(self.hyperparameter_set["recompute_log_probabilities"])
+
+    def on_get_acting_networks(self) -> List[OptimizedModule]:
+        # The networks act() depends on, which copies of the agent acting
+        # elsewhere keep in sync.
+        return []
+
     @abc.abstractmethod
     def on_act(
         self,
@@ -29,6 +45,13 @@ class AgentBase(abc.ABC):
         observation: T.Tensor) -> Tuple[Union[T.Tensor, float], Optional[T.Tensor]]:
         pass
 
+    @abc.abstractmethod
+    def on_act_batch(
+        self,
+        runner_context: RunnerRLContext,
+        observations: T.Tensor) -> Tuple[T.Tensor, Optional[T.Tensor]]:
+        pass
+
     @abc.abstractmethod
     def on_should_learn(
         self,
@@ -61,12 +84,49 @@ class AgentBase(abc.ABC):
         self,
         reward: float,
         observation: T.Tensor,
-        done: bool) -> None:
+        done: bool,
+        truncated: bool = False) -> None:
         self.memory_buffer.add_observation_next(observation)
         self.memory_buffer.add_reward(reward)
         self.memory_buffer.add_done(done)
+        self.memory_buffer.add_truncated(truncated)
         self.memory_buffer.push()
 
+    def act_batch(
+        self,
+        runner_context: RunnerRLContext,
+        observations: T.Tensor,
+        environment_indices: Optional[T.Tensor] = None) -> T.Tensor:
+        observations = T.as_tensor(observations)
+
+        actions, action_samples = self.on_act_batch(runner_context, observations)
+
+        self.memory_buffer.add_batch(
+            environment_indices if environment_indices is not None else T.arange(observations.shape[0]),
+            observations,
+            actions,
+            action_samples
+        )
+
+        return actions
+
+    def reward_batch(
+        self,
+        rewards: T.Tensor,
+        observations: T.Tensor,
+        dones: T.Tensor,
+        environment_indices: Optional[T.Tensor] = None,
+        truncations: Optional[T.Tensor] = None) -> None:
+        observations = T.as_tensor(observations)
+
+        self.memory_buffer.push_batch(
+            environment_indices if environment_indices is not None else T.arange(observations.shape[0]),
+            T.as_tensor(rewards, dtype = T.float32),
+            observations,
+            T.as_tensor(dones, dtype = T.bool),
+            truncations = truncations
+        )
+
     def learn(
         self,
         runner_context: RunnerRLContext) -> None:
@@ -74,4 +134,7 @@ class AgentBase(abc.ABC):
             self.on_learn(runner_context)
 
     def clear_memory(self) -> None:
-        del self.memory_buffer[:]
+        self.memory_buffer.clear()
+
+    def close(self) -> None:
+        self.memory_buffer.close()
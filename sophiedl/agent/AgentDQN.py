@@ -1,8 +1,10 @@
 # Standard library
+import contextlib
 import random
+import threading
 
 # Typing
-from typing import Tuple
+from typing import Any, ContextManager, Dict, List, Optional, Tuple, Type
 
 # PyTorch
 import torch as T
@@ -10,47 +12,169 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 # Internal
+from ..domain.FrameStack import FrameStack
 from ..hyperparameters.HyperparameterSet import HyperparameterSet
+from ..memory.MemoryFrameReplayBuffer import MemoryFrameReplayBuffer
+from ..memory.MemoryFrameStackReplayBuffer import MemoryFrameStackReplayBuffer
+from ..memory.MemoryPrioritizedFrameReplayBuffer import MemoryPrioritizedFrameReplayBuffer
+from ..memory.MemoryPrioritizedFrameStackReplayBuffer import MemoryPrioritizedFrameStackReplayBuffer
+from ..memory.MemoryPrioritizedReplayBuffer import MemoryPrioritizedReplayBuffer
+from ..memory.MemoryReplayBuffer import MemoryReplayBuffer
 from ..network.OptimizedModule import OptimizedModule
 from ..running.RunnerRLContext import RunnerRLContext
 from .AgentBase import AgentBase
 from .EpsilonGreedyStrategy import EpsilonGreedyStrategy
+from .LearnScheduler import LearnScheduler
 
 class AgentDQN(AgentBase):
+    memory_buffer: MemoryReplayBuffer
     policy_network: OptimizedModule
     target_network: OptimizedModule
     epsilon_greedy_strategy: EpsilonGreedyStrategy
+    learn_scheduler: LearnScheduler
+    learn_step_count: int
+    _parameters_lock: ContextManager[Any]
+    _learner: Optional[threading.Thread]
+    _learner_condition: threading.Condition
+    _learner_stopping: bool
+    _learner_error: Optional[BaseException]
+    _learn_step_budget: float
+    _target_update_pending: bool
     
     def __init__(
         self,
         policy_network: OptimizedModule,
         target_network: OptimizedModule,
         epsilon_greedy_strategy: EpsilonGreedyStrategy,
-        hyperparameter_set: HyperparameterSet):
+        hyperparameter_set: HyperparameterSet,
+        memory_buffer: Optional[MemoryReplayBuffer] = None,
+        learn_scheduler: Optional[LearnScheduler] = None):
         super().__init__(
-            hyperparameter_set
+            hyperparameter_set,
+            memory_buffer if memory_buffer is not None else self._create_memory_buffer(hyperparameter_set)
         )
 
         self.policy_network = policy_network
         self.target_network = target_network
         self.epsilon_greedy_strategy = epsilon_greedy_strategy
+        self.learn_scheduler = learn_scheduler if learn_scheduler is not None else self._create_learn_scheduler(hyperparameter_set)
         self._explore_count = 0
         self._exploit_count = 0
+        self.learn_step_count = 0
 
         self.target_network.load_state_dict(self.policy_network.state_dict())
         self.target_network.eval()
+
+        # With a learner thread, acting only pushes transitions and the
+        # gradient steps run next to it. Both threads use the policy network,
+        # so the optimizer only changes its parameters while nothing acts.
+        if self.learner_thread:
+            self._parameters_lock = threading.Lock()
+        else:
+            self._parameters_lock = contextlib.nullcontext()
+
+        self._learner = None
+        self._learner_condition = threading.Condition()
+        self._learner_stopping = False
+        self._learner_error = None
+        self._learn_step_budget = 0.
+        self._target_update_pending = False
+
+        if self.learner_thread:
+            self.memory_buffer.make_thread_safe()
     
+    @staticmethod
+    def _create_memory_buffer(hyperparameter_set: HyperparameterSet) -> MemoryReplayBuffer:
+        capacity = hyperparameter_set["memory_capacity"] if "memory_capacity" in hyperparameter_set else 100000
+        prioritized = "memory_prioritized" in hyperparameter_set and bool(hyperparameter_set["memory_prioritized"])
+        frame_deduplication = "memory_frame_deduplication" in hyperparameter_set and bool(hyperparameter_set["memory_frame_deduplication"])
+        frame_stacking = hyperparameter_set["memory_frame_stacking"] if "memory_frame_stacking" in hyperparameter_set else 1
+
+        # Prioritization only decides which transitions are sampled, so it
+        # combines with either way of storing the frames, but those two are
+        # alternatives.
+        if frame_deduplication and frame_stacking > 1:
+            raise Exception("memory_frame_deduplication and memory_frame_stacking cannot be combined")
+
+        kwargs: Dict[str, Any] = {}
+
+        if prioritized:
+            kwargs.update(
+                alpha = hyperparameter_set["memory_priority_alpha"] if "memory_priority_alpha" in hyperparameter_set else 0.6,
+                beta = hyperparameter_set["memory_priority_beta"] if "memory_priority_beta" in hyperparameter_set else 0.4,
+                beta_increment = hyperparameter_set["memory_priority_beta_increment"] if "memory_priority_beta_increment" in hyperparameter_set else 0.
+            )
+
+        if frame_deduplication:
+            frame_buffer_type: Type[MemoryFrameReplayBuffer] = MemoryPrioritizedFrameReplayBuffer if prioritized else MemoryFrameReplayBuffer
+
+            return frame_buffer_type(capacity, **kwargs)
+        elif frame_stacking > 1:
+            frame_stack_buffer_type: Type[MemoryFrameStackReplayBuffer] = MemoryPrioritizedFrameStackReplayBuffer if prioritized else MemoryFrameStackReplayBuffer
+
+            return frame_stack_buffer_type(
+                capacity,
+                stack_count = frame_stacking,
+                frame_capacity = hyperparameter_set["memory_frame_capacity"] if "memory_frame_capacity" in hyperparameter_set else None,
+                **kwargs
+            )
+        else:
+            buffer_type: Type[MemoryReplayBuffer] = MemoryPrioritizedReplayBuffer if prioritized else MemoryReplayBuffer
+
+            return buffer_type(capacity, **kwargs)
+
+    @property
+    def learner_thread(self) -> bool:
+        return "learner_thread" in self.hyperparameter_set and bool(self.hyperparameter_set["learner_thread"])
+
+    @staticmethod
+    def _create_learn_scheduler(hyperparameter_set: HyperparameterSet) -> LearnScheduler:
+        # By default one gradient step follows every call to learn once there
+        # are enough transitions for a batch, which with vector environments
+        # covers a whole batch of environment steps. Setting learn_interval
+        # ties learning to the number of environment steps instead.
+        return LearnScheduler(
+            interval = hyperparameter_set["learn_interval"] if "learn_interval" in hyperparameter_set else None,
+            gradient_steps = hyperparameter_set["learn_gradient_steps"] if "learn_gradient_steps" in hyperparameter_set else 1,
+            start_steps = hyperparameter_set["learn_start_steps"] if "learn_start_steps" in hyperparameter_set else hyperparameter_set["memory_batch_size"],
+            start_memory = hyperparameter_set["learn_start_memory"] if "learn_start_memory" in hyperparameter_set else hyperparameter_set["memory_batch_size"],
+            target_fraction = hyperparameter_set["learn_target_fraction"] if "learn_target_fraction" in hyperparameter_set else None,
+            gradient_steps_min = hyperparameter_set["learn_gradient_steps_min"] if "learn_gradient_steps_min" in hyperparameter_set else 0.1,
+            gradient_steps_max = hyperparameter_set["learn_gradient_steps_max"] if "learn_gradient_steps_max" in hyperparameter_set else 64
+        )
+
+    def on_get_acting_networks(self) -> List[OptimizedModule]:
+        return [self.policy_network]
+
     def on_act(self, runner_context: RunnerRLContext, observation: T.Tensor) -> Tuple[int, None]:
         if self.epsilon_greedy_strategy.should_explore(runner_context):
             self._explore_count += 1
             return random.randint(0, runner_context.environment.action_space_shape.flat_size - 1), None
         else:
             self._exploit_count += 1
-            with T.no_grad(): # type: ignore
+            with T.no_grad(), self._parameters_lock: # type: ignore
                 return self.policy_network(
-                    T.as_tensor(observation, dtype = T.float32).to(self.policy_network.device).unsqueeze(dim = 0)
+                    T.as_tensor(FrameStack.materialize(observation), dtype = T.float32).to(self.policy_network.device).unsqueeze(dim = 0)
                 ).argmax().item(), None
     
+    def on_act_batch(self, runner_context: RunnerRLContext, observations: T.Tensor) -> Tuple[T.Tensor, None]:
+        explore = self.epsilon_greedy_strategy.should_explore_batch(runner_context, observations.shape[0])
+
+        explore_count = int(explore.sum().item())
+        self._explore_count += explore_count
+        self._exploit_count += observations.shape[0] - explore_count
+
+        with T.no_grad(), self._parameters_lock: # type: ignore
+            actions = self.policy_network(
+                T.as_tensor(observations, dtype = T.float32).to(self.policy_network.device)
+            ).argmax(dim = 1).cpu()
+
+        return T.where(
+            explore,
+            T.randint(runner_context.environment.action_space_shape.flat_size, actions.shape),
+            actions
+        ), None
+
     def on_should_learn(self, _: RunnerRLContext) -> bool:
         return True
     
@@ -64,58 +188,146 @@ class AgentDQN(AgentBase):
             self._explore_count = 0
             self._exploit_count = 0
         
-        if runner_context.step_index_total >= self.hyperparameter_set["memory_batch_size"]:
-            self.policy_network.optimizer.zero_grad()
-
-            memory_batch = random.sample(self.memory_buffer.memories, self.hyperparameter_set["memory_batch_size"])
-
-            t_observations_current = T.stack(
-                [T.as_tensor(i.observation_current, dtype = T.float32) for i in memory_batch]
-            ).to(self.policy_network.device)
-
-            t_observations_next = T.stack(
-                [T.as_tensor(i.observation_next, dtype = T.float32) for i in memory_batch]
-            ).to(self.policy_network.device)
-
-            t_actions = T.as_tensor(
-                [i.action for i in memory_batch]
-            ).to(self.policy_network.device)
-
-            t_rewards = T.as_tensor(
-                [i.reward for i in memory_batch]
-            ).to(self.policy_network.device)
-
-            t_nonterminal_indecies = T.as_tensor(
-                [i for i in range(len(memory_batch)) if not memory_batch[i].done]
-            ).to(self.policy_network.device)
-
-            q_values_current = self.policy_network(
-                t_observations_current
-            ).gather(
-                dim = 1,
-                index = t_actions.unsqueeze(
-                    dim = 1
-                )
-            ).squeeze(
+        if self.learner_thread:
+            self._learn_in_background(runner_context)
+        else:
+            gradient_step_count = self.learn_scheduler.get_gradient_step_count(runner_context, len(self.memory_buffer))
+
+            for _ in range(gradient_step_count):
+                self.optimize(runner_context)
+                self.learn_step_count += 1
+
+            self.learn_scheduler.finish_learning(gradient_step_count)
+
+            if self.learn_step_count > 0 and runner_context.done and runner_context.episode_index > 0 and runner_context.episode_index % self.hyperparameter_set["target_update_interval"] == 0:
+                self.update_target_network()
+
+    def _learn_in_background(self, runner_context: RunnerRLContext) -> None:
+        if self._learner is None:
+            self._start_learner(runner_context)
+
+        replay_ratio = self.hyperparameter_set["learner_replay_ratio"] if "learner_replay_ratio" in self.hyperparameter_set else self.learn_scheduler.replay_ratio
+        max_lag = self.hyperparameter_set["learner_max_lag"] if "learner_max_lag" in self.hyperparameter_set else 100
+
+        with self._learner_condition:
+            start_steps = self.learn_scheduler.start_steps
+
+            if runner_context.step_index_total >= start_steps and len(self.memory_buffer) >= self.learn_scheduler.start_memory:
+                # The learner owes replay_ratio gradient steps for every
+                # environment step since the warm-up, as many as learning in
+                # line would have taken with the same ratio.
+                self._learn_step_budget = replay_ratio * (runner_context.step_index_total - start_steps + 1)
+
+                if runner_context.done and runner_context.episode_index > 0 and runner_context.episode_index % self.hyperparameter_set["target_update_interval"] == 0:
+                    self._target_update_pending = True
+
+                self._learner_condition.notify_all()
+
+            # Acting runs ahead of learning by at most max_lag gradient steps,
+            # so the replay ratio holds however fast either side is.
+            while self._learner_error is None and self._learn_step_budget - self.learn_step_count > max_lag:
+                self._learner_condition.wait()
+
+            if self._learner_error is not None:
+                error = self._learner_error
+                self._learner_error = None
+
+                raise Exception("learner thread failed") from error
+
+    def _start_learner(self, runner_context: RunnerRLContext) -> None:
+        self._learner_stopping = False
+        self._learner_error = None
+        self._learn_step_budget = 0.
+        self._target_update_pending = False
+        self.learn_step_count = 0
+
+        self._learner = threading.Thread(target = self._run_learner, args = (runner_context,), daemon = True)
+        self._learner.start()
+
+    def _run_learner(self, runner_context: RunnerRLContext) -> None:
+        try:
+            while True:
+                with self._learner_condition:
+                    while not self._learner_stopping and self.learn_step_count + 1 > self._learn_step_budget:
+                        self._learner_condition.wait()
+
+                    if self._learner_stopping:
+                        return
+
+                    target_update_pending = self._target_update_pending
+                    self._target_update_pending = False
+
+                # The target network is only used by this thread, it is
+                # updated between two gradient steps.
+                if target_update_pending:
+                    self.update_target_network()
+
+                self.optimize(runner_context)
+
+                with self._learner_condition:
+                    self.learn_step_count += 1
+                    self._learner_condition.notify_all()
+        except BaseException as e:
+            with self._learner_condition:
+                self._learner_error = e
+                self._learner_condition.notify_all()
+
+    def close(self) -> None:
+        # The learner thread samples from the replay buffer, so it is stopped
+        # before the buffer is closed.
+        if self._learner is not None:
+            with self._learner_condition:
+                self._learner_stopping = True
+                self._learner_condition.notify_all()
+
+            self._learner.join()
+            self._learner = None
+
+        super().close()
+
+    def optimize(self, runner_context: RunnerRLContext) -> None:
+        # A single gradient step on a batch sampled from the replay buffer,
+        # also used by learners which are fed transitions from elsewhere.
+        self.policy_network.optimizer.zero_grad()
+
+        memory_batch = self.memory_buffer.sample(
+            self.hyperparameter_set["memory_batch_size"],
+            self.policy_network.device
+        )
+
+        q_values_current = self.policy_network(
+            memory_batch.observations_current
+        ).gather(
+            dim = 1,
+            index = memory_batch.actions.unsqueeze(
                 dim = 1
             )
+        ).squeeze(
+            dim = 1
+        )
 
-            q_values_next = T.zeros(
-                self.hyperparameter_set["memory_batch_size"]
-            ).to(self.policy_network.device)
+        with T.no_grad(): # type: ignore
+            q_values_next = self.target_network(
+                memory_batch.observations_next
+            ).max(dim = 1).values.masked_fill(
+                memory_batch.dones,
+                0.
+            )
 
-            q_values_next[t_nonterminal_indecies] = self.target_network(
-                t_observations_next[t_nonterminal_indecies]
-            ).max(dim = 1).values.detach()
+        q_values_target = (q_values_next * self.hyperparameter_set["gamma"]) + memory_batch.rewards
 
-            q_values_target = (q_values_next * self.hyperparameter_set["gamma"]) + t_rewards
+        td_errors = q_values_target - q_values_current
 
-            loss = F.mse_loss(q_values_current, q_values_target)
+        loss = (memory_batch.weights * td_errors ** 2).mean()
 
-            runner_context.add_scalar("Loss", loss.item(), runner_context.step_index_total)
+        runner_context.add_scalar("Loss", loss.item(), runner_context.step_index_total)
 
-            loss.backward() # type: ignore
+        loss.backward() # type: ignore
+
+        with self._parameters_lock:
             self.policy_network.optimizer.step()
 
-            if runner_context.done and runner_context.episode_index > 0 and runner_context.episode_index % self.hyperparameter_set["target_update_interval"] == 0:
-                self.target_network.load_state_dict(self.policy_network.state_dict())
+        self.memory_buffer.update_priorities(memory_batch.indices, td_errors.detach().abs())
+
+    def update_target_network(self) -> None:
+        self.target_network.load_state_dict(self.policy_network.state_dict())
@@ -1,69 +1,175 @@
 # Typing
-from typing import Tuple
+from typing import cast, List, Optional, Tuple
 
 # PyTorch
 import torch as T
 import torch.nn.functional as F
 
 # Internal
+from ..domain.FrameStack import FrameStack
 from ..hyperparameters.HyperparameterSet import HyperparameterSet
+from ..memory.MemoryBuffer import MemoryBuffer
+from ..memory.MemoryReplayBuffer import MemoryReplayBuffer
 from ..network.OptimizedModule import OptimizedModule
 from ..running.RunnerRLContext import RunnerRLContext
 from .AgentBase import AgentBase
+from .returns import generalized_advantage_estimates
 
 class AgentDiscreteActorCritic(AgentBase):
+    actor_network: OptimizedModule
+    critic_network: OptimizedModule
+    rollout_length: Optional[int]
+
     def __init__(
         self,
         actor_network: OptimizedModule,
         critic_network: OptimizedModule,
         hyperparameter_set: HyperparameterSet) -> None:
+        rollout_length = hyperparameter_set["rollout_length"] if "rollout_length" in hyperparameter_set else None
+
+        # Episodes collected by a rollout pool are learned from whole, in one
+        # update over all of them.
+        if "rollout_pool_size" in hyperparameter_set and hyperparameter_set["rollout_pool_size"] > 0:
+            rollout_length = None
+
+        # Environments stepped in batches can push past rollout_length before
+        # the update runs, which must not evict any transition.
+        environment_count = hyperparameter_set["environment_count"] if "environment_count" in hyperparameter_set else 1
+
         super().__init__(
-            hyperparameter_set
+            hyperparameter_set,
+            MemoryReplayBuffer(rollout_length * environment_count) if rollout_length is not None else None
         )
 
         self.actor_network = actor_network
         self.critic_network = critic_network
+        self.rollout_length = rollout_length
     
-    def on_act(self, runner_context: RunnerRLContext, observation: T.Tensor) -> Tuple[int, T.Tensor]:
-        action_probabilities = T.distributions.Categorical(
+    def on_get_acting_networks(self) -> List[OptimizedModule]:
+        return [self.actor_network]
+
+    def _create_action_probabilities(self, observations: T.Tensor) -> T.distributions.Categorical:
+        return T.distributions.Categorical(
             F.softmax(
                 self.actor_network.forward(
-                    T.as_tensor(observation, dtype = T.float32, device = self.actor_network.device)
-                )
+                    T.as_tensor(FrameStack.materialize(observations), dtype = T.float32, device = self.actor_network.device)
+                ),
+                dim = -1
             )
         ) # type: ignore
 
+    def on_act(self, runner_context: RunnerRLContext, observation: T.Tensor) -> Tuple[int, Optional[T.Tensor]]:
+        if self.recompute_log_probabilities or self.rollout_length is not None:
+            with T.no_grad(): # type: ignore
+                return self._create_action_probabilities(observation).sample().item(), None # type: ignore
+
+        action_probabilities = self._create_action_probabilities(observation)
+
         action = action_probabilities.sample() # type: ignore
         action_log_probabilities = action_probabilities.log_prob(action) # type: ignore
 
         return action.item(), action_log_probabilities
 
+    def on_act_batch(self, runner_context: RunnerRLContext, observations: T.Tensor) -> Tuple[T.Tensor, None]:
+        with T.no_grad(): # type: ignore
+            return self._create_action_probabilities(observations).sample().cpu(), None # type: ignore
+
     def on_should_learn(self, _: RunnerRLContext) -> bool:
-        return len(self.memory_buffer) > 0
+        if self.rollout_length is not None:
+            return len(self.memory_buffer) >= self.rollout_length
+        else:
+            return len(self.memory_buffer) > 0
 
     def on_learn(self, _: RunnerRLContext) -> None:
+        if self.rollout_length is not None:
+            self._learn_rollout()
+        else:
+            self._learn_step()
+
+    def _learn_step(self) -> None:
+        memories = cast(MemoryBuffer, self.memory_buffer).memories
+
         self.actor_network.optimizer.zero_grad()
         self.critic_network.optimizer.zero_grad()
 
-        critic_value = self.critic_network.forward(
-            T.as_tensor(self.memory_buffer[-1].observation_current, dtype = T.float32, device = self.critic_network.device)
-        )
+        observations_current = T.stack([T.as_tensor(i.observation_current, dtype = T.float32) for i in memories])
+
+        critic_values = self.critic_network.forward(
+            observations_current.to(self.critic_network.device)
+        ).squeeze(dim = -1)
 
-        critic_value_next = self.critic_network.forward(
-            T.as_tensor(self.memory_buffer[-1].observation_next, dtype = T.float32, device = self.critic_network.device)
+        critic_values_next = self.critic_network.forward(
+            T.stack([T.as_tensor(i.observation_next, dtype = T.float32) for i in memories]).to(self.critic_network.device)
+        ).squeeze(dim = -1)
+
+        deltas = (
+            T.as_tensor([0. if i.reward is None else i.reward for i in memories], device = self.critic_network.device)
+            + self.hyperparameter_set["gamma"] * critic_values_next.masked_fill(
+                T.as_tensor([i.done for i in memories], device = self.critic_network.device),
+                0.
+            )
+            - critic_values
         )
 
-        delta = (
-            self.memory_buffer[-1].reward
-            + (0 if self.memory_buffer[-1].done else self.hyperparameter_set["gamma"] * critic_value_next)
-            - critic_value
+        if self.recompute_log_probabilities or any(i.action_log_probabilities is None for i in memories):
+            action_log_probabilities = self._create_action_probabilities(
+                observations_current
+            ).log_prob(
+                T.as_tensor([i.action for i in memories], device = self.actor_network.device)
+            ) # type: ignore
+        else:
+            action_log_probabilities = T.stack(
+                [cast(T.Tensor, i.action_log_probabilities) for i in memories]
+            ).view(-1)
+
+        actor_loss = -(action_log_probabilities * deltas).mean()
+        critic_loss = (deltas ** 2).mean()
+
+        (actor_loss + critic_loss).backward() # type: ignore
+
+        self.actor_network.optimizer.step()
+        self.critic_network.optimizer.step()
+
+        self.clear_memory()
+
+    def _learn_rollout(self) -> None:
+        rollout = cast(MemoryReplayBuffer, self.memory_buffer).read_all(self.critic_network.device)
+
+        self.actor_network.optimizer.zero_grad()
+        self.critic_network.optimizer.zero_grad()
+
+        critic_values = self.critic_network.forward(
+            rollout.observations_current
+        ).squeeze(dim = -1)
+
+        with T.no_grad(): # type: ignore
+            critic_values_next = self.critic_network.forward(
+                rollout.observations_next
+            ).squeeze(dim = -1)
+
+        advantages = generalized_advantage_estimates(
+            rollout.rewards,
+            critic_values.detach(),
+            critic_values_next,
+            rollout.dones,
+            self.hyperparameter_set["gamma"],
+            self.hyperparameter_set["gae_lambda"] if "gae_lambda" in self.hyperparameter_set else 1.,
+            rollout.environment_indices,
+            rollout.truncations
         )
 
-        assert self.memory_buffer[-1].action_log_probabilities is not None
-        actor_loss = -self.memory_buffer[-1].action_log_probabilities * delta
-        critic_loss = delta ** 2
+        action_log_probabilities = self._create_action_probabilities(
+            rollout.observations_current
+        ).log_prob(
+            rollout.actions
+        ) # type: ignore
+
+        actor_loss = -(action_log_probabilities * advantages).mean()
+        critic_loss = ((advantages + critic_values.detach() - critic_values) ** 2).mean()
 
-        (actor_loss + critic_loss).backward()
+        (actor_loss + critic_loss).backward() # type: ignore
 
         self.actor_network.optimizer.step()
         self.critic_network.optimizer.step()
+
+        self.clear_memory()
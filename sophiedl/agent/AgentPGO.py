@@ -1,5 +1,5 @@
 # Typing
-from typing import cast, Iterable, Tuple, Union
+from typing import cast, Dict, List, Optional, Tuple
 
 # PyTorch
 import torch as T
@@ -7,13 +7,16 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 # Internal
+from ..domain.FrameStack import FrameStack
 from ..hyperparameters.HyperparameterSet import HyperparameterSet
-from ..memory.Memory import Memory
+from ..memory.MemoryBuffer import MemoryBuffer
 from ..network.OptimizedModule import OptimizedModule
 from ..running.RunnerRLContext import RunnerRLContext
 from .AgentBase import AgentBase
+from .returns import discounted_returns
 
 class AgentPGO(AgentBase):
+    memory_buffer: MemoryBuffer
     policy_network: OptimizedModule
 
     def __init__(
@@ -26,38 +29,71 @@ class AgentPGO(AgentBase):
 
         self.policy_network = policy_network
     
-    def on_act(self, runner_context: RunnerRLContext, observation: T.Tensor) -> Tuple[int, T.Tensor]:
-        action_probabilities = T.distributions.Categorical(
+    def on_get_acting_networks(self) -> List[OptimizedModule]:
+        return [self.policy_network]
+
+    def _create_action_probabilities(self, observations: T.Tensor) -> T.distributions.Categorical:
+        return T.distributions.Categorical(
             F.softmax(
                 self.policy_network.forward(
-                    T.as_tensor(observation, dtype = T.float32, device = self.policy_network.device)
-                )
+                    T.as_tensor(FrameStack.materialize(observations), dtype = T.float32, device = self.policy_network.device)
+                ),
+                dim = -1
             )
         ) # type: ignore
 
+    def on_act(self, runner_context: RunnerRLContext, observation: T.Tensor) -> Tuple[int, Optional[T.Tensor]]:
+        if self.recompute_log_probabilities:
+            with T.no_grad(): # type: ignore
+                return self._create_action_probabilities(observation).sample().item(), None # type: ignore
+
+        action_probabilities = self._create_action_probabilities(observation)
+
         action = action_probabilities.sample() # type: ignore
         action_log_probabilities = action_probabilities.log_prob(action) # type: ignore
 
         return action.item(), action_log_probabilities
     
+    def on_act_batch(self, runner_context: RunnerRLContext, observations: T.Tensor) -> Tuple[T.Tensor, None]:
+        with T.no_grad(): # type: ignore
+            return self._create_action_probabilities(observations).sample().cpu(), None # type: ignore
+
     def on_should_learn(self, runner_context: RunnerRLContext) -> bool:
         return runner_context.done
 
     def on_learn(self, runner_context: RunnerRLContext) -> None:
-        self.policy_network.optimizer.zero_grad()
+        # Only episodes which have finished or were cut off are learned from.
+        # With several environments the tail of every unfinished episode is
+        # kept for the next update.
+        last_done_indices: Dict[int, int] = {}
+
+        for index, memory in enumerate(self.memory_buffer.memories):
+            if memory.done or memory.truncated:
+                last_done_indices[memory.environment_index] = index
+
+        memories = sorted(
+            [
+                memory for index, memory in enumerate(self.memory_buffer.memories)
+                if index <= last_done_indices.get(memory.environment_index, -1)
+            ],
+            key = lambda memory: memory.environment_index
+        )
+        memories_incomplete = [
+            memory for index, memory in enumerate(self.memory_buffer.memories)
+            if index > last_done_indices.get(memory.environment_index, -1)
+        ]
 
-        discounted_future_rewards = T.zeros(len(self.memory_buffer), dtype = T.float, device = self.policy_network.device)
+        if len(memories) == 0:
+            return
 
-        for i in range(len(self.memory_buffer)):
-            discounted_future_reward_sum = 0.
-            discount_factor = 1.
+        self.policy_network.optimizer.zero_grad()
 
-            for j in range(i, len(self.memory_buffer)):
-                if self.memory_buffer[j].reward is not None:
-                    discounted_future_reward_sum += cast(float, self.memory_buffer[j].reward) * discount_factor
-                discount_factor *= self.hyperparameter_set["gamma"]
-            
-            discounted_future_rewards[i] = discounted_future_reward_sum
+        discounted_future_rewards = discounted_returns(
+            T.as_tensor([0. if i.reward is None else i.reward for i in memories], dtype = T.float64),
+            self.hyperparameter_set["gamma"],
+            T.as_tensor([i.done for i in memories]),
+            truncations = T.as_tensor([i.truncated for i in memories])
+        ).to(dtype = T.float, device = self.policy_network.device)
 
         discounted_future_rewards -= discounted_future_rewards.mean()
 
@@ -65,14 +101,21 @@ class AgentPGO(AgentBase):
         if std != 0:
             discounted_future_rewards /= std
 
-        assert self.memory_buffer[0].action_log_probabilities is not None
-        loss = T.zeros_like(self.memory_buffer[0].action_log_probabilities)
+        if self.recompute_log_probabilities or any(i.action_log_probabilities is None for i in memories):
+            action_log_probabilities = self._create_action_probabilities(
+                T.stack([T.as_tensor(i.observation_current, dtype = T.float32) for i in memories])
+            ).log_prob(
+                T.as_tensor([i.action for i in memories], device = self.policy_network.device)
+            ) # type: ignore
+        else:
+            action_log_probabilities = T.stack(
+                [cast(T.Tensor, i.action_log_probabilities) for i in memories]
+            )
 
-        for discounted_future_reward, memory in zip(cast(Iterable[float], discounted_future_rewards), cast(Iterable[Memory], self.memory_buffer)):
-            assert memory.action_log_probabilities is not None
-            loss -= discounted_future_reward * memory.action_log_probabilities
+        loss = -(discounted_future_rewards * action_log_probabilities).sum()
 
         loss.backward() # type: ignore
         self.policy_network.optimizer.step()
 
         self.clear_memory()
+        self.memory_buffer.memories.extend(memories_incomplete)
@@ -2,6 +2,9 @@
 import math
 import random
 
+# PyTorch
+import torch as T
+
 # Internal
 from ..running.RunnerRLContext import RunnerRLContext
 
@@ -15,8 +18,11 @@ class EpsilonGreedyStrategy(object):
         self.end = end
         self.decay = decay
     
+    def get_epsilon(self, runner_context: RunnerRLContext) -> float:
+        return self.end + (self.start - self.end) * math.exp(-runner_context.step_index_total * self.decay)
+
     def should_explore(self, runner_context: RunnerRLContext) -> bool:
-        epsilon = self.end + (self.start - self.end) * math.exp(-runner_context.step_index_total * self.decay)
+        epsilon = self.get_epsilon(runner_context)
 
         runner_context.add_scalar("Epsilon", epsilon, runner_context.step_index_total)
 
@@ -25,3 +31,10 @@ class EpsilonGreedyStrategy(object):
         runner_context.add_scalar("Epsilon Random Value", x, runner_context.step_index_total)
 
         return x <= epsilon
+
+    def should_explore_batch(self, runner_context: RunnerRLContext, count: int) -> T.Tensor:
+        epsilon = self.get_epsilon(runner_context)
+
+        runner_context.add_scalar("Epsilon", epsilon, runner_context.step_index_total)
+
+        return T.rand(count) <= epsilon
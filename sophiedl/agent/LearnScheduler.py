@@ -0,0 +1,158 @@
+# Standard library
+import math
+import time
+
+# Typing
+from typing import Optional
+
+# Internal
+from ..running.RunnerRLContext import RunnerRLContext
+
+class LearnScheduler(object):
+    interval: Optional[int]
+    gradient_steps: float
+    start_steps: int
+    start_memory: int
+    target_fraction: Optional[float]
+    gradient_steps_min: float
+    gradient_steps_max: float
+    smoothing: float
+    _interval_index: int
+    _step_index_total: int
+    _call_step_count: int
+    _budget: float
+    _acting_started: Optional[float]
+    _acting_interval_count: int
+    _learning_started: Optional[float]
+    _acting_time: Optional[float]
+    _gradient_step_time: Optional[float]
+
+    def __init__(
+        self,
+        interval: Optional[int] = None,
+        gradient_steps: float = 1,
+        start_steps: int = 0,
+        start_memory: int = 0,
+        target_fraction: Optional[float] = None,
+        gradient_steps_min: float = 0.1,
+        gradient_steps_max: float = 64,
+        smoothing: float = 0.1) -> None:
+        assert interval is None or interval > 0
+        assert gradient_steps > 0
+        assert target_fraction is None or 0 < target_fraction < 1
+        assert 0 < gradient_steps_min <= gradient_steps_max
+        assert 0 < smoothing <= 1
+
+        # Every interval environment steps after the first start_steps, and
+        # once the replay buffer holds start_memory transitions, the agent
+        # takes gradient_steps gradient steps. With a target fraction the
+        # gradient steps per interval follow the measured time of acting and
+        # of a gradient step instead, so that learning takes that fraction of
+        # the wall time. Fractional gradient steps carry over. Without an
+        # interval every call is one, however many transitions the
+        # environments pushed since the last one.
+        self.interval = interval
+        self.gradient_steps = gradient_steps
+        self.start_steps = start_steps
+        self.start_memory = start_memory
+        self.target_fraction = target_fraction
+        self.gradient_steps_min = gradient_steps_min
+        self.gradient_steps_max = gradient_steps_max
+        self.smoothing = smoothing
+        self._interval_index = 0
+        self._step_index_total = 0
+        self._call_step_count = 1
+        self._budget = 0.
+        self._acting_started = None
+        self._acting_interval_count = 0
+        self._learning_started = None
+        self._acting_time = None
+        self._gradient_step_time = None
+
+    @property
+    def adaptive(self) -> bool:
+        return self.target_fraction is not None
+
+    @property
+    def replay_ratio(self) -> float:
+        return self.gradient_steps / (self.interval if self.interval is not None else self._call_step_count)
+
+    def _smooth(self, average: Optional[float], value: float) -> float:
+        return value if average is None else average + self.smoothing * (value - average)
+
+    def get_gradient_step_count(self, runner_context: RunnerRLContext, memory_size: int) -> int:
+        now = time.perf_counter()
+
+        if runner_context.step_index_total > self._step_index_total:
+            self._call_step_count = runner_context.step_index_total - self._step_index_total
+            self._step_index_total = runner_context.step_index_total
+
+        if runner_context.step_index_total < self.start_steps:
+            return 0
+
+        if self.interval is None:
+            interval_count = 1
+        else:
+            # With several environments one call can cover more than one
+            # interval.
+            interval_index = (runner_context.step_index_total - self.start_steps) // self.interval + 1
+            interval_count = interval_index - self._interval_index
+
+            if interval_count <= 0:
+                return 0
+
+            self._interval_index = interval_index
+
+        self._acting_interval_count += interval_count
+
+        if memory_size < self.start_memory:
+            return 0
+
+        if self.adaptive:
+            self._adapt(runner_context)
+
+        self._budget += self.gradient_steps * interval_count
+
+        gradient_step_count = math.floor(self._budget)
+        self._budget -= gradient_step_count
+
+        if gradient_step_count > 0:
+            # Acting is timed from the end of one learning phase to the start
+            # of the next, over however many intervals lie in between.
+            if self.adaptive and self._acting_started is not None:
+                self._acting_time = self._smooth(self._acting_time, (now - self._acting_started) / self._acting_interval_count)
+
+            self._acting_interval_count = 0
+            self._learning_started = now
+
+        return gradient_step_count
+
+    def finish_learning(self, gradient_step_count: int) -> None:
+        if self._learning_started is None:
+            return
+
+        now = time.perf_counter()
+
+        if self.adaptive and gradient_step_count > 0:
+            self._gradient_step_time = self._smooth(self._gradient_step_time, (now - self._learning_started) / gradient_step_count)
+
+        self._learning_started = None
+        self._acting_started = now
+
+    def _adapt(self, runner_context: RunnerRLContext) -> None:
+        assert self.target_fraction is not None
+
+        if self._acting_time is None or self._gradient_step_time is None:
+            return
+
+        # Learning for the target fraction of the time takes
+        # target / (1 - target) times as long as acting for an interval.
+        self.gradient_steps = min(
+            max(
+                self.target_fraction / (1 - self.target_fraction) * self._acting_time / self._gradient_step_time,
+                self.gradient_steps_min
+            ),
+            self.gradient_steps_max
+        )
+
+        runner_context.add_scalar("Gradient Steps/Interval", self.gradient_steps, runner_context.step_index_total)
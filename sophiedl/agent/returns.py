@@ -0,0 +1,95 @@
+# Typing
+from typing import Optional
+
+# PyTorch
+import torch as T
+
+def _reverse_linear_scan(coefficients: T.Tensor, values: T.Tensor) -> T.Tensor:
+    # Solves x_t = values_t + coefficients_t * x_{t+1} (with x_n = 0) as a
+    # parallel prefix scan: every round combines each element with the one
+    # offset steps ahead, so log2(n) rounds of tensor operations suffice.
+    # Unlike a closed form with powers of gamma nothing can underflow.
+    coefficients = coefficients.clone()
+    values = values.clone()
+
+    offset = 1
+
+    while offset < values.shape[0]:
+        values[:-offset] = values[:-offset] + coefficients[:-offset] * values[offset:]
+        coefficients[:-offset] = coefficients[:-offset] * coefficients[offset:]
+
+        offset *= 2
+
+    return values
+
+def discounted_returns(
+    rewards: T.Tensor,
+    gamma: float,
+    dones: Optional[T.Tensor] = None,
+    bootstrap: float = 0.,
+    truncations: Optional[T.Tensor] = None) -> T.Tensor:
+    # Without a value to bootstrap from, episodes cut off at a maximum length
+    # end their returns there like finished ones.
+    rewards = T.as_tensor(rewards, dtype = T.float64)
+    cuts = T.zeros(rewards.shape[0], dtype = T.bool, device = rewards.device)
+
+    if dones is not None:
+        cuts = cuts | T.as_tensor(dones, dtype = T.bool, device = rewards.device)
+
+    if truncations is not None:
+        cuts = cuts | T.as_tensor(truncations, dtype = T.bool, device = rewards.device)
+
+    if rewards.shape[0] == 0:
+        return rewards
+
+    coefficients = gamma * (~cuts).to(dtype = T.float64)
+
+    # The bootstrap value continues the last episode unless it ended.
+    rewards = rewards.clone()
+    rewards[-1] += coefficients[-1] * bootstrap
+
+    return _reverse_linear_scan(coefficients, rewards)
+
+def generalized_advantage_estimates(
+    rewards: T.Tensor,
+    values: T.Tensor,
+    values_next: T.Tensor,
+    dones: T.Tensor,
+    gamma: float,
+    lambda_: float,
+    environment_indices: Optional[T.Tensor] = None,
+    truncations: Optional[T.Tensor] = None) -> T.Tensor:
+    not_dones = (~dones).to(dtype = values.dtype, device = values.device)
+    deltas = rewards.to(dtype = values.dtype, device = values.device) + gamma * values_next * not_dones - values
+
+    if deltas.shape[0] == 0:
+        return deltas
+
+    # A_t = delta_t + gamma * lambda * A_{t+1} within an episode, evaluated
+    # with a reverse scan. Episodes cut off at a maximum length still
+    # bootstrap from the next value, but their trace ends there since the
+    # following transition starts a new episode.
+    cuts = dones | truncations if truncations is not None else dones
+    cuts = cuts.to(device = values.device)
+
+    # Transitions of several environments are interleaved, so they are
+    # grouped by environment (keeping their order) and every trace ends at
+    # the last transition of its environment.
+    if environment_indices is not None:
+        environment_indices = environment_indices.to(device = values.device)
+        count = deltas.shape[0]
+        order = T.argsort(environment_indices * count + T.arange(count, device = values.device))
+        environment_indices = environment_indices[order]
+
+        cuts = cuts[order].clone()
+        cuts[:-1] |= environment_indices[1:] != environment_indices[:-1]
+        deltas = deltas[order]
+    else:
+        order = None
+
+    advantages = _reverse_linear_scan(gamma * lambda_ * (~cuts).to(dtype = values.dtype), deltas)
+
+    if order is not None:
+        advantages = T.empty_like(advantages).scatter_(0, order, advantages)
+
+    return advantages
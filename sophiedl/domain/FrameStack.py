@@ -0,0 +1,116 @@
+# Future
+from __future__ import annotations
+
+# Standard library
+import itertools
+
+# Typing
+from typing import Any, Optional, Tuple
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+class FrameRing(object):
+    _ring_indices = itertools.count()
+
+    ring_index: int
+    capacity: int
+    frames: Optional[T.Tensor]
+    frame_count: int
+
+    def __init__(self, capacity: int) -> None:
+        assert capacity > 0
+
+        # Unlike id(), the index is never reused by a later ring, so frames
+        # can be told apart by it after their ring has been collected.
+        self.ring_index = next(FrameRing._ring_indices)
+        self.capacity = capacity
+        self.frames = None
+        self.frame_count = 0
+
+    def append(self, frame: Any) -> int:
+        frame = T.as_tensor(frame)
+
+        if self.frames is None:
+            self.frames = T.zeros((self.capacity, *frame.shape), dtype = frame.dtype)
+
+        frame_index = self.frame_count
+        self.frame_count += 1
+
+        self.frames[frame_index % self.capacity] = frame
+
+        return frame_index
+
+    def is_valid(self, frame_index: int) -> bool:
+        return frame_index < self.frame_count and frame_index >= self.frame_count - self.capacity
+
+    def get(self, frame_index: int) -> T.Tensor:
+        assert self.frames is not None
+
+        if not self.is_valid(frame_index):
+            raise Exception("frame {0} has already been overwritten".format(frame_index))
+
+        return self.frames[frame_index % self.capacity]
+
+class FrameStack(object):
+    ring: FrameRing
+    frame_indices: Tuple[int, ...]
+
+    def __init__(self, ring: FrameRing, frame_indices: Tuple[int, ...]) -> None:
+        self.ring = ring
+        self.frame_indices = frame_indices
+
+    def __repr__(self) -> str:
+        return "<FrameStack frame_indices={0}>".format(self.frame_indices)
+
+    def __len__(self) -> int:
+        return len(self.frame_indices)
+
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        assert self.ring.frames is not None
+
+        return tuple(self.ring.frames.shape[1:])
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        # Frames are stacked along their first (channel) dimension.
+        frame_shape = self.frame_shape
+
+        return (len(self.frame_indices) * frame_shape[0], *frame_shape[1:])
+
+    @property
+    def is_valid(self) -> bool:
+        return all(self.ring.is_valid(i) for i in self.frame_indices)
+
+    def frame(self, position: int) -> T.Tensor:
+        return self.ring.get(self.frame_indices[position])
+
+    def to_tensor(self, dtype: Optional[T.dtype] = None) -> T.Tensor:
+        assert self.ring.frames is not None
+
+        if not self.is_valid:
+            raise Exception("frame stack refers to frames which have already been overwritten")
+
+        stacked = self.ring.frames[
+            T.as_tensor(self.frame_indices) % self.ring.capacity
+        ].reshape(self.shape)
+
+        return stacked if dtype is None else stacked.to(dtype = dtype)
+
+    # The stack is materialized only when it is converted, either by NumPy
+    # or explicitly through to_tensor() (or materialize() where a value may
+    # or may not be a stack). T.as_tensor does not understand the stack by
+    # itself, so every conversion site in the package goes through these.
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> Any:
+        array = self.to_tensor().numpy()
+
+        return array if dtype is None else array.astype(dtype)
+
+    @staticmethod
+    def materialize(value: Any) -> Any:
+        return value.to_tensor() if isinstance(value, FrameStack) else value
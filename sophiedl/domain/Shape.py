@@ -2,13 +2,11 @@
 from __future__ import annotations
 
 # Standard library
-from collections.abc import Iterable
 from functools import reduce
-import copy as C
 import operator
 
 # Typing
-from typing import Any, List
+from typing import Any, ClassVar, Dict, Iterable, Tuple
 
 # NumPy
 import numpy as np # type: ignore
@@ -19,14 +17,38 @@ import torch as T
 # Gym
 import gym # type: ignore
 
-class Shape(List[int]):
+# Internal
+from .FrameStack import FrameStack
+
+class Shape(Tuple[int, ...]):
+    # Shapes are immutable, so they can be shared freely without copying.
+    # Only shapes which are requested to be interned (such as the space
+    # shapes of environments) are kept for the lifetime of the process, as
+    # tuples cannot be referenced weakly.
+    _interned: ClassVar[Dict[Tuple[int, ...], Shape]] = {}
+
+    def __new__(cls, value: Iterable[int] = ()) -> Shape:
+        dimensions: Tuple[int, ...] = tuple(int(i) for i in value)
+
+        return super().__new__(cls, dimensions)
+
+    @staticmethod
+    def intern(value: Any) -> Shape:
+        shape = Shape.to_shape(value)
+
+        return Shape._interned.setdefault(shape, shape)
+
+    def __copy__(self) -> Shape:
+        return self
+
+    def __deepcopy__(self, memo: Any) -> Shape:
+        return self
+
     @staticmethod
     def to_shape(value: Any, copy: bool = True) -> Shape:
+        # Shapes are immutable, so copy is kept only for compatibility.
         if isinstance(value, Shape):
-            if copy:
-                return C.deepcopy(value)
-            else:
-                return value
+            return value
         else:
             try:
                 return Shape(value)
@@ -39,6 +61,8 @@ class Shape(List[int]):
             return Shape.to_shape(value.shape)
         elif isinstance(value, T.Tensor):
             return Shape.to_shape(value.shape)
+        elif isinstance(value, FrameStack):
+            return Shape.to_shape(value.shape)
         elif isinstance(value, gym.spaces.Discrete):
             return Shape.to_shape((value.n,))
         elif isinstance(value, gym.spaces.Box):
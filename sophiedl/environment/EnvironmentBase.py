@@ -5,7 +5,7 @@ import abc
 import operator
 
 # Typing
-from typing import Any, cast, Iterable, List, TypeVar, Union
+from typing import Any, cast, Iterable, List, Optional, TypeVar, Union
 
 # NumPy
 import numpy as np # type: ignore
@@ -27,12 +27,29 @@ EnvironmentStepResult = namedtuple(
 )
 
 class EnvironmentBase(abc.ABC):
+    VALIDATION_ALWAYS = "always"
+    VALIDATION_FIRST = "first"
+    VALIDATION_SAMPLED = "sampled"
+    VALIDATION_OFF = "off"
+
     observation_type: type
     action_type: type
+    validation: str
+    validation_count: int
+    validation_interval: int
+    _validation_index: int
+    _observation_space_shape: Optional[Shape]
+    _action_space_shape: Optional[Shape]
 
     def __init__(self, observation_type: type, action_type: type):
         self.observation_type = observation_type
         self.action_type = action_type
+        self.validation = EnvironmentBase.VALIDATION_ALWAYS
+        self.validation_count = 0
+        self.validation_interval = 1
+        self._validation_index = 0
+        self._observation_space_shape = None
+        self._action_space_shape = None
 
     def __str__(self) -> str:
         return "{0}:\n  Observation type: {1}\n  Observation space shape: {2}\n  Action type: {3}\n  Action space shape: {4} (flat size: {5})".format(
@@ -62,9 +79,50 @@ class EnvironmentBase(abc.ABC):
     def on_step(self, action: Any) -> EnvironmentStepResult:
         pass
 
-    def reset(self) -> Any:
-        observation = self.on_reset()
+    def on_skip(self, action: Any) -> EnvironmentStepResult:
+        # Advances the environment when nobody looks at the observation, which
+        # environments and transforms that can avoid producing it override.
+        return self.on_step(action)
 
+    def on_release(self, observation: Any) -> None:
+        # Environments which lend out their own buffers as observations take
+        # them back here.
+        pass
+
+    def set_validation(self, validation: str, count: int = 0, interval: int = 1) -> None:
+        # Type and shape checks can be limited to the first count calls, to
+        # every interval-th call, or switched off once an environment is known
+        # to behave.
+        if validation not in (
+            EnvironmentBase.VALIDATION_ALWAYS,
+            EnvironmentBase.VALIDATION_FIRST,
+            EnvironmentBase.VALIDATION_SAMPLED,
+            EnvironmentBase.VALIDATION_OFF):
+            raise Exception("unknown validation policy: {0}".format(validation))
+
+        if interval <= 0:
+            raise Exception("validation interval must be positive")
+
+        self.validation = validation
+        self.validation_count = count
+        self.validation_interval = interval
+        self._validation_index = 0
+
+    def _should_validate(self) -> bool:
+        if self.validation == EnvironmentBase.VALIDATION_ALWAYS:
+            return True
+        elif self.validation == EnvironmentBase.VALIDATION_OFF:
+            return False
+
+        index = self._validation_index
+        self._validation_index += 1
+
+        if self.validation == EnvironmentBase.VALIDATION_FIRST:
+            return index < self.validation_count
+        else:
+            return index % self.validation_interval == 0
+
+    def _validate_observation(self, observation: Any) -> None:
         if not isinstance(observation, self.observation_type):
             raise TypeError(
                 "expected observation to be of type {0}, not {1}".format(
@@ -72,19 +130,37 @@ class EnvironmentBase(abc.ABC):
                     type(observation).__name__
                 )
             )
-        
-        if Shape.get_shape(observation) != self.observation_space_shape:
+
+        observation_shape = Shape.get_shape(observation)
+
+        if observation_shape != self.observation_space_shape:
             raise Exception(
                 "expected observation to have shape {0}, not {1}".format(
                     self.observation_space_shape,
-                    Shape.get_shape(observation)
+                    observation_shape
                 )
             )
+
+    def on_clone_state(self) -> Optional[Any]:
+        # Environments which can snapshot themselves return an opaque state,
+        # which restore_state returns them to. None means no snapshots.
+        return None
+
+    def on_restore_state(self, state: Any) -> Any:
+        raise Exception("{0} does not support snapshots".format(type(self).__name__))
+
+    def reset(self) -> Any:
+        observation = self.on_reset()
+
+        if self._should_validate():
+            self._validate_observation(observation)
         
         return observation
 
     def step(self, action: Any) -> EnvironmentStepResult:
-        if not isinstance(action, self.action_type):
+        validate = self._should_validate()
+
+        if validate and not isinstance(action, self.action_type):
             raise TypeError(
                 "expected action to be of type {0}, not {1}".format(
                     self.action_type.__name__,
@@ -97,21 +173,8 @@ class EnvironmentBase(abc.ABC):
         if isinstance(observation, tuple):
             observation = np.array(observation)
 
-        if not isinstance(observation, self.observation_type):
-            raise TypeError(
-                "expected observation to be of type {0}, not {1}".format(
-                    self.observation_type.__name__,
-                    type(observation).__name__
-                )
-            )
-        
-        if Shape.get_shape(observation) != self.observation_space_shape:
-            raise Exception(
-                "expected observation to have shape {0}, not {1}".format(
-                    self.observation_space_shape,
-                    Shape.get_shape(observation)
-                )
-            )
+        if validate:
+            self._validate_observation(observation)
         
         return EnvironmentStepResult(
             observation,
@@ -120,14 +183,46 @@ class EnvironmentBase(abc.ABC):
             info
         )
 
+    def close(self) -> None:
+        pass
+
+    def clone_state(self) -> Optional[Any]:
+        return self.on_clone_state()
+
+    def restore_state(self, state: Any) -> Any:
+        observation = self.on_restore_state(state)
+
+        if self._should_validate():
+            self._validate_observation(observation)
+
+        return observation
+
+    def skip(self, action: Any) -> EnvironmentStepResult:
+        # Unlike step, the action is trusted and the observation may be None.
+        return self.on_skip(action)
+
+    def release(self, observation: Any) -> None:
+        # Consumers hand back observations they no longer refer to, including
+        # through views, so that their buffers can be reused.
+        self.on_release(observation)
+
+    # Space shapes are fixed for the lifetime of an environment, so they are
+    # only computed once.
+
     @property
     def observation_space_shape(self) -> Shape:
-        return Shape.to_shape(
-            self.on_get_observation_space_shape()
-        )
+        if self._observation_space_shape is None:
+            self._observation_space_shape = Shape.intern(
+                self.on_get_observation_space_shape()
+            )
+
+        return self._observation_space_shape
 
     @property
     def action_space_shape(self) -> Shape:
-        return Shape.to_shape(
-            self.on_get_action_space_shape()
-        )
+        if self._action_space_shape is None:
+            self._action_space_shape = Shape.intern(
+                self.on_get_action_space_shape()
+            )
+
+        return self._action_space_shape
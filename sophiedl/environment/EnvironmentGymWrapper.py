@@ -1,5 +1,8 @@
+# Standard library
+import copy as C
+
 # Typing
-from typing import Any, cast, Generic, get_args, Iterable, TypeVar, Union
+from typing import Any, cast, Generic, get_args, Iterable, Optional, TypeVar, Union
 
 # NumPy
 import numpy as np # type: ignore
@@ -16,11 +19,22 @@ from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
 
 class EnvironmentGymWrapper(EnvironmentBase):
     gym_environment: gym.Env
+    copy_snapshots: bool
+    _observation_last: Any
 
-    def __init__(self, gym_environment: gym.Env, observation_type: type, action_type: type) -> None:
+    def __init__(self, gym_environment: gym.Env, observation_type: type, action_type: type, copy_snapshots: Optional[bool] = None) -> None:
         super().__init__(observation_type, action_type)
 
         self.gym_environment = gym_environment
+        self._observation_last = None
+
+        # Gym has no common snapshot interface, so snapshots copy the whole
+        # environment. That is only safe for environments written purely in
+        # Python: emulators keep native handles which a copy would share.
+        self.copy_snapshots = copy_snapshots if copy_snapshots is not None else type(gym_environment.unwrapped).__module__.startswith((
+            "gym.envs.classic_control.",
+            "gym.envs.toy_text."
+        ))
     
     def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
         return Shape.get_shape(
@@ -33,7 +47,27 @@ class EnvironmentGymWrapper(EnvironmentBase):
         )
 
     def on_reset(self) -> Any:
-        return self.gym_environment.reset()
+        self._observation_last = self.gym_environment.reset()
+
+        return self._observation_last
+
+    def on_clone_state(self) -> Optional[Any]:
+        if not self.copy_snapshots:
+            return None
+
+        return (
+            C.deepcopy(self.gym_environment),
+            np.array(self._observation_last, copy = True)
+        )
+
+    def on_restore_state(self, state: Any) -> Any:
+        gym_environment, observation = state
+
+        # The state is copied again so that it can be restored repeatedly.
+        self.gym_environment = C.deepcopy(gym_environment)
+        self._observation_last = observation.copy()
+
+        return self._observation_last
 
     def on_step(self, action: Any) -> EnvironmentStepResult:
         observation, reward, done, info = self.gym_environment.step(action)
@@ -44,6 +78,8 @@ class EnvironmentGymWrapper(EnvironmentBase):
         if isinstance(done, np.generic):
             done = done.item()
 
+        self._observation_last = observation
+
         return EnvironmentStepResult(
             observation,
             reward,
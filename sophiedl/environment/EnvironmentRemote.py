@@ -0,0 +1,73 @@
+# Typing
+from typing import Any, Iterable, Union
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
+from .EnvironmentRemoteConnection import EnvironmentRemoteConnection
+from .remote import REMOTE_COMMAND_RESET, REMOTE_COMMAND_STEP, REMOTE_TYPES
+
+class EnvironmentRemote(EnvironmentBase):
+    environment_index: int
+    _connection: EnvironmentRemoteConnection
+
+    def __init__(self, address: str, environment_index: int = 0) -> None:
+        connection = EnvironmentRemoteConnection(address)
+        description = connection.description
+
+        super().__init__(
+            REMOTE_TYPES[description["observation_type"]],
+            REMOTE_TYPES[description["action_type"]]
+        )
+
+        if environment_index < 0 or environment_index >= description["environment_count"]:
+            connection.close()
+
+            raise Exception(
+                "{0} hosts {1} environments, there is no environment {2}".format(
+                    address,
+                    description["environment_count"],
+                    environment_index
+                )
+            )
+
+        self.environment_index = environment_index
+        self._connection = connection
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape(self._connection.description["observation_space_shape"])
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape(self._connection.description["action_space_shape"])
+
+    def _to_observation(self, observation: Any) -> Any:
+        return T.from_numpy(observation) if self.observation_type is T.Tensor else observation
+
+    def on_reset(self) -> Any:
+        response = self._connection.request({
+            "command": REMOTE_COMMAND_RESET,
+            "indices": [self.environment_index]
+        })
+
+        return self._to_observation(response["observations"][0])
+
+    def on_step(self, action: Any) -> EnvironmentStepResult:
+        response = self._connection.request({
+            "command": REMOTE_COMMAND_STEP,
+            "indices": [self.environment_index],
+            "actions": [action],
+            "auto_reset": False
+        })
+
+        return EnvironmentStepResult(
+            self._to_observation(response["observations"][0]),
+            float(response["rewards"][0]),
+            bool(response["dones"][0]),
+            response["infos"][0]
+        )
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,76 @@
+# Standard library
+from collections import deque
+import socket
+
+# Typing
+from typing import Any, Deque, Dict
+
+# Internal
+from .remote import (
+    connect_remote,
+    receive_remote_message,
+    REMOTE_COMMAND_DESCRIBE,
+    REMOTE_STATUS_OK,
+    send_remote_message
+)
+
+class EnvironmentRemoteConnection(object):
+    address: str
+    description: Dict[str, Any]
+    _socket: socket.socket
+    _next_request_id: int
+    _request_ids: Deque[int]
+
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self._socket = connect_remote(address)
+        self._next_request_id = 0
+        self._request_ids = deque()
+
+        self.description = self.request({"command": REMOTE_COMMAND_DESCRIBE})
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._request_ids)
+
+    def send(self, document: Dict[str, Any]) -> int:
+        # Any number of requests may be sent before their answers are
+        # received, which come back in the same order.
+        request_id = self._next_request_id
+        self._next_request_id = (self._next_request_id + 1) & 0xffffffff
+
+        send_remote_message(self._socket, request_id, REMOTE_STATUS_OK, document)
+        self._request_ids.append(request_id)
+
+        return request_id
+
+    def receive(self) -> Any:
+        if len(self._request_ids) == 0:
+            raise Exception("no request is waiting for an answer")
+
+        request_id, status, document = receive_remote_message(self._socket)
+        expected_request_id = self._request_ids.popleft()
+
+        if request_id != expected_request_id:
+            raise Exception(
+                "expected an answer to request {0}, not {1}".format(
+                    expected_request_id,
+                    request_id
+                )
+            )
+
+        if status != REMOTE_STATUS_OK:
+            raise Exception("remote environment {0} failed: {1}".format(self.address, document["message"]))
+
+        return document
+
+    def request(self, document: Dict[str, Any]) -> Any:
+        if len(self._request_ids) > 0:
+            raise Exception("answers to earlier requests must be received first")
+
+        self.send(document)
+
+        return self.receive()
+
+    def close(self) -> None:
+        self._socket.close()
@@ -0,0 +1,221 @@
+# Standard library
+import os
+import socket
+import threading
+
+# Typing
+from typing import Any, Callable, Dict, List, Optional
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from .EnvironmentBase import EnvironmentBase
+from .remote import (
+    format_remote_address,
+    parse_remote_address,
+    receive_remote_message,
+    remote_to_action,
+    remote_type_name,
+    REMOTE_COMMAND_DESCRIBE,
+    REMOTE_COMMAND_RESET,
+    REMOTE_COMMAND_STEP,
+    REMOTE_STATUS_ERROR,
+    REMOTE_STATUS_OK,
+    send_remote_message
+)
+
+def _to_array(observation: Any) -> Any:
+    return observation.detach().cpu().numpy() if isinstance(observation, T.Tensor) else np.asarray(observation)
+
+class EnvironmentRemoteServer(object):
+    environments: List[EnvironmentBase]
+    address: str
+    _socket: socket.socket
+    _unix_path: Optional[str]
+    _lock: threading.Lock
+    _closing: threading.Event
+    _thread: Optional[threading.Thread]
+    _connections: List[socket.socket]
+
+    def __init__(
+        self,
+        environment_factory: Callable[[], EnvironmentBase],
+        environment_count: int = 1,
+        address: str = "127.0.0.1:0") -> None:
+        assert environment_count > 0
+
+        self.environments = [environment_factory() for i in range(environment_count)]
+
+        family, socket_address = parse_remote_address(address)
+
+        self._socket = socket.socket(family, socket.SOCK_STREAM)
+
+        if family == socket.AF_INET:
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        self._socket.bind(socket_address)
+        self._socket.listen()
+
+        # Accepting polls so that close() does not depend on the platform
+        # waking up a blocked accept.
+        self._socket.settimeout(0.1)
+
+        # With port 0 the system picks one, clients need the real one.
+        self.address = format_remote_address(family, self._socket.getsockname())
+        self._unix_path = socket_address if family == socket.AF_UNIX else None
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._thread = None
+        self._connections = []
+
+    def _describe(self) -> Dict[str, Any]:
+        environment = self.environments[0]
+
+        return {
+            "environment_count": len(self.environments),
+            "observation_type": remote_type_name(environment.observation_type),
+            "action_type": remote_type_name(environment.action_type),
+            "observation_space_shape": list(environment.observation_space_shape),
+            "action_space_shape": list(environment.action_space_shape)
+        }
+
+    def _stack(self, indices: List[int], observations: List[Any]) -> Any:
+        # Stacking copies the observations, after which the environments can
+        # have their buffers back.
+        stacked = np.stack([_to_array(i) for i in observations])
+
+        for i, observation in zip(indices, observations):
+            self.environments[i].release(observation)
+
+        return stacked
+
+    def _reset(self, indices: List[int]) -> Dict[str, Any]:
+        return {
+            "observations": self._stack(indices, [self.environments[i].reset() for i in indices])
+        }
+
+    def _step(self, indices: List[int], actions: Any, auto_reset: bool) -> Dict[str, Any]:
+        observations = []
+        rewards: Any = np.empty(len(indices), dtype = np.float64)
+        dones: Any = np.empty(len(indices), dtype = np.bool_)
+        infos = []
+
+        for j, i in enumerate(indices):
+            environment = self.environments[i]
+            observation, reward, done, info = environment.step(remote_to_action(actions[j], environment.action_type))
+
+            # Vector clients expect finished episodes to be reset right away,
+            # the same way the subprocess vector does it.
+            if done and auto_reset:
+                info = dict(info)
+                info["terminal_observation"] = np.array(_to_array(observation))
+                environment.release(observation)
+                observation = environment.reset()
+
+            observations.append(observation)
+            rewards[j] = reward
+            dones[j] = done
+            infos.append(info)
+
+        return {
+            "observations": self._stack(indices, observations),
+            "rewards": rewards,
+            "dones": dones,
+            "infos": infos
+        }
+
+    def _handle_request(self, document: Dict[str, Any]) -> Any:
+        command = document["command"]
+
+        if command == REMOTE_COMMAND_DESCRIBE:
+            return self._describe()
+
+        indices = document["indices"]
+
+        for i in indices:
+            if i < 0 or i >= len(self.environments):
+                raise Exception("no environment with index {0}".format(i))
+
+        # Environments are shared by all connections, so requests are handled
+        # one at a time.
+        with self._lock:
+            if command == REMOTE_COMMAND_RESET:
+                return self._reset(indices)
+            elif command == REMOTE_COMMAND_STEP:
+                return self._step(indices, document["actions"], document["auto_reset"])
+            else:
+                raise Exception("unknown command: {0}".format(command))
+
+    def _handle_connection(self, connection: socket.socket) -> None:
+        with connection:
+            while not self._closing.is_set():
+                try:
+                    request_id, status, document = receive_remote_message(connection)
+                except (EOFError, OSError):
+                    break
+
+                try:
+                    try:
+                        send_remote_message(connection, request_id, REMOTE_STATUS_OK, self._handle_request(document))
+                    except OSError:
+                        raise
+                    except Exception as e:
+                        send_remote_message(connection, request_id, REMOTE_STATUS_ERROR, {"message": str(e)})
+                except OSError:
+                    break
+
+    def serve_forever(self) -> None:
+        while not self._closing.is_set():
+            try:
+                connection, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            connection.settimeout(None)
+
+            if connection.family == socket.AF_INET:
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            self._connections = [i for i in self._connections if i.fileno() >= 0] + [connection]
+
+            threading.Thread(target = self._handle_connection, args = (connection,), daemon = True).start()
+
+    def start(self) -> "EnvironmentRemoteServer":
+        # Serves from a background thread, mostly for running the server and
+        # its clients in the same process.
+        if self._thread is None:
+            self._thread = threading.Thread(target = self.serve_forever, daemon = True)
+            self._thread.start()
+
+        return self
+
+    def close(self) -> None:
+        self._closing.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self._socket.close()
+
+        # Clients waiting on an answer see the connection end.
+        for connection in self._connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+        self._connections = []
+
+        if self._unix_path is not None and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+            self._unix_path = None
+
+        for environment in self.environments:
+            environment.close()
@@ -0,0 +1,164 @@
+# Standard library
+import os
+import zlib
+
+# Typing
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
+from .trace import (
+    TRACE_ACTIONS,
+    TRACE_CHUNKS,
+    TRACE_COMPRESSION_ZLIB,
+    TRACE_DONES,
+    TRACE_OBSERVATIONS,
+    TRACE_RESETS,
+    TRACE_REWARDS,
+    read_trace_metadata
+)
+
+_ACTION_TYPES: Dict[str, type] = {
+    "int": int,
+    "float": float,
+    "ndarray": np.ndarray,
+    "tensor": T.Tensor
+}
+
+class EnvironmentTraceReplay(EnvironmentBase):
+    path: str
+    loop: bool
+    record_count: int
+    _metadata: Dict[str, Any]
+    _actions: Any
+    _action_indices: Any
+    _rewards: Any
+    _dones: Any
+    _resets: Any
+    _observations: Any
+    _chunks: Any
+    _chunk_cached: Optional[Tuple[int, Any]]
+    _record_index: int
+
+    def __init__(self, path: str, loop: bool = True) -> None:
+        metadata = read_trace_metadata(path)
+
+        super().__init__(
+            T.Tensor if metadata["observation_type"] == "tensor" else np.ndarray,
+            _ACTION_TYPES[metadata["action_type"]]
+        )
+
+        self.path = path
+        self.loop = loop
+        self.record_count = metadata["record_count"]
+        self._metadata = metadata
+
+        if self.record_count == 0:
+            raise Exception("trace {0} has no records".format(path))
+
+        def open_column(name: str, dtype: Any, count: int, shape: Tuple[int, ...] = ()) -> Any:
+            return np.memmap(os.path.join(path, name), dtype = dtype, mode = "r", shape = (count, *shape))
+
+        observation_shape = tuple(metadata["observation_shape"])
+        observation_dtype = np.dtype(metadata["observation_dtype"])
+
+        self._rewards = open_column(TRACE_REWARDS, np.float64, self.record_count)
+        self._dones = open_column(TRACE_DONES, np.bool_, self.record_count)
+        self._resets = open_column(TRACE_RESETS, np.bool_, self.record_count)
+        self._chunks = np.fromfile(os.path.join(path, TRACE_CHUNKS), dtype = np.int64).reshape(-1, 4)
+
+        if metadata["step_count"] > 0:
+            self._actions = open_column(TRACE_ACTIONS, np.dtype(metadata["action_dtype"]), metadata["step_count"], tuple(metadata["action_shape"]))
+        else:
+            self._actions = None
+
+        # Step records find their action by counting the steps before them.
+        self._action_indices = np.cumsum(~np.asarray(self._resets)) - 1
+
+        if metadata["compression"] == TRACE_COMPRESSION_ZLIB:
+            self._observations = None
+        else:
+            # Raw chunks are contiguous, so observations are views straight
+            # into the mapped file. Copy-on-write keeps them writable without
+            # touching the trace.
+            self._observations = np.memmap(
+                os.path.join(path, TRACE_OBSERVATIONS),
+                dtype = observation_dtype,
+                mode = "c",
+                shape = (self.record_count, *observation_shape)
+            )
+
+        self._chunk_cached = None
+        self._record_index = -1
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape(self._metadata["observation_space_shape"])
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape(self._metadata["action_space_shape"])
+
+    def _read_observation(self, record_index: int) -> Any:
+        if self._observations is not None:
+            observation = self._observations[record_index]
+        else:
+            chunk_index = int(np.searchsorted(self._chunks[:, 2], record_index, side = "right")) - 1
+
+            if self._chunk_cached is None or self._chunk_cached[0] != chunk_index:
+                offset, length, first_record, count = self._chunks[chunk_index].tolist()
+
+                with open(os.path.join(self.path, TRACE_OBSERVATIONS), "rb") as f:
+                    f.seek(offset)
+                    data = bytearray(zlib.decompress(f.read(length)))
+
+                self._chunk_cached = (
+                    chunk_index,
+                    np.frombuffer(data, dtype = np.dtype(self._metadata["observation_dtype"])).reshape(count, *self._metadata["observation_shape"])
+                )
+
+            observation = self._chunk_cached[1][record_index - int(self._chunks[chunk_index, 2])]
+
+        return T.from_numpy(observation) if self.observation_type is T.Tensor else observation
+
+    def on_reset(self) -> Any:
+        # The next recorded episode starts at the next reset record, which is
+        # searched for since the agent may have ended the last one early.
+        record_index = self._record_index + 1
+
+        while record_index < self.record_count and not self._resets[record_index]:
+            record_index += 1
+
+        if record_index >= self.record_count:
+            if not self.loop:
+                raise Exception("trace {0} has no more episodes".format(self.path))
+
+            record_index = 0
+
+        self._record_index = record_index
+
+        return self._read_observation(record_index)
+
+    def on_step(self, action: Any) -> EnvironmentStepResult:
+        # The trace is replayed as recorded whatever the agent does, the
+        # recorded action is handed back in the info.
+        record_index = self._record_index + 1
+
+        if self._record_index < 0 or record_index >= self.record_count or self._resets[record_index]:
+            raise Exception("the recorded episode has ended, reset the environment first")
+
+        self._record_index = record_index
+
+        return EnvironmentStepResult(
+            self._read_observation(record_index),
+            float(self._rewards[record_index]),
+            bool(self._dones[record_index]),
+            {
+                "recorded_action": self._actions[self._action_indices[record_index]] if self._actions is not None else None
+            }
+        )
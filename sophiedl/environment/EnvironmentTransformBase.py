@@ -1,10 +1,25 @@
+# Standard library
+from collections import namedtuple
+
 # Typing
-from typing import Generic, Iterable, TypeVar, Union
+from typing import Any, Generic, Iterable, Optional, TypeVar, Union
 
 # Internal
 from ..domain.Shape import Shape
 from .EnvironmentBase import EnvironmentBase
 
+# Describes a transform which only maps observations, so it can be fused with
+# others. copies is set for pure copies, allocates when the result never shares
+# memory with the observation it was computed from.
+EnvironmentObservationTransform = namedtuple(
+    "EnvironmentObservationTransform",
+    [
+        "function",
+        "copies",
+        "allocates"
+    ]
+)
+
 class EnvironmentTransformBase(EnvironmentBase):
     pre_environment: EnvironmentBase
 
@@ -17,3 +32,21 @@ class EnvironmentTransformBase(EnvironmentBase):
             str(self.pre_environment),
             super().__str__()
         )
+
+    def set_validation(self, validation: str, count: int = 0, interval: int = 1) -> None:
+        super().set_validation(validation, count, interval)
+        self.pre_environment.set_validation(validation, count, interval)
+
+    def close(self) -> None:
+        self.pre_environment.close()
+
+    def on_release(self, observation: Any) -> None:
+        # Transforms passing observations through hand them back to where they
+        # came from.
+        self.pre_environment.release(observation)
+
+    def on_get_observation_transform(self) -> Optional[EnvironmentObservationTransform]:
+        return None
+
+    def get_observation_transform(self) -> Optional[EnvironmentObservationTransform]:
+        return self.on_get_observation_transform()
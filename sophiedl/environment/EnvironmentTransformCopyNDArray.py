@@ -1,31 +1,105 @@
 # Typing
-from typing import Any, Iterable, Union
+from typing import Any, Iterable, List, Optional, Union
 
 # NumPy
 import numpy as np # type: ignore
 
 # Internal
 from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
-from .EnvironmentTransformBase import EnvironmentTransformBase
+from .EnvironmentTransformBase import EnvironmentObservationTransform, EnvironmentTransformBase
 from ..domain.Shape import Shape
 
 class EnvironmentTransformCopyNDArray(EnvironmentTransformBase):
-    def __init__(self, pre_environment: EnvironmentBase) -> None:
+    pool_size: int
+    read_only_view: bool
+    _pool: List[Any]
+    _free: List[Any]
+
+    def __init__(self, pre_environment: EnvironmentBase, pool_size: int = 8, read_only_view: bool = False) -> None:
         super().__init__(pre_environment, pre_environment.observation_type, pre_environment.action_type)
-    
+
+        assert pool_size >= 0
+
+        self.pool_size = pool_size
+        self.read_only_view = read_only_view
+        self._pool = []
+        self._free = []
+
     def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
         return self.pre_environment.observation_space_shape
 
     def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
         return self.pre_environment.action_space_shape
 
+    def _acquire(self, observation: Any) -> Optional[Any]:
+        # The pool owns its arrays, and lends them out until they are released.
+        for i, array in enumerate(self._free):
+            if array.shape == observation.shape and array.dtype == observation.dtype:
+                del self._free[i]
+
+                return array
+
+        if len(self._pool) < self.pool_size:
+            array = np.empty_like(observation)
+            self._pool.append(array)
+
+            return array
+
+        return None
+
+    def on_release(self, observation: Any) -> None:
+        if any(i is observation for i in self._pool):
+            if not any(i is observation for i in self._free):
+                self._free.append(observation)
+        else:
+            self.pre_environment.release(observation)
+
+    def _copy(self, observation: Any) -> Any:
+        if self.read_only_view:
+            # The wrapped environment does not reuse its buffer, so a view only
+            # has to keep anyone from writing into it.
+            view = observation.view()
+            view.flags.writeable = False
+
+            return view
+
+        array = self._acquire(observation)
+
+        if array is None:
+            # Everything in the pool is still lent out, e.g. to memories of an
+            # on-policy agent, which never releases its observations.
+            return observation.copy()
+
+        np.copyto(array, observation)
+
+        return array
+
+    def on_get_observation_transform(self) -> Optional[EnvironmentObservationTransform]:
+        return EnvironmentObservationTransform(self._copy, True, not self.read_only_view)
+
     def on_reset(self) -> Any:
-        return self.pre_environment.reset().copy()
-    
+        return self._copy(self.pre_environment.reset())
+
+    def on_clone_state(self) -> Optional[Any]:
+        return self.pre_environment.clone_state()
+
+    def on_restore_state(self, state: Any) -> Any:
+        return self._copy(self.pre_environment.restore_state(state))
+
     def on_step(self, action: Any) -> EnvironmentStepResult:
         pre_result = self.pre_environment.step(action)
         return EnvironmentStepResult(
-            pre_result.observation.copy(),
+            self._copy(pre_result.observation),
+            pre_result.reward,
+            pre_result.done,
+            pre_result.info
+        )
+
+    def on_skip(self, action: Any) -> EnvironmentStepResult:
+        # Only the observation which ends an episode is still needed.
+        pre_result = self.pre_environment.skip(action)
+        return EnvironmentStepResult(
+            self._copy(pre_result.observation) if pre_result.done and pre_result.observation is not None else None,
             pre_result.reward,
             pre_result.done,
             pre_result.info
@@ -0,0 +1,90 @@
+# Standard library
+from collections import deque
+
+# Typing
+from typing import Any, Deque, Iterable, Optional, Union
+
+# Internal
+from ..domain.FrameStack import FrameRing, FrameStack
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
+from .EnvironmentTransformBase import EnvironmentTransformBase
+
+class EnvironmentTransformFrameStack(EnvironmentTransformBase):
+    stack_count: int
+    ring: FrameRing
+    _frame_indices: Deque[int]
+
+    def __init__(self, pre_environment: EnvironmentBase, stack_count: int, ring_capacity: Optional[int] = None) -> None:
+        super().__init__(pre_environment, FrameStack, pre_environment.action_type)
+
+        # Every frame is written once into the ring and observations are views
+        # of the last stack_count frames. The current and the next stack of a
+        # step must both stay readable, hence at least one spare slot.
+        ring_capacity = ring_capacity if ring_capacity is not None else stack_count + 1
+
+        assert stack_count > 0
+        assert ring_capacity > stack_count
+
+        self.stack_count = stack_count
+        self.ring = FrameRing(ring_capacity)
+        self._frame_indices = deque(maxlen = stack_count)
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        shape = self.pre_environment.observation_space_shape
+
+        return Shape((shape[0] * self.stack_count, *shape[1:]))
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self.pre_environment.action_space_shape
+
+    def _append(self, observation: Any) -> int:
+        # Frames are copied into the ring, so the observation is not needed
+        # any more.
+        frame_index = self.ring.append(observation)
+        self.pre_environment.release(observation)
+
+        return frame_index
+
+    def on_release(self, observation: Any) -> None:
+        pass
+
+    def on_reset(self) -> Any:
+        frame_index = self._append(self.pre_environment.reset())
+
+        # A new episode starts with its first frame repeated.
+        self._frame_indices.clear()
+        self._frame_indices.extend([frame_index] * self.stack_count)
+
+        return FrameStack(self.ring, tuple(self._frame_indices))
+
+    def on_clone_state(self) -> Optional[Any]:
+        pre_state = self.pre_environment.clone_state()
+
+        if pre_state is None:
+            return None
+
+        # The stacked frames are copied out, as the ring moves on.
+        return (pre_state, [self.ring.get(i).clone() for i in self._frame_indices])
+
+    def on_restore_state(self, state: Any) -> Any:
+        pre_state, frames = state
+
+        self.pre_environment.release(self.pre_environment.restore_state(pre_state))
+
+        self._frame_indices.clear()
+        self._frame_indices.extend(self.ring.append(frame) for frame in frames)
+
+        return FrameStack(self.ring, tuple(self._frame_indices))
+
+    def on_step(self, action: Any) -> EnvironmentStepResult:
+        pre_result = self.pre_environment.step(action)
+
+        self._frame_indices.append(self._append(pre_result.observation))
+
+        return EnvironmentStepResult(
+            FrameStack(self.ring, tuple(self._frame_indices)),
+            pre_result.reward,
+            pre_result.done,
+            pre_result.info
+        )
@@ -0,0 +1,118 @@
+# Typing
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
+from .EnvironmentTransformBase import EnvironmentTransformBase
+
+class EnvironmentTransformFused(EnvironmentTransformBase):
+    fused_environments: List[EnvironmentTransformBase]
+    dropped_environments: List[EnvironmentTransformBase]
+    _functions: List[Callable[[Any], Any]]
+    _allocates: bool
+    _environment_top: EnvironmentBase
+    _observation_space_shape_fused: Shape
+    _action_space_shape_fused: Shape
+
+    def __init__(self, environment: EnvironmentBase) -> None:
+        # The transforms at the top of the stack which only map observations
+        # are replaced by a single call, on top of the first transform which
+        # does more (or the environment itself).
+        layers: List[EnvironmentTransformBase] = []
+        pre_environment = environment
+
+        while isinstance(pre_environment, EnvironmentTransformBase) and pre_environment.get_observation_transform() is not None:
+            layers.append(pre_environment)
+            pre_environment = pre_environment.pre_environment
+
+        super().__init__(pre_environment, environment.observation_type, environment.action_type)
+
+        self._environment_top = environment
+        self._observation_space_shape_fused = environment.observation_space_shape
+        self._action_space_shape_fused = environment.action_space_shape
+
+        self.fused_environments = []
+        self.dropped_environments = []
+        self._functions = []
+
+        # Layers run from the bottom up. A copy is redundant once a later
+        # layer allocates a new observation anyway.
+        allocated_later = False
+
+        for layer in layers:
+            observation_transform = layer.get_observation_transform()
+
+            assert observation_transform is not None
+
+            if observation_transform.copies and allocated_later:
+                self.dropped_environments.append(layer)
+            else:
+                self.fused_environments.append(layer)
+                self._functions.append(observation_transform.function)
+
+            allocated_later = allocated_later or observation_transform.allocates
+
+        self._allocates = allocated_later
+        self.fused_environments.reverse()
+        self.dropped_environments.reverse()
+        self._functions.reverse()
+
+    def __str__(self) -> str:
+        return "{0}\n  Fused: {1}\n  Dropped: {2}".format(
+            super().__str__(),
+            ", ".join(type(i).__name__ for i in self.fused_environments) or "none",
+            ", ".join(type(i).__name__ for i in self.dropped_environments) or "none"
+        )
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self._observation_space_shape_fused
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self._action_space_shape_fused
+
+    def _transform(self, observation: Any) -> Any:
+        transformed = observation
+
+        for function in self._functions:
+            transformed = function(transformed)
+
+        if self._allocates:
+            self.pre_environment.release(observation)
+
+        return transformed
+
+    def on_release(self, observation: Any) -> None:
+        # The layers still know which of them own the observation.
+        self._environment_top.release(observation)
+
+    def on_reset(self) -> Any:
+        return self._transform(self.pre_environment.on_reset())
+
+    def on_clone_state(self) -> Optional[Any]:
+        return self.pre_environment.clone_state()
+
+    def on_restore_state(self, state: Any) -> Any:
+        return self._transform(self.pre_environment.on_restore_state(state))
+
+    def on_step(self, action: Any) -> EnvironmentStepResult:
+        # Only the fused environment validates, the layers underneath are
+        # trusted to keep producing what they were built for.
+        observation, reward, done, info = self.pre_environment.on_step(action)
+
+        return EnvironmentStepResult(
+            self._transform(observation),
+            reward,
+            done,
+            info
+        )
+
+    def on_skip(self, action: Any) -> EnvironmentStepResult:
+        pre_result = self.pre_environment.skip(action)
+
+        return EnvironmentStepResult(
+            self._transform(pre_result.observation) if pre_result.done and pre_result.observation is not None else None,
+            pre_result.reward,
+            pre_result.done,
+            pre_result.info
+        )
@@ -0,0 +1,32 @@
+# Typing
+from typing import Any, Iterable, Union
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase
+from .EnvironmentTransformObservationBase import EnvironmentTransformObservationBase
+from .frame_operations import grayscale
+
+class EnvironmentTransformGrayscale(EnvironmentTransformObservationBase):
+    channels_last: bool
+
+    def __init__(self, pre_environment: EnvironmentBase, channels_last: bool = True) -> None:
+        super().__init__(pre_environment, T.Tensor)
+        self.channels_last = channels_last
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        shape = self.pre_environment.observation_space_shape
+
+        if self.channels_last:
+            return Shape((*shape[:-3], 1, shape[-3], shape[-2]))
+        else:
+            return Shape((*shape[:-3], 1, shape[-2], shape[-1]))
+
+    def on_allocates_observation(self) -> bool:
+        return True
+
+    def on_transform_observation(self, observation: Any) -> Any:
+        return grayscale(observation, channels_last = self.channels_last)
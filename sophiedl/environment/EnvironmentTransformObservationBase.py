@@ -0,0 +1,72 @@
+# Standard library
+import abc
+
+# Typing
+from typing import Any, Iterable, Optional, Union
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
+from .EnvironmentTransformBase import EnvironmentObservationTransform, EnvironmentTransformBase
+
+class EnvironmentTransformObservationBase(EnvironmentTransformBase):
+    def __init__(self, pre_environment: EnvironmentBase, observation_type: type) -> None:
+        super().__init__(pre_environment, observation_type, pre_environment.action_type)
+
+    @abc.abstractmethod
+    def on_transform_observation(self, observation: Any) -> Any:
+        pass
+
+    def on_allocates_observation(self) -> bool:
+        return False
+
+    def transform_observation(self, observation: Any) -> Any:
+        transformed = self.on_transform_observation(observation)
+
+        # A new observation no longer refers to the one it was computed from.
+        if self.on_allocates_observation():
+            self.pre_environment.release(observation)
+
+        return transformed
+
+    def on_release(self, observation: Any) -> None:
+        if not self.on_allocates_observation():
+            self.pre_environment.release(observation)
+
+    def on_get_observation_transform(self) -> Optional[EnvironmentObservationTransform]:
+        return EnvironmentObservationTransform(
+            self.on_transform_observation,
+            False,
+            self.on_allocates_observation()
+        )
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self.pre_environment.action_space_shape
+
+    def on_reset(self) -> Any:
+        return self.transform_observation(self.pre_environment.reset())
+
+    def on_clone_state(self) -> Optional[Any]:
+        return self.pre_environment.clone_state()
+
+    def on_restore_state(self, state: Any) -> Any:
+        return self.transform_observation(self.pre_environment.restore_state(state))
+
+    def on_step(self, action: Any) -> EnvironmentStepResult:
+        pre_result = self.pre_environment.step(action)
+        return EnvironmentStepResult(
+            self.transform_observation(pre_result.observation),
+            pre_result.reward,
+            pre_result.done,
+            pre_result.info
+        )
+
+    def on_skip(self, action: Any) -> EnvironmentStepResult:
+        # Only the observation which ends an episode is still needed.
+        pre_result = self.pre_environment.skip(action)
+        return EnvironmentStepResult(
+            self.transform_observation(pre_result.observation) if pre_result.done and pre_result.observation is not None else None,
+            pre_result.reward,
+            pre_result.done,
+            pre_result.info
+        )
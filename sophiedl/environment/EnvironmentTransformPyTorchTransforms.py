@@ -1,5 +1,5 @@
 # Typing
-from typing import Any, Iterable, Union
+from typing import Any, Iterable, Optional, Union
 
 # PyTorch
 import torch as T
@@ -7,7 +7,7 @@ import torchvision.transforms as transforms # type: ignore
 
 # Internal
 from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
-from .EnvironmentTransformBase import EnvironmentTransformBase
+from .EnvironmentTransformBase import EnvironmentObservationTransform, EnvironmentTransformBase
 from ..domain.Shape import Shape
 
 class EnvironmentTransformPyTorchTransforms(EnvironmentTransformBase):
@@ -25,9 +25,19 @@ class EnvironmentTransformPyTorchTransforms(EnvironmentTransformBase):
     def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
         return self.pre_environment.action_space_shape
 
+    def on_get_observation_transform(self) -> Optional[EnvironmentObservationTransform]:
+        # Arbitrary torchvision transforms may return their input unchanged.
+        return EnvironmentObservationTransform(self.transforms, False, False)
+
     def on_reset(self) -> Any:
         return self.transforms(self.pre_environment.reset())
     
+    def on_clone_state(self) -> Optional[Any]:
+        return self.pre_environment.clone_state()
+
+    def on_restore_state(self, state: Any) -> Any:
+        return self.transforms(self.pre_environment.restore_state(state))
+
     def on_step(self, action: Any) -> EnvironmentStepResult:
         pre_result = self.pre_environment.step(action)
         return EnvironmentStepResult(
@@ -36,3 +46,13 @@ class EnvironmentTransformPyTorchTransforms(EnvironmentTransformBase):
             pre_result.done,
             pre_result.info
         )
+
+    def on_skip(self, action: Any) -> EnvironmentStepResult:
+        # Only the observation which ends an episode is still needed.
+        pre_result = self.pre_environment.skip(action)
+        return EnvironmentStepResult(
+            self.transforms(pre_result.observation) if pre_result.done and pre_result.observation is not None else None,
+            pre_result.reward,
+            pre_result.done,
+            pre_result.info
+        )
@@ -0,0 +1,197 @@
+# Standard library
+import os
+import zlib
+
+# Typing
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
+from .EnvironmentTransformBase import EnvironmentTransformBase
+from .trace import (
+    TRACE_ACTIONS,
+    TRACE_CHUNKS,
+    TRACE_COMPRESSION_NONE,
+    TRACE_COMPRESSION_ZLIB,
+    TRACE_DONES,
+    TRACE_OBSERVATIONS,
+    TRACE_RESETS,
+    TRACE_REWARDS,
+    write_trace_metadata
+)
+
+class EnvironmentTransformRecordTrace(EnvironmentTransformBase):
+    path: str
+    chunk_size: int
+    compression: str
+    compression_level: int
+    record_count: int
+    step_count: int
+    _episode_record_count: int
+    _episode_step_count: int
+    _files: Dict[str, BinaryIO]
+    _chunk: Optional[Any]
+    _chunk_count: int
+    _observations_offset: int
+    _metadata: Dict[str, Any]
+
+    def __init__(
+        self,
+        pre_environment: EnvironmentBase,
+        path: str,
+        chunk_size: int = 64,
+        compression: str = TRACE_COMPRESSION_ZLIB,
+        compression_level: int = 1) -> None:
+        super().__init__(pre_environment, pre_environment.observation_type, pre_environment.action_type)
+
+        assert chunk_size > 0
+
+        if compression not in (TRACE_COMPRESSION_NONE, TRACE_COMPRESSION_ZLIB):
+            raise Exception("unknown trace compression: {0}".format(compression))
+
+        if issubclass(pre_environment.observation_type, T.Tensor):
+            observation_type = "tensor"
+        elif issubclass(pre_environment.observation_type, np.ndarray):
+            observation_type = "ndarray"
+        else:
+            raise Exception("cannot record observations of type {0}".format(pre_environment.observation_type.__name__))
+
+        os.makedirs(path, exist_ok = True)
+
+        self.path = path
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.compression_level = compression_level
+        self.record_count = 0
+        self.step_count = 0
+        self._episode_record_count = 0
+        self._episode_step_count = 0
+        self._files = {
+            name: open(os.path.join(path, name), "wb")
+            for name in (TRACE_ACTIONS, TRACE_REWARDS, TRACE_DONES, TRACE_RESETS, TRACE_OBSERVATIONS, TRACE_CHUNKS)
+        }
+        self._chunk = None
+        self._chunk_count = 0
+        self._observations_offset = 0
+        self._metadata = {
+            "compression": compression,
+            "observation_type": observation_type,
+            "action_type": pre_environment.action_type.__name__ if pre_environment.action_type in (int, float) else (
+                "tensor" if issubclass(pre_environment.action_type, T.Tensor) else "ndarray"
+            ),
+            "observation_space_shape": list(pre_environment.observation_space_shape),
+            "action_space_shape": list(pre_environment.action_space_shape),
+            "observation_shape": None,
+            "observation_dtype": None,
+            "action_shape": None,
+            "action_dtype": None,
+            "record_count": 0,
+            "step_count": 0
+        }
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self.pre_environment.observation_space_shape
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self.pre_environment.action_space_shape
+
+    def _end_episode(self) -> None:
+        self._episode_record_count = self.record_count
+        self._episode_step_count = self.step_count
+
+    def _flush(self) -> None:
+        # Records become part of the trace once their chunk is written and the
+        # metadata counts them. The metadata only counts records up to the end
+        # of the last episode, so a trace that was never closed can still be
+        # replayed up to there; the records after it are ignored.
+        if self._chunk is not None and self._chunk_count > 0:
+            data = self._chunk[:self._chunk_count].tobytes()
+
+            if self.compression == TRACE_COMPRESSION_ZLIB:
+                data = zlib.compress(data, self.compression_level)
+
+            self._files[TRACE_OBSERVATIONS].write(data)
+            self._files[TRACE_CHUNKS].write(
+                np.asarray(
+                    [self._observations_offset, len(data), self.record_count - self._chunk_count, self._chunk_count],
+                    dtype = np.int64
+                ).tobytes()
+            )
+
+            self._observations_offset += len(data)
+            self._chunk_count = 0
+
+        for f in self._files.values():
+            f.flush()
+
+        self._metadata["record_count"] = self._episode_record_count
+        self._metadata["step_count"] = self._episode_step_count
+
+        write_trace_metadata(self.path, self._metadata)
+
+    def _record(self, observation: Any, reward: float, done: bool, reset: bool) -> None:
+        observation = observation.numpy() if isinstance(observation, T.Tensor) else np.asarray(observation)
+
+        if self._chunk is None:
+            self._chunk = np.empty((self.chunk_size, *observation.shape), dtype = observation.dtype)
+            self._metadata["observation_shape"] = list(observation.shape)
+            self._metadata["observation_dtype"] = observation.dtype.str
+
+        self._chunk[self._chunk_count] = observation
+        self._chunk_count += 1
+        self.record_count += 1
+
+        self._files[TRACE_REWARDS].write(np.float64(reward).tobytes())
+        self._files[TRACE_DONES].write(np.bool_(done).tobytes())
+        self._files[TRACE_RESETS].write(np.bool_(reset).tobytes())
+
+        if done:
+            self._end_episode()
+
+        if done or self._chunk_count == self.chunk_size:
+            self._flush()
+
+    def on_reset(self) -> Any:
+        observation = self.pre_environment.reset()
+
+        # Whatever was recorded of an unfinished episode is kept.
+        self._end_episode()
+        self._flush()
+        self._record(observation, 0., False, True)
+
+        return observation
+
+    def on_step(self, action: Any) -> EnvironmentStepResult:
+        pre_result = self.pre_environment.step(action)
+
+        action_array = action.cpu().numpy() if isinstance(action, T.Tensor) else np.asarray(action)
+
+        if self._metadata["action_dtype"] is None:
+            self._metadata["action_shape"] = list(action_array.shape)
+            self._metadata["action_dtype"] = action_array.dtype.str
+
+        self._files[TRACE_ACTIONS].write(action_array.astype(self._metadata["action_dtype"]).tobytes())
+        self.step_count += 1
+
+        self._record(pre_result.observation, pre_result.reward, pre_result.done, False)
+
+        return pre_result
+
+    def close(self) -> None:
+        if len(self._files) > 0:
+            self._end_episode()
+            self._flush()
+
+            for f in self._files.values():
+                f.close()
+
+            self._files = {}
+
+        super().close()
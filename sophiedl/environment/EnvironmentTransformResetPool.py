@@ -0,0 +1,180 @@
+# Standard library
+import queue
+import threading
+
+# Typing
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase, EnvironmentStepResult
+from .EnvironmentTransformBase import EnvironmentTransformBase
+
+class EnvironmentTransformResetPool(EnvironmentTransformBase):
+    pool_size: int
+    reuse_count: int
+    environment_factory: Optional[Callable[[], EnvironmentBase]]
+    restored_count: int
+    refreshed_count: int
+    fallback_count: int
+    _states: List[Any]
+    _state_uses: List[int]
+    _state_index: int
+    _snapshots_supported: bool
+    _queue: "queue.Queue[Any]"
+    _thread: Optional[threading.Thread]
+    _stopping: threading.Event
+    _error: Optional[BaseException]
+
+    def __init__(
+        self,
+        pre_environment: EnvironmentBase,
+        pool_size: int = 4,
+        environment_factory: Optional[Callable[[], EnvironmentBase]] = None,
+        reuse_count: int = 8) -> None:
+        super().__init__(pre_environment, pre_environment.observation_type, pre_environment.action_type)
+
+        assert pool_size > 0
+        assert reuse_count >= 0
+
+        # Without a factory, the start states of real resets are kept and
+        # restored in turn, each up to reuse_count times before a real reset
+        # replaces it, so that start states keep being refreshed. With one, a
+        # second environment built by the factory (which must build the same
+        # stack) keeps preparing fresh start states in a background thread.
+        self.pool_size = pool_size
+        self.reuse_count = reuse_count
+        self.environment_factory = environment_factory
+        self.restored_count = 0
+        self.refreshed_count = 0
+        self.fallback_count = 0
+        self._states = []
+        self._state_uses = []
+        self._state_index = 0
+        self._snapshots_supported = True
+        self._queue = queue.Queue(maxsize = pool_size)
+        self._thread = None
+        self._stopping = threading.Event()
+        self._error = None
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self.pre_environment.observation_space_shape
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return self.pre_environment.action_space_shape
+
+    def _prepare_states(self) -> None:
+        assert self.environment_factory is not None
+
+        environment: Optional[EnvironmentBase] = None
+
+        try:
+            environment = self.environment_factory()
+
+            while not self._stopping.is_set():
+                environment.release(environment.reset())
+                state = environment.clone_state()
+
+                if state is None:
+                    # The environment cannot snapshot itself, so there is
+                    # nothing to prepare and every reset falls back.
+                    break
+
+                while not self._stopping.is_set():
+                    try:
+                        self._queue.put(state, timeout = 0.1)
+                        break
+                    except queue.Full:
+                        pass
+        except BaseException as e:
+            # Raised on the next reset, which would otherwise keep falling
+            # back without a word.
+            self._error = e
+        finally:
+            if environment is not None:
+                environment.close()
+
+    def _refresh_state(self) -> Any:
+        # A real reset starts the episode, and its start state takes the place
+        # of the snapshot which has been used up.
+        observation = self.pre_environment.reset()
+        state = self.pre_environment.clone_state()
+
+        if state is None:
+            self._snapshots_supported = False
+            self.fallback_count += 1
+
+            return observation
+
+        if len(self._states) < self.pool_size:
+            self._states.append(state)
+            self._state_uses.append(0)
+        else:
+            self._states[self._state_index] = state
+            self._state_uses[self._state_index] = 0
+
+        self._state_index = (self._state_index + 1) % self.pool_size
+        self.refreshed_count += 1
+
+        return observation
+
+    def on_reset(self) -> Any:
+        if self.environment_factory is None:
+            if not self._snapshots_supported:
+                self.fallback_count += 1
+
+                return self.pre_environment.reset()
+
+            if len(self._states) < self.pool_size or self._state_uses[self._state_index] >= self.reuse_count:
+                return self._refresh_state()
+
+            state = self._states[self._state_index]
+            self._state_uses[self._state_index] += 1
+            self._state_index = (self._state_index + 1) % self.pool_size
+        else:
+            if self._error is not None:
+                error = self._error
+                self._error = None
+
+                # The next reset starts preparing start states over.
+                if self._thread is not None:
+                    self._thread.join()
+                    self._thread = None
+
+                raise Exception("preparing start states failed") from error
+
+            if self._thread is None:
+                self._thread = threading.Thread(target = self._prepare_states, daemon = True)
+                self._thread.start()
+
+            try:
+                state = self._queue.get_nowait()
+            except queue.Empty:
+                self.fallback_count += 1
+
+                return self.pre_environment.reset()
+
+        self.restored_count += 1
+
+        return self.pre_environment.restore_state(state)
+
+    def on_step(self, action: Any) -> EnvironmentStepResult:
+        return self.pre_environment.on_step(action)
+
+    def on_skip(self, action: Any) -> EnvironmentStepResult:
+        return self.pre_environment.skip(action)
+
+    def on_clone_state(self) -> Optional[Any]:
+        return self.pre_environment.clone_state()
+
+    def on_restore_state(self, state: Any) -> Any:
+        return self.pre_environment.restore_state(state)
+
+    def close(self) -> None:
+        self._stopping.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        super().close()
@@ -0,0 +1,31 @@
+# Typing
+from typing import Any, Iterable, Union
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.FrameStack import FrameStack
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase
+from .EnvironmentTransformObservationBase import EnvironmentTransformObservationBase
+from .frame_operations import resize_area
+
+class EnvironmentTransformResize(EnvironmentTransformObservationBase):
+    height: int
+    width: int
+
+    def __init__(self, pre_environment: EnvironmentBase, height: int, width: int) -> None:
+        super().__init__(pre_environment, T.Tensor)
+        self.height = height
+        self.width = width
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape((*self.pre_environment.observation_space_shape[:-2], self.height, self.width))
+
+    def on_allocates_observation(self) -> bool:
+        # Frames which already have the target size are passed through.
+        return tuple(self.pre_environment.observation_space_shape[-2:]) != (self.height, self.width)
+
+    def on_transform_observation(self, observation: Any) -> Any:
+        return resize_area(T.as_tensor(FrameStack.materialize(observation)), self.height, self.width)
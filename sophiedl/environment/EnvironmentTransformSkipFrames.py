@@ -1,5 +1,8 @@
 # Typing
-from typing import Any, Iterable, TypeVar, Union
+from typing import Any, Iterable, Optional, TypeVar, Union
+
+# NumPy
+import numpy as np # type: ignore
 
 # PyTorch
 import torch as T
@@ -11,36 +14,141 @@ from .EnvironmentTransformBase import EnvironmentTransformBase
 
 class EnvironmentTransformSkipFrames(EnvironmentTransformBase):
     skip_count: int
+    max_pool: bool
+    _observation_last: Any
+    _observation_last_released: bool
 
-    def __init__(self, pre_environment: EnvironmentBase, skip_count: int) -> None:
+    def __init__(self, pre_environment: EnvironmentBase, skip_count: int, max_pool: bool = False) -> None:
         super().__init__(pre_environment, pre_environment.observation_type, pre_environment.action_type)
+
+        assert skip_count > 0
+
         self.skip_count = skip_count
-    
+        self.max_pool = max_pool
+        self._observation_last = None
+        self._observation_last_released = False
+
     def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
         return self.pre_environment.observation_space_shape
 
     def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
         return self.pre_environment.action_space_shape
 
+    def _set_observation_last(self, observation: Any) -> Any:
+        # The last observation stands in for a final one which is skipped, so
+        # it is only handed back once it has been replaced.
+        if self._observation_last_released:
+            self.pre_environment.release(self._observation_last)
+
+        self._observation_last = observation
+        self._observation_last_released = False
+
+        return observation
+
+    def on_release(self, observation: Any) -> None:
+        if observation is self._observation_last:
+            self._observation_last_released = True
+        else:
+            self.pre_environment.release(observation)
+
     def on_reset(self) -> Any:
-        return self.pre_environment.reset()
-    
+        return self._set_observation_last(self.pre_environment.reset())
+
+    def on_clone_state(self) -> Optional[Any]:
+        return self.pre_environment.clone_state()
+
+    def on_restore_state(self, state: Any) -> Any:
+        return self._set_observation_last(self.pre_environment.restore_state(state))
+
+    @staticmethod
+    def _max_pool(observation_previous: Any, observation: Any) -> Any:
+        if isinstance(observation, np.ndarray):
+            return np.maximum(observation_previous, observation)
+        elif isinstance(observation, T.Tensor):
+            return T.maximum(observation_previous, observation)
+        else:
+            raise TypeError(
+                "cannot max-pool observations of type {0}".format(
+                    type(observation).__name__
+                )
+            )
+
+    @staticmethod
+    def _copy(observation: Any) -> Any:
+        # The wrapped environment may hand out a view of a screen buffer which
+        # the next frame overwrites.
+        if isinstance(observation, np.ndarray):
+            return observation.copy()
+        elif isinstance(observation, T.Tensor):
+            return observation.clone()
+        else:
+            return observation
+
     def on_step(self, action: Any) -> EnvironmentStepResult:
-        assert self.skip_count > 1
+        # The action and the final observation are validated once by step. The
+        # frames in between go straight to the wrapped environment, and the
+        # ones whose observation is not needed are only skipped.
+        observed_count = 2 if self.max_pool and self.skip_count > 1 else 1
+        reward = 0.
+
+        for i in range(self.skip_count - observed_count):
+            result = self.pre_environment.skip(action)
+            reward += result.reward
+
+            if result.done:
+                # Should the wrapped environment not have produced the final
+                # observation, the last one stands in for it and is lent out
+                # once more.
+                if result.observation is not None:
+                    self._set_observation_last(result.observation)
+                else:
+                    self._observation_last_released = False
+
+                return EnvironmentStepResult(
+                    self._observation_last,
+                    reward,
+                    True,
+                    result.info
+                )
+
+        observation_previous = None
+
+        for i in range(observed_count):
+            result = self.pre_environment.on_step(action)
+            reward += result.reward
 
-        result = None
+            if result.done or i == observed_count - 1:
+                break
+
+            observation_previous = self._copy(result.observation)
+            self.pre_environment.release(result.observation)
+
+        observation = result.observation
+
+        if observation_previous is not None and not result.done:
+            observation = self._max_pool(observation_previous, observation)
+            self.pre_environment.release(result.observation)
 
-        for i in range(self.skip_count - 1):
-            result = self.pre_environment.step(action)
+        return EnvironmentStepResult(
+            self._set_observation_last(observation),
+            reward,
+            result.done,
+            result.info
+        )
+
+    def on_skip(self, action: Any) -> EnvironmentStepResult:
+        reward = 0.
+
+        for i in range(self.skip_count):
+            result = self.pre_environment.skip(action)
+            reward += result.reward
 
-            assert result is not None
-            
             if result.done:
                 break
-        
-        assert result is not None
 
-        if result.done:
-            return result
-        else:
-            return self.pre_environment.step(action)
+        return EnvironmentStepResult(
+            None,
+            reward,
+            result.done,
+            result.info
+        )
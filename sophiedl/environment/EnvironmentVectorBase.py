@@ -0,0 +1,137 @@
+# Standard library
+from collections import namedtuple
+import abc
+
+# Typing
+from typing import Iterable, Optional, Union
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.Shape import Shape
+
+EnvironmentVectorStepResult = namedtuple(
+    "EnvironmentVectorStepResult",
+    [
+        "observations",
+        "rewards",
+        "dones",
+        "infos"
+    ]
+)
+
+EnvironmentVectorReceiveResult = namedtuple(
+    "EnvironmentVectorReceiveResult",
+    [
+        "environment_indices",
+        "observations",
+        "rewards",
+        "dones",
+        "infos"
+    ]
+)
+
+class EnvironmentVectorBase(abc.ABC):
+    environment_count: int
+    _observation_space_shape: Optional[Shape]
+    _action_space_shape: Optional[Shape]
+
+    def __init__(self, environment_count: int) -> None:
+        assert environment_count > 0
+
+        self.environment_count = environment_count
+        self._observation_space_shape = None
+        self._action_space_shape = None
+
+    def __str__(self) -> str:
+        return "{0}:\n  Environment count: {1}\n  Observation space shape: {2}\n  Action space shape: {3} (flat size: {4})".format(
+            type(self).__name__,
+            self.environment_count,
+            self.observation_space_shape,
+            self.action_space_shape,
+            self.action_space_shape.flat_size
+        )
+
+    @abc.abstractmethod
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        pass
+
+    @abc.abstractmethod
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        pass
+
+    @abc.abstractmethod
+    def on_reset(self, environment_indices: T.Tensor) -> T.Tensor:
+        pass
+
+    @abc.abstractmethod
+    def on_step(self, actions: T.Tensor) -> EnvironmentVectorStepResult:
+        pass
+
+    @abc.abstractmethod
+    def on_send(self, actions: T.Tensor, environment_indices: T.Tensor) -> None:
+        pass
+
+    @abc.abstractmethod
+    def on_receive(self, batch_size: int) -> EnvironmentVectorReceiveResult:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def reset(self, environment_indices: Optional[T.Tensor] = None) -> T.Tensor:
+        return self.on_reset(
+            environment_indices if environment_indices is not None else T.arange(self.environment_count)
+        )
+
+    def step(self, actions: T.Tensor) -> EnvironmentVectorStepResult:
+        actions = T.as_tensor(actions)
+
+        if actions.shape[0] != self.environment_count:
+            raise Exception(
+                "expected {0} actions, not {1}".format(
+                    self.environment_count,
+                    actions.shape[0]
+                )
+            )
+
+        return self.on_step(actions)
+
+    def send(self, actions: T.Tensor, environment_indices: T.Tensor) -> None:
+        actions = T.as_tensor(actions)
+        environment_indices = T.as_tensor(environment_indices)
+
+        if actions.shape[0] != environment_indices.shape[0]:
+            raise Exception(
+                "expected {0} actions, not {1}".format(
+                    environment_indices.shape[0],
+                    actions.shape[0]
+                )
+            )
+
+        self.on_send(actions, environment_indices)
+
+    def recv(self, batch_size: int) -> EnvironmentVectorReceiveResult:
+        if batch_size <= 0:
+            raise Exception("batch size must be positive")
+
+        return self.on_receive(batch_size)
+
+    @property
+    def observation_space_shape(self) -> Shape:
+        if self._observation_space_shape is None:
+            self._observation_space_shape = Shape.intern(
+                self.on_get_observation_space_shape()
+            )
+
+        return self._observation_space_shape
+
+    @property
+    def action_space_shape(self) -> Shape:
+        if self._action_space_shape is None:
+            self._action_space_shape = Shape.intern(
+                self.on_get_action_space_shape()
+            )
+
+        return self._action_space_shape
@@ -0,0 +1,62 @@
+# Typing
+from typing import Any, Iterable, Optional, Tuple, Union
+
+# NumPy
+import numpy as np # type: ignore
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentVectorNumPyBase import EnvironmentVectorNumPyBase
+
+class EnvironmentVectorCartPole(EnvironmentVectorNumPyBase):
+    # The dynamics and constants of Gym's CartPole-v0.
+    GRAVITY = 9.8
+    MASS_CART = 1.0
+    MASS_POLE = 0.1
+    TOTAL_MASS = MASS_CART + MASS_POLE
+    LENGTH = 0.5
+    POLE_MASS_LENGTH = MASS_POLE * LENGTH
+    FORCE_MAGNITUDE = 10.0
+    TAU = 0.02
+    THETA_THRESHOLD = 12 * 2 * np.pi / 360
+    X_THRESHOLD = 2.4
+
+    def __init__(self, environment_count: int, max_episode_steps: int = 200, seed: Optional[int] = None) -> None:
+        super().__init__(environment_count, max_episode_steps, seed)
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape((4,))
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape((2,))
+
+    def on_reset_states(self, count: int) -> Any:
+        return self.random.uniform(low = -0.05, high = 0.05, size = (count, 4))
+
+    def on_step_states(self, states: Any, actions: Any) -> Tuple[Any, Any, Any]:
+        x, x_dot, theta, theta_dot = states.T
+
+        force = np.where(actions.reshape(-1) == 1, self.FORCE_MAGNITUDE, -self.FORCE_MAGNITUDE)
+        cos_theta = np.cos(theta)
+        sin_theta = np.sin(theta)
+
+        temp = (force + self.POLE_MASS_LENGTH * theta_dot ** 2 * sin_theta) / self.TOTAL_MASS
+        theta_acc = (self.GRAVITY * sin_theta - cos_theta * temp) / (self.LENGTH * (4.0 / 3.0 - self.MASS_POLE * cos_theta ** 2 / self.TOTAL_MASS))
+        x_acc = temp - self.POLE_MASS_LENGTH * theta_acc * cos_theta / self.TOTAL_MASS
+
+        states = np.stack(
+            [
+                x + self.TAU * x_dot,
+                x_dot + self.TAU * x_acc,
+                theta + self.TAU * theta_dot,
+                theta_dot + self.TAU * theta_acc
+            ],
+            axis = 1
+        )
+
+        dones = (
+            (np.abs(states[:, 0]) > self.X_THRESHOLD) |
+            (np.abs(states[:, 2]) > self.THETA_THRESHOLD)
+        )
+
+        return states, np.ones(len(states), dtype = np.float64), dones
@@ -0,0 +1,51 @@
+# Typing
+from typing import Any, Iterable, Optional, Tuple, Union
+
+# NumPy
+import numpy as np # type: ignore
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentVectorNumPyBase import EnvironmentVectorNumPyBase
+
+class EnvironmentVectorMountainCarContinuous(EnvironmentVectorNumPyBase):
+    # The dynamics and constants of Gym's MountainCarContinuous-v0.
+    MIN_ACTION = -1.0
+    MAX_ACTION = 1.0
+    MIN_POSITION = -1.2
+    MAX_POSITION = 0.6
+    MAX_SPEED = 0.07
+    GOAL_POSITION = 0.45
+    GOAL_VELOCITY = 0.
+    POWER = 0.0015
+
+    def __init__(self, environment_count: int, max_episode_steps: int = 999, seed: Optional[int] = None) -> None:
+        super().__init__(environment_count, max_episode_steps, seed)
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape((2,))
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape((1,))
+
+    def on_reset_states(self, count: int) -> Any:
+        states = np.zeros((count, 2))
+        states[:, 0] = self.random.uniform(low = -0.6, high = -0.4, size = count)
+
+        return states
+
+    def on_step_states(self, states: Any, actions: Any) -> Tuple[Any, Any, Any]:
+        position = states[:, 0]
+        velocity = states[:, 1]
+
+        action = actions.reshape(len(states), -1)[:, 0].astype(np.float64)
+        force = np.clip(action, self.MIN_ACTION, self.MAX_ACTION)
+
+        velocity = np.clip(velocity + force * self.POWER - 0.0025 * np.cos(3 * position), -self.MAX_SPEED, self.MAX_SPEED)
+        position = np.clip(position + velocity, self.MIN_POSITION, self.MAX_POSITION)
+        velocity = np.where((position == self.MIN_POSITION) & (velocity < 0), 0., velocity)
+
+        dones = (position >= self.GOAL_POSITION) & (velocity >= self.GOAL_VELOCITY)
+        rewards = np.where(dones, 100., 0.) - action ** 2 * 0.1
+
+        return np.stack([position, velocity], axis = 1), rewards, dones
@@ -0,0 +1,131 @@
+# Standard library
+import abc
+
+# Typing
+from typing import Any, Dict, List, Optional, Tuple
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from .EnvironmentVectorBase import EnvironmentVectorBase, EnvironmentVectorReceiveResult, EnvironmentVectorStepResult
+
+class EnvironmentVectorNumPyBase(EnvironmentVectorBase):
+    max_episode_steps: int
+    random: Any
+    states: Any
+    step_counts: Any
+    _pending: Dict[int, Tuple[Any, float, bool, Dict[str, Any]]]
+
+    def __init__(self, environment_count: int, max_episode_steps: int, seed: Optional[int] = None) -> None:
+        super().__init__(environment_count)
+
+        # All instances live in one array of states and are stepped together,
+        # finished ones are reset right away like in the subprocess vector.
+        self.max_episode_steps = max_episode_steps
+        self.random = np.random.default_rng(seed)
+        self.states = self.on_reset_states(environment_count)
+        self.step_counts = np.zeros(environment_count, dtype = np.int64)
+        self._pending = {}
+
+    @abc.abstractmethod
+    def on_reset_states(self, count: int) -> Any:
+        pass
+
+    @abc.abstractmethod
+    def on_step_states(self, states: Any, actions: Any) -> Tuple[Any, Any, Any]:
+        pass
+
+    def on_get_observations(self, states: Any) -> Any:
+        return states.copy()
+
+    def _check_not_pending(self, indices: Any) -> None:
+        if any(int(i) in self._pending for i in indices):
+            raise Exception("environment is still stepping, receive its result first")
+
+    def _step_indices(self, actions: Any, indices: Any) -> Tuple[Any, Any, Any, List[Dict[str, Any]]]:
+        states, rewards, dones = self.on_step_states(self.states[indices], actions)
+
+        step_counts = self.step_counts[indices] + 1
+        truncated = (step_counts >= self.max_episode_steps) & ~dones
+        dones = dones | truncated
+
+        observations = self.on_get_observations(states)
+        infos: List[Dict[str, Any]] = [{} for _ in range(len(indices))]
+
+        done_positions = np.flatnonzero(dones)
+
+        if len(done_positions) > 0:
+            for i in done_positions:
+                infos[i]["terminal_observation"] = observations[i].copy()
+
+                if truncated[i]:
+                    infos[i]["TimeLimit.truncated"] = True
+
+            states[done_positions] = self.on_reset_states(len(done_positions))
+            step_counts[done_positions] = 0
+            observations[done_positions] = self.on_get_observations(states[done_positions])
+
+        self.states[indices] = states
+        self.step_counts[indices] = step_counts
+
+        return observations, rewards, dones, infos
+
+    def on_reset(self, environment_indices: T.Tensor) -> T.Tensor:
+        indices = environment_indices.cpu().numpy()
+
+        self._check_not_pending(indices)
+
+        self.states[indices] = self.on_reset_states(len(indices))
+        self.step_counts[indices] = 0
+
+        return T.from_numpy(self.on_get_observations(self.states))
+
+    def on_step(self, actions: T.Tensor) -> EnvironmentVectorStepResult:
+        indices = np.arange(self.environment_count)
+
+        self._check_not_pending(indices)
+
+        observations, rewards, dones, infos = self._step_indices(actions.cpu().numpy(), indices)
+
+        return EnvironmentVectorStepResult(
+            T.from_numpy(observations),
+            T.from_numpy(rewards),
+            T.from_numpy(dones),
+            infos
+        )
+
+    def on_send(self, actions: T.Tensor, environment_indices: T.Tensor) -> None:
+        # Stepping is synchronous, so results are simply held until they are
+        # received.
+        indices = environment_indices.cpu().numpy()
+
+        self._check_not_pending(indices)
+
+        observations, rewards, dones, infos = self._step_indices(actions.cpu().numpy(), indices)
+
+        for i, environment_index in enumerate(indices.tolist()):
+            self._pending[environment_index] = (observations[i], float(rewards[i]), bool(dones[i]), infos[i])
+
+    def on_receive(self, batch_size: int) -> EnvironmentVectorReceiveResult:
+        if batch_size > len(self._pending):
+            raise Exception(
+                "cannot receive {0} results with {1} environments stepping".format(
+                    batch_size,
+                    len(self._pending)
+                )
+            )
+
+        indices = list(self._pending.keys())[:batch_size]
+        results = [self._pending.pop(i) for i in indices]
+
+        return EnvironmentVectorReceiveResult(
+            T.as_tensor(indices, dtype = T.int64),
+            T.from_numpy(np.stack([i[0] for i in results])),
+            T.as_tensor([i[1] for i in results], dtype = T.float64),
+            T.as_tensor([i[2] for i in results], dtype = T.bool),
+            [i[3] for i in results]
+        )
@@ -0,0 +1,159 @@
+# Standard library
+from collections import deque
+
+# Typing
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentRemoteConnection import EnvironmentRemoteConnection
+from .EnvironmentVectorBase import EnvironmentVectorBase, EnvironmentVectorReceiveResult, EnvironmentVectorStepResult
+from .remote import REMOTE_COMMAND_RESET, REMOTE_COMMAND_STEP
+
+class EnvironmentVectorRemote(EnvironmentVectorBase):
+    _connection: EnvironmentRemoteConnection
+    _observations: Optional[Any]
+    _sent_indices: Deque[List[int]]
+    _pending_indices: Set[int]
+    _ready: Deque[Tuple[int, Any, float, bool, Dict[str, Any]]]
+
+    def __init__(self, address: str) -> None:
+        connection = EnvironmentRemoteConnection(address)
+
+        # Drives every environment the server hosts, each request covers all
+        # the environments it names.
+        super().__init__(connection.description["environment_count"])
+
+        self._connection = connection
+        self._observations = None
+        self._sent_indices = deque()
+        self._pending_indices = set()
+        self._ready = deque()
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape(self._connection.description["observation_space_shape"])
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        return Shape(self._connection.description["action_space_shape"])
+
+    def _check_not_pending(self, indices: Iterable[int]) -> None:
+        if any(i in self._pending_indices for i in indices):
+            raise Exception("environment is still stepping, receive its result first")
+
+    def _store_observations(self, indices: List[int], observations: Any) -> None:
+        if self._observations is None:
+            self._observations = np.zeros((self.environment_count, *observations.shape[1:]), dtype = observations.dtype)
+
+        self._observations[indices] = observations
+
+    def on_reset(self, environment_indices: T.Tensor) -> T.Tensor:
+        indices = environment_indices.tolist()
+
+        self._check_not_pending(indices)
+
+        response = self._connection.request({
+            "command": REMOTE_COMMAND_RESET,
+            "indices": indices
+        })
+
+        self._store_observations(indices, response["observations"])
+
+        assert self._observations is not None
+
+        return T.from_numpy(self._observations.copy())
+
+    def on_step(self, actions: T.Tensor) -> EnvironmentVectorStepResult:
+        indices = list(range(self.environment_count))
+
+        self._check_not_pending(indices)
+
+        response = self._connection.request({
+            "command": REMOTE_COMMAND_STEP,
+            "indices": indices,
+            "actions": actions.cpu().numpy(),
+            "auto_reset": True
+        })
+
+        self._store_observations(indices, response["observations"])
+
+        return EnvironmentVectorStepResult(
+            T.from_numpy(response["observations"]),
+            T.from_numpy(response["rewards"]),
+            T.from_numpy(response["dones"]),
+            response["infos"]
+        )
+
+    def on_send(self, actions: T.Tensor, environment_indices: T.Tensor) -> None:
+        indices = environment_indices.tolist()
+
+        self._check_not_pending(indices)
+
+        # The request goes out right away, its answer is only read once a
+        # receive needs it, so several batches can be in flight.
+        self._connection.send({
+            "command": REMOTE_COMMAND_STEP,
+            "indices": indices,
+            "actions": actions.cpu().numpy(),
+            "auto_reset": True
+        })
+
+        self._sent_indices.append(indices)
+        self._pending_indices.update(indices)
+
+    def on_receive(self, batch_size: int) -> EnvironmentVectorReceiveResult:
+        if batch_size > len(self._pending_indices):
+            raise Exception(
+                "cannot receive {0} results with {1} environments stepping".format(
+                    batch_size,
+                    len(self._pending_indices)
+                )
+            )
+
+        # Answers arrive in the order the batches were sent, results beyond
+        # batch_size wait for the next call.
+        while len(self._ready) < batch_size:
+            indices = self._sent_indices.popleft()
+
+            try:
+                response = self._connection.receive()
+            except Exception:
+                # The batch failed as a whole, none of its environments are
+                # stepping anymore.
+                self._pending_indices.difference_update(indices)
+                raise
+
+            self._store_observations(indices, response["observations"])
+
+            for j, i in enumerate(indices):
+                self._ready.append((
+                    i,
+                    response["observations"][j],
+                    float(response["rewards"][j]),
+                    bool(response["dones"][j]),
+                    response["infos"][j]
+                ))
+
+        results = [self._ready.popleft() for _ in range(batch_size)]
+
+        for result in results:
+            self._pending_indices.remove(result[0])
+
+        return EnvironmentVectorReceiveResult(
+            T.as_tensor([result[0] for result in results], dtype = T.int64),
+            T.from_numpy(np.stack([result[1] for result in results])),
+            T.as_tensor([result[2] for result in results], dtype = T.float64),
+            T.as_tensor([result[3] for result in results], dtype = T.bool),
+            [result[4] for result in results]
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+        self._sent_indices.clear()
+        self._pending_indices = set()
+        self._ready.clear()
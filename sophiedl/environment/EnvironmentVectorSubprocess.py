@@ -0,0 +1,283 @@
+# Standard library
+from multiprocessing.connection import Connection
+import multiprocessing
+import multiprocessing.connection
+import os
+import tempfile
+
+# Typing
+from typing import Any, Callable, cast, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.Shape import Shape
+from .EnvironmentBase import EnvironmentBase
+from .EnvironmentVectorBase import EnvironmentVectorBase, EnvironmentVectorReceiveResult, EnvironmentVectorStepResult
+
+def _to_action(action: Any, action_type: type) -> Any:
+    if action_type is np.ndarray:
+        return np.asarray(action)
+    elif action_type is T.Tensor:
+        return T.as_tensor(action)
+    else:
+        return action_type(action)
+
+def _run_worker(
+    connection: Connection,
+    environment_factory: Callable[[], EnvironmentBase],
+    environment_index: int) -> None:
+    try:
+        environment = environment_factory()
+        observation = environment.reset()
+        observation_array = np.asarray(observation)
+
+        connection.send((True, (observation_array.shape, observation_array.dtype.str, environment.observation_space_shape, environment.action_space_shape)))
+
+        path, observation_shape, observation_dtype = connection.recv()
+
+        observations = np.memmap(os.path.join(path, "observations.bin"), dtype = observation_dtype, mode = "r+", shape = observation_shape)
+        rewards = np.memmap(os.path.join(path, "rewards.bin"), dtype = np.float64, mode = "r+", shape = (observation_shape[0],))
+        dones = np.memmap(os.path.join(path, "dones.bin"), dtype = np.bool_, mode = "r+", shape = (observation_shape[0],))
+
+        # Observations are copied into the shared memory, so the environment
+        # can have their buffers back right away.
+        observations[environment_index] = observation_array
+        environment.release(observation)
+        connection.send((True, None))
+
+        while True:
+            command, payload = connection.recv()
+
+            try:
+                if command == "reset":
+                    observation = environment.reset()
+                    observations[environment_index] = np.asarray(observation)
+                    environment.release(observation)
+                    connection.send((True, None))
+                elif command == "step":
+                    observation, reward, done, info = environment.step(_to_action(payload, environment.action_type))
+                    observation_terminal = None
+
+                    # Finished episodes are reset right away so that every
+                    # worker always holds an observation to act on. The final
+                    # observation is still handed back through the info.
+                    if done:
+                        info = dict(info)
+                        info["terminal_observation"] = np.asarray(observation)
+                        observation_terminal = observation
+                        observation = environment.reset()
+
+                    observations[environment_index] = np.asarray(observation)
+                    environment.release(observation)
+                    rewards[environment_index] = reward
+                    dones[environment_index] = done
+                    connection.send((True, info))
+
+                    if observation_terminal is not None:
+                        environment.release(observation_terminal)
+                elif command == "close":
+                    break
+                else:
+                    raise Exception("unknown command: {0}".format(command))
+            except Exception as e:
+                connection.send((False, e))
+    except Exception as e:
+        connection.send((False, e))
+    finally:
+        connection.close()
+
+class EnvironmentVectorSubprocess(EnvironmentVectorBase):
+    _connections: List[Connection]
+    _processes: List[Any]
+    _temporary_directory: "Optional[tempfile.TemporaryDirectory[str]]"
+    _pending_indices: Set[int]
+    _observations: Any
+    _rewards: Any
+    _dones: Any
+
+    def __init__(
+        self,
+        environment_factory: Callable[[], EnvironmentBase],
+        environment_count: int,
+        start_method: Optional[str] = None) -> None:
+        super().__init__(environment_count)
+
+        context: Any = multiprocessing.get_context(start_method)
+
+        self._connections = []
+        self._processes = []
+        self._temporary_directory = None
+        self._pending_indices = set()
+
+        for i in range(environment_count):
+            connection, worker_connection = context.Pipe()
+
+            process = context.Process(
+                target = _run_worker,
+                args = (worker_connection, environment_factory, i),
+                daemon = True
+            )
+            process.start()
+            worker_connection.close()
+
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        specifications: List[Tuple[Tuple[int, ...], str, Shape, Shape]] = [self._receive(connection) for connection in self._connections]
+        observation_shape, observation_dtype, self._observation_space_shape, self._action_space_shape = specifications[0]
+
+        for specification in specifications[1:]:
+            if tuple(specification[0]) != tuple(observation_shape) or specification[1] != observation_dtype:
+                raise Exception("all environments must produce observations of the same shape and type")
+
+        observation_shape = (environment_count, *observation_shape)
+
+        # Observations, rewards and done flags are written by the workers
+        # straight into memory-mapped files on a RAM-backed file system where
+        # available, so only actions and infos go through the pipes.
+        self._temporary_directory = tempfile.TemporaryDirectory(
+            prefix = "sophiedl-vector-",
+            dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        )
+        path = self._temporary_directory.name
+
+        self._observations = np.memmap(os.path.join(path, "observations.bin"), dtype = observation_dtype, mode = "w+", shape = observation_shape)
+        self._rewards = np.memmap(os.path.join(path, "rewards.bin"), dtype = np.float64, mode = "w+", shape = (environment_count,))
+        self._dones = np.memmap(os.path.join(path, "dones.bin"), dtype = np.bool_, mode = "w+", shape = (environment_count,))
+
+        for connection in self._connections:
+            connection.send((path, observation_shape, observation_dtype))
+
+        for connection in self._connections:
+            self._receive(connection)
+
+    @staticmethod
+    def _receive(connection: Connection) -> Any:
+        success, payload = connection.recv()
+
+        if not success:
+            raise payload
+
+        return payload
+
+    # The space shapes are filled in from the workers' handshake.
+
+    def on_get_observation_space_shape(self) -> Union[Shape, Iterable[int]]:
+        assert self._observation_space_shape is not None
+
+        return self._observation_space_shape
+
+    def on_get_action_space_shape(self) -> Union[Shape, Iterable[int]]:
+        assert self._action_space_shape is not None
+
+        return self._action_space_shape
+
+    def _check_not_pending(self, indices: Iterable[int]) -> None:
+        if any(i in self._pending_indices for i in indices):
+            raise Exception("environment is still stepping, receive its result first")
+
+    def on_reset(self, environment_indices: T.Tensor) -> T.Tensor:
+        indices = environment_indices.tolist()
+
+        self._check_not_pending(indices)
+
+        for i in indices:
+            self._connections[i].send(("reset", None))
+
+        for i in indices:
+            self._receive(self._connections[i])
+
+        return T.from_numpy(self._observations.copy())
+
+    def on_step(self, actions: T.Tensor) -> EnvironmentVectorStepResult:
+        actions_numpy = actions.cpu().numpy()
+
+        self._check_not_pending(range(self.environment_count))
+
+        for i in range(self.environment_count):
+            self._connections[i].send(("step", actions_numpy[i]))
+
+        infos: List[Dict[str, Any]] = [self._receive(connection) for connection in self._connections]
+
+        return EnvironmentVectorStepResult(
+            T.from_numpy(self._observations.copy()),
+            T.from_numpy(self._rewards.copy()),
+            T.from_numpy(self._dones.copy()),
+            infos
+        )
+
+    def on_send(self, actions: T.Tensor, environment_indices: T.Tensor) -> None:
+        actions_numpy = actions.cpu().numpy()
+        indices = environment_indices.tolist()
+
+        self._check_not_pending(indices)
+
+        for action, i in zip(actions_numpy, indices):
+            self._connections[i].send(("step", action))
+            self._pending_indices.add(i)
+
+    def on_receive(self, batch_size: int) -> EnvironmentVectorReceiveResult:
+        if batch_size > len(self._pending_indices):
+            raise Exception(
+                "cannot receive {0} results with {1} environments stepping".format(
+                    batch_size,
+                    len(self._pending_indices)
+                )
+            )
+
+        ready_indices: List[int] = []
+        infos: List[Dict[str, Any]] = []
+
+        # Whichever workers answer first make up the batch, the others keep
+        # stepping until the next call.
+        while len(ready_indices) < batch_size:
+            pending_indices = {self._connections[i]: i for i in self._pending_indices}
+
+            for connection in multiprocessing.connection.wait(list(pending_indices.keys())):
+                if len(ready_indices) == batch_size:
+                    break
+
+                i = pending_indices[cast(Connection, connection)]
+
+                self._pending_indices.remove(i)
+                infos.append(self._receive(cast(Connection, connection)))
+                ready_indices.append(i)
+
+        indices: Any = np.asarray(ready_indices)
+
+        return EnvironmentVectorReceiveResult(
+            T.from_numpy(indices),
+            T.from_numpy(self._observations[indices]),
+            T.from_numpy(self._rewards[indices]),
+            T.from_numpy(self._dones[indices]),
+            infos
+        )
+
+    def close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self._processes:
+            process.join(timeout = 5)
+
+            if process.is_alive():
+                process.terminate()
+
+        for connection in self._connections:
+            connection.close()
+
+        self._connections = []
+        self._processes = []
+        self._pending_indices = set()
+
+        if self._temporary_directory is not None:
+            self._temporary_directory.cleanup()
+            self._temporary_directory = None
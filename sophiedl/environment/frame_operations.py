@@ -0,0 +1,84 @@
+# Typing
+from typing import Any
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+import torch.nn.functional as F
+
+def grayscale(frames: Any, channels_last: bool = True) -> T.Tensor:
+    # Frames are [..., H, W, C] (or [..., C, H, W]) RGB values in uint8 and
+    # become [..., 1, H, W]. The ITU-R 601-2 luma weights are applied in 8-bit
+    # fixed point, which fits in 16-bit integers and stays within one level
+    # of PIL's "L" conversion.
+    if isinstance(frames, np.ndarray):
+        # NumPy reads arbitrarily strided views (emulator screens are often
+        # flipped in memory), so the raw frame does not need to be copied
+        # first.
+        channels = [frames[..., i] if channels_last else frames[..., i, :, :] for i in range(3)]
+
+        luminance: Any = channels[0].astype(np.uint16)
+        luminance *= 77
+
+        for channel, weight in zip(channels[1:], (150, 29)):
+            weighted: Any = channel.astype(np.uint16)
+            weighted *= weight
+            luminance += weighted
+
+        luminance += 128
+        luminance >>= 8
+
+        return T.from_numpy(luminance.astype(np.uint8)).unsqueeze(dim = -3)
+
+    frames = T.as_tensor(frames)
+
+    if not channels_last:
+        frames = frames.movedim(-3, -1)
+
+    luminance_tensor: T.Tensor = (
+        frames[..., 0].to(dtype = T.int32) * 77 +
+        frames[..., 1].to(dtype = T.int32) * 150 +
+        frames[..., 2].to(dtype = T.int32) * 29 +
+        128
+    ) >> 8
+
+    return luminance_tensor.to(dtype = T.uint8).unsqueeze(dim = -3)
+
+def resize_area(frames: T.Tensor, height: int, width: int) -> T.Tensor:
+    # Frames are [..., C, H, W] and keep their dtype. Every output pixel is
+    # the mean of the input pixels it covers.
+    leading_shape = frames.shape[:-3]
+    channels, height_in, width_in = frames.shape[-3:]
+
+    if (height_in, width_in) == (height, width):
+        return frames
+
+    flat = frames.reshape(-1, channels, height_in, width_in).to(dtype = T.float32)
+
+    if height_in % height == 0 and width_in % width == 0:
+        resized = F.avg_pool2d(flat, (height_in // height, width_in // width))
+    else:
+        resized = F.interpolate(flat, size = (height, width), mode = "area")
+
+    if not frames.dtype.is_floating_point:
+        resized = resized.round_().clamp_(T.iinfo(frames.dtype).min, T.iinfo(frames.dtype).max)
+
+    return resized.to(dtype = frames.dtype).reshape(*leading_shape, channels, height, width)
+
+def crop(frames: T.Tensor, top: int, left: int, height: int, width: int) -> T.Tensor:
+    # Frames are [..., C, H, W]; the result is a view.
+    if top < 0 or left < 0 or top + height > frames.shape[-2] or left + width > frames.shape[-1]:
+        raise Exception(
+            "crop ({0}, {1}, {2}, {3}) is out of bounds for frames of size {4}x{5}".format(
+                top,
+                left,
+                height,
+                width,
+                frames.shape[-2],
+                frames.shape[-1]
+            )
+        )
+
+    return frames[..., top:top + height, left:left + width]
@@ -0,0 +1,175 @@
+# Standard library
+from functools import reduce
+import json
+import operator
+import socket
+import struct
+
+# Typing
+from typing import Any, Dict, List, Tuple
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# A message is a fixed header, a JSON document and a block of raw array data.
+# Arrays and tensors anywhere in the document are replaced by a reference into
+# the block, so observations cross the wire as they are laid out in memory
+# and nothing is ever unpickled from a socket. Requests are answered in order
+# on each connection, which lets clients send several before reading any
+# answer.
+
+REMOTE_HEADER = struct.Struct("<IBII") # request id, status, document size, data size
+
+REMOTE_STATUS_OK = 0
+REMOTE_STATUS_ERROR = 1
+
+REMOTE_COMMAND_DESCRIBE = "describe"
+REMOTE_COMMAND_RESET = "reset"
+REMOTE_COMMAND_STEP = "step"
+
+_ARRAY_KEY = "__array__"
+_ALIGNMENT = 8
+
+REMOTE_TYPES: Dict[str, type] = {
+    "int": int,
+    "float": float,
+    "ndarray": np.ndarray,
+    "tensor": T.Tensor
+}
+
+def remote_type_name(t: type) -> str:
+    for name, remote_type in REMOTE_TYPES.items():
+        if issubclass(t, remote_type):
+            return name
+
+    raise Exception("cannot send values of type {0}".format(t.__name__))
+
+def remote_to_action(action: Any, action_type: type) -> Any:
+    if action_type is np.ndarray:
+        return np.asarray(action)
+    elif action_type is T.Tensor:
+        return T.as_tensor(action)
+    else:
+        return action_type(action)
+
+def parse_remote_address(address: str) -> Tuple[int, Any]:
+    # "unix:/path/to/socket" or "host:port".
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+
+    host, _, port = address.rpartition(":")
+
+    if len(host) == 0 or len(port) == 0:
+        raise Exception("invalid remote address {0}, expected host:port or unix:path".format(repr(address)))
+
+    return socket.AF_INET, (host, int(port))
+
+def format_remote_address(family: int, address: Any) -> str:
+    if family == socket.AF_UNIX:
+        return "unix:{0}".format(address)
+
+    return "{0}:{1}".format(address[0], address[1])
+
+def connect_remote(address: str) -> socket.socket:
+    family, socket_address = parse_remote_address(address)
+
+    connection = socket.socket(family, socket.SOCK_STREAM)
+    connection.connect(socket_address)
+
+    if family == socket.AF_INET:
+        # Requests are small and latency bound.
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    return connection
+
+def send_remote_message(connection: socket.socket, request_id: int, status: int, document: Any) -> None:
+    blocks: List[Any] = []
+    data_size = 0
+
+    def encode(value: Any) -> Any:
+        nonlocal data_size
+
+        if isinstance(value, (T.Tensor, np.ndarray)):
+            tensor = isinstance(value, T.Tensor)
+            array = np.ascontiguousarray(value.detach().cpu().numpy() if isinstance(value, T.Tensor) else value)
+
+            if array.dtype.hasobject:
+                raise Exception("cannot send arrays of objects")
+
+            offset = data_size
+            padding = -array.nbytes % _ALIGNMENT
+
+            blocks.append(array.reshape(-1).view(np.uint8))
+            blocks.append(bytes(padding))
+            data_size += array.nbytes + padding
+
+            return {_ARRAY_KEY: [offset, array.dtype.str, list(array.shape), tensor]}
+        elif isinstance(value, np.generic):
+            return value.item()
+        elif isinstance(value, dict):
+            return {str(k): encode(v) for k, v in value.items()}
+        elif isinstance(value, (list, tuple)):
+            return [encode(i) for i in value]
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        else:
+            raise Exception("cannot send values of type {0}".format(type(value).__name__))
+
+    encoded_document = json.dumps(encode(document), separators = (",", ":")).encode("utf-8")
+
+    connection.sendall(b"".join([
+        REMOTE_HEADER.pack(request_id, status, len(encoded_document), data_size),
+        encoded_document,
+        *blocks
+    ]))
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    position = 0
+
+    while position < size:
+        received = connection.recv_into(view[position:])
+
+        if received == 0:
+            raise EOFError("remote connection closed")
+
+        position += received
+
+    return buffer
+
+def receive_remote_message(connection: socket.socket) -> Tuple[int, int, Any]:
+    request_id, status, document_size, data_size = REMOTE_HEADER.unpack(
+        _receive_exactly(connection, REMOTE_HEADER.size)
+    )
+
+    document = json.loads(_receive_exactly(connection, document_size).decode("utf-8"))
+
+    # Arrays are views into the received block, which is writable and not
+    # used for anything else.
+    data = _receive_exactly(connection, data_size)
+
+    def decode(value: Any) -> Any:
+        if isinstance(value, dict):
+            if _ARRAY_KEY in value:
+                offset, dtype, shape, tensor = value[_ARRAY_KEY]
+
+                array = np.frombuffer(
+                    data,
+                    dtype = np.dtype(dtype),
+                    count = reduce(operator.mul, shape, 1),
+                    offset = offset
+                ).reshape(shape)
+
+                return T.from_numpy(array) if tensor else array
+
+            return {k: decode(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [decode(i) for i in value]
+        else:
+            return value
+
+    return request_id, status, decode(document)
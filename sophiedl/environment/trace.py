@@ -0,0 +1,37 @@
+# Standard library
+import json
+import os
+
+# Typing
+from typing import Any, Dict
+
+# A trace is a directory. Every reset and every step is one record: the
+# per-record columns are raw binary files which are appended to while
+# recording and memory-mapped for replay, the observations are stored in
+# chunks of records, either compressed or raw.
+
+TRACE_METADATA = "trace.json"
+TRACE_ACTIONS = "actions.bin"
+TRACE_REWARDS = "rewards.bin"
+TRACE_DONES = "dones.bin"
+TRACE_RESETS = "resets.bin"
+TRACE_OBSERVATIONS = "observations.bin"
+TRACE_CHUNKS = "chunks.bin"
+
+TRACE_COMPRESSION_NONE = "none"
+TRACE_COMPRESSION_ZLIB = "zlib"
+
+def write_trace_metadata(path: str, metadata: Dict[str, Any]) -> None:
+    with open(os.path.join(path, TRACE_METADATA), "w") as f:
+        json.dump(metadata, f, indent = 2)
+
+def read_trace_metadata(path: str) -> Dict[str, Any]:
+    metadata_path = os.path.join(path, TRACE_METADATA)
+
+    if not os.path.isfile(metadata_path):
+        raise Exception("{0} is not a finished trace".format(path))
+
+    with open(metadata_path, "r") as f:
+        metadata: Dict[str, Any] = json.load(f)
+
+    return metadata
@@ -11,24 +11,44 @@ class Memory(Repr):
     observation_current: Optional[T.Tensor]
     observation_next: Optional[T.Tensor]
     done: bool
+    truncated: bool
     action: Optional[Union[T.Tensor, float]]
     action_log_probabilities: Optional[T.Tensor]
+    action_sample: Optional[T.Tensor]
     reward: Optional[float]
+    environment_index: int
     
     def __init__(
         self,
         observation_current: Optional[T.Tensor] = None,
         observation_next: Optional[T.Tensor] = None,
         done: bool = False,
+        truncated: bool = False,
         action: Optional[Union[T.Tensor, float]] = None,
         action_log_probabilities: Optional[T.Tensor] = None,
-        reward: Optional[float] = None) -> None:
+        action_sample: Optional[T.Tensor] = None,
+        reward: Optional[float] = None,
+        environment_index: int = 0) -> None:
         self.observation_current = observation_current
         self.observation_next = observation_next
         self.done = done
+        self.truncated = truncated
         self.action = action
         self.action_log_probabilities = action_log_probabilities
+        self.action_sample = action_sample
         self.reward = reward
+        self.environment_index = environment_index
+
+    def clear(self) -> None:
+        self.observation_current = None
+        self.observation_next = None
+        self.done = False
+        self.truncated = False
+        self.action = None
+        self.action_log_probabilities = None
+        self.action_sample = None
+        self.reward = None
+        self.environment_index = 0
 
 if __name__ == "__main__":
     print(Memory(observation_current = T.as_tensor([1]), reward = 5))
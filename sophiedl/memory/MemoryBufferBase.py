@@ -0,0 +1,221 @@
+# Standard library
+import abc
+import contextlib
+import threading
+
+# Typing
+from typing import Any, ContextManager, Optional, Union
+
+# PyTorch
+import torch as T
+
+# Internal
+from .Memory import Memory
+
+class MemoryBufferBase(abc.ABC):
+    memory_staging: Memory
+    _staging_observations: Optional[T.Tensor]
+    _staging_actions: Optional[T.Tensor]
+    _staging_action_samples: Optional[T.Tensor]
+    lock: ContextManager[Any]
+    thread_safe: bool
+
+    def __init__(self) -> None:
+        self.memory_staging = Memory()
+        self._staging_observations = None
+        self._staging_actions = None
+        self._staging_action_samples = None
+        self.lock = contextlib.nullcontext()
+        self.thread_safe = False
+
+    @staticmethod
+    def _stage_rows(staging: Optional[T.Tensor], environment_indices: T.Tensor, rows: T.Tensor) -> T.Tensor:
+        count = int(environment_indices.max().item()) + 1
+
+        if staging is None or staging.shape[0] < count:
+            grown = T.zeros((count, *rows.shape[1:]), dtype = rows.dtype, device = rows.device)
+
+            if staging is not None:
+                grown[:staging.shape[0]] = staging
+
+            staging = grown
+
+        staging[environment_indices] = rows
+
+        return staging
+
+    def add_observation_current(self, value: T.Tensor) -> None:
+        if self.memory_staging.observation_current is not None:
+            raise Exception("current observation already added for current memory")
+
+        self.memory_staging.observation_current = value
+
+    def add_observation_next(self, value: T.Tensor) -> None:
+        if self.memory_staging.observation_next is not None:
+            raise Exception("next observation already added for next memory")
+
+        self.memory_staging.observation_next = value
+
+    def add_done(self, value: bool) -> None:
+        if self.memory_staging.done:
+            raise Exception("done flag already added for next memory")
+
+        self.memory_staging.done = value
+
+    def add_truncated(self, value: bool) -> None:
+        # Marks a transition after which the episode was cut off without
+        # ending, which unlike done still bootstraps from the next
+        # observation.
+        self.memory_staging.truncated = value
+
+    def add_action(self, value: Union[T.Tensor, float]) -> None:
+        if self.memory_staging.action is not None:
+            raise Exception("action already added for current memory")
+
+        self.memory_staging.action = value
+
+    def add_action_log_probabilities(self, value: T.Tensor) -> None:
+        if self.memory_staging.action_log_probabilities is not None:
+            raise Exception("action log probabilities already added for current memory")
+
+        self.memory_staging.action_log_probabilities = value
+
+    def add_action_sample(self, value: T.Tensor) -> None:
+        if self.memory_staging.action_sample is not None:
+            raise Exception("action sample already added for current memory")
+
+        self.memory_staging.action_sample = value
+
+    def add_reward(self, value: float) -> None:
+        if self.memory_staging.reward is not None:
+            raise Exception("reward already added for current memory")
+
+        self.memory_staging.reward = value
+
+    @abc.abstractmethod
+    def on_push(self, memory: Memory) -> None:
+        pass
+
+    def on_push_transitions(
+        self,
+        observations_current: T.Tensor,
+        actions: T.Tensor,
+        action_samples: Optional[T.Tensor],
+        rewards: T.Tensor,
+        observations_next: T.Tensor,
+        dones: T.Tensor,
+        environment_indices: T.Tensor,
+        truncations: T.Tensor) -> None:
+        for i in range(observations_current.shape[0]):
+            self.on_push(
+                Memory(
+                    observation_current = observations_current[i],
+                    observation_next = observations_next[i],
+                    done = bool(dones[i].item()),
+                    truncated = bool(truncations[i].item()),
+                    action = actions[i],
+                    action_sample = action_samples[i] if action_samples is not None else None,
+                    reward = float(rewards[i].item()),
+                    environment_index = int(environment_indices[i].item())
+                )
+            )
+
+    @abc.abstractmethod
+    def on_clear(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def on_copies_observations(self) -> bool:
+        # Buffers which copy observations into their own storage when pushing
+        # do not refer to them afterwards.
+        return False
+
+    @property
+    def copies_observations(self) -> bool:
+        return self.on_copies_observations()
+
+    def make_thread_safe(self) -> None:
+        # Memories are staged by a single thread, but once pushed they can be
+        # read by another one, so everything touching pushed memories runs
+        # under the lock.
+        if not self.thread_safe:
+            self.lock = threading.RLock()
+            self.thread_safe = True
+
+    def push(self) -> None:
+        with self.lock:
+            self.on_push(self.memory_staging)
+
+        self.memory_staging.clear()
+
+    def push_transitions(
+        self,
+        observations_current: T.Tensor,
+        actions: T.Tensor,
+        rewards: T.Tensor,
+        observations_next: T.Tensor,
+        dones: T.Tensor,
+        action_samples: Optional[T.Tensor] = None,
+        environment_indices: Optional[T.Tensor] = None,
+        truncations: Optional[T.Tensor] = None) -> None:
+        if observations_current.shape[0] == 0:
+            return
+
+        with self.lock:
+            self.on_push_transitions(
+                observations_current,
+                actions,
+                action_samples,
+                T.as_tensor(rewards, dtype = T.float32),
+                observations_next,
+                T.as_tensor(dones, dtype = T.bool),
+                environment_indices if environment_indices is not None else T.arange(observations_current.shape[0]),
+                T.as_tensor(truncations, dtype = T.bool) if truncations is not None else T.zeros(observations_current.shape[0], dtype = T.bool)
+            )
+
+    def add_batch(
+        self,
+        environment_indices: T.Tensor,
+        observations: T.Tensor,
+        actions: T.Tensor,
+        action_samples: Optional[T.Tensor] = None) -> None:
+        self._staging_observations = self._stage_rows(self._staging_observations, environment_indices, observations)
+        self._staging_actions = self._stage_rows(self._staging_actions, environment_indices, actions)
+
+        if action_samples is not None:
+            self._staging_action_samples = self._stage_rows(self._staging_action_samples, environment_indices, action_samples)
+
+    def push_batch(
+        self,
+        environment_indices: T.Tensor,
+        rewards: T.Tensor,
+        observations_next: T.Tensor,
+        dones: T.Tensor,
+        truncations: Optional[T.Tensor] = None) -> None:
+        if self._staging_observations is None or self._staging_actions is None:
+            raise Exception("no batch has been added to push")
+
+        self.push_transitions(
+            self._staging_observations[environment_indices],
+            self._staging_actions[environment_indices],
+            rewards,
+            observations_next,
+            dones,
+            action_samples = self._staging_action_samples[environment_indices] if self._staging_action_samples is not None else None,
+            environment_indices = environment_indices,
+            truncations = truncations
+        )
+
+    def clear(self) -> None:
+        with self.lock:
+            self.on_clear()
+
+        self.memory_staging.clear()
+
+    def close(self) -> None:
+        # Buffers holding resources beyond their tensors, such as files,
+        # release them here.
+        pass
@@ -0,0 +1,213 @@
+# Typing
+from typing import Any, Optional, Tuple
+
+# PyTorch
+import torch as T
+
+# Internal
+from .Memory import Memory
+from .MemoryReplayBuffer import MemoryReplayBuffer
+
+class MemoryFrameReplayBuffer(MemoryReplayBuffer):
+    frame_capacity: int
+    frames: Optional[T.Tensor]
+    frame_indices_current: Optional[T.Tensor]
+    frame_indices_next: Optional[T.Tensor]
+    _frame_eviction_keys: Optional[T.Tensor]
+    _frame_count: int
+    _last_observation_next: Any
+    _last_frame_index_next: Optional[int]
+    _last_frame_indices_next: Optional[T.Tensor]
+
+    def __init__(
+        self,
+        capacity: int,
+        frame_capacity: Optional[int] = None,
+        **kwargs: Any) -> None:
+        super().__init__(
+            capacity,
+            **kwargs
+        )
+
+        self.frame_capacity = frame_capacity if frame_capacity is not None else capacity + 1
+
+        assert self.frame_capacity >= 2
+
+        self.frames = None
+        self.frame_indices_current = None
+        self.frame_indices_next = None
+        self._frame_eviction_keys = None
+        self._frame_count = 0
+        self._last_observation_next = None
+        self._last_frame_index_next = None
+        self._last_frame_indices_next = None
+
+    def on_allocate_observation_storage(self, shape: Tuple[int, ...], dtype: T.dtype) -> None:
+        self.frames = self.on_allocate_observations(self.frame_capacity, shape, dtype)
+        self.frame_indices_current = T.zeros(self.capacity, dtype = T.int64, device = self.device)
+        self.frame_indices_next = T.zeros(self.capacity, dtype = T.int64, device = self.device)
+        self._frame_eviction_keys = T.zeros(self.capacity, dtype = T.int64, device = self.device)
+
+    def _evict_overwritten(self, frame_index: int, protected: int) -> None:
+        assert self._frame_eviction_keys is not None
+
+        # Transitions are evicted once the oldest frame they reference is
+        # about to be overwritten. Frames are only reused from the previous
+        # push, so the eviction keys never decrease along the ring and it is
+        # enough to look at the head. The newest slots are the ones currently
+        # being written, so they are never evicted.
+        while len(self) > protected and self._frame_eviction_keys[self._head].item() <= frame_index - self.frame_capacity:
+            self._evict_oldest()
+
+    def _write_frame(self, observation: Any) -> int:
+        assert self.frames is not None
+
+        frame_index = self._frame_count
+        self._frame_count += 1
+
+        self._evict_overwritten(frame_index, 1)
+        self.frames[frame_index % self.frame_capacity] = self.on_encode_observation(observation)
+
+        return frame_index
+
+    def on_write_observations(self, index: int, memory: Memory) -> None:
+        assert self.frame_indices_current is not None
+        assert self.frame_indices_next is not None
+        assert self._frame_eviction_keys is not None
+
+        # The runner hands the next observation of one step back to the agent
+        # as the current observation of the following step, so the frame only
+        # needs to be stored once.
+        if self._last_frame_index_next is not None and memory.observation_current is self._last_observation_next:
+            frame_index_current = self._last_frame_index_next
+        else:
+            frame_index_current = self._write_frame(memory.observation_current)
+
+        frame_index_next = self._write_frame(memory.observation_next)
+
+        self.frame_indices_current[index] = frame_index_current
+        self.frame_indices_next[index] = frame_index_next
+        self._frame_eviction_keys[index] = frame_index_current
+
+        # The next observation of a finished episode is never handed back,
+        # and its array may be recycled for the reset observation.
+        if memory.done or memory.truncated:
+            self._last_observation_next = None
+            self._last_frame_index_next = None
+        else:
+            self._last_observation_next = memory.observation_next
+            self._last_frame_index_next = frame_index_next
+
+        self._last_frame_indices_next = None
+
+    def on_write_observations_batch(
+        self,
+        indices: T.Tensor,
+        observations_current: T.Tensor,
+        observations_next: T.Tensor,
+        environment_indices: T.Tensor) -> None:
+        assert self.frames is not None
+        assert self.frame_indices_current is not None
+        assert self.frame_indices_next is not None
+        assert self._frame_eviction_keys is not None
+
+        count = indices.shape[0]
+
+        assert 2 * count <= self.frame_capacity
+
+        encoded_current = self.on_encode_observation(observations_current).to(self.device)
+        encoded_next = self.on_encode_observation(observations_next).to(self.device)
+        environment_indices = environment_indices.to(self.device)
+
+        # Within a batch the environments cannot be told apart by object
+        # identity, so the last next frame stored for each environment, in
+        # whichever batch it last took part, is reused whenever it still holds
+        # the new current observation and survives this batch's writes.
+        reused = T.zeros(count, dtype = T.bool, device = self.device)
+        frame_indices_current = T.zeros(count, dtype = T.int64, device = self.device)
+
+        if self._last_frame_indices_next is not None:
+            known = environment_indices < self._last_frame_indices_next.shape[0]
+            candidates = T.full((count,), -1, dtype = T.int64, device = self.device)
+            candidates[known] = self._last_frame_indices_next[environment_indices[known]]
+
+            reused = candidates >= max(0, self._frame_count + 2 * count - self.frame_capacity)
+
+            if reused.any():
+                reused[reused.clone()] = (
+                    self.frames[candidates[reused] % self.frame_capacity].flatten(start_dim = 1) ==
+                    encoded_current[reused].flatten(start_dim = 1)
+                ).all(dim = 1)
+
+            frame_indices_current[reused] = candidates[reused]
+
+        fresh = ~reused
+        fresh_count = int(fresh.sum().item())
+
+        frame_indices_current[fresh] = self._frame_count + T.arange(fresh_count, device = self.device)
+        frame_indices_next = self._frame_count + fresh_count + T.arange(count, device = self.device)
+
+        self._frame_count += fresh_count + count
+
+        # A reused frame can be older than frames referenced by the batches
+        # in between, whose eviction keys are lowered to it so the keys stay
+        # in order along the ring. Next frames are written in order, so only
+        # transitions whose next frame is newer than the reused one can be
+        # affected, about one round of the environments.
+        eviction_key = int(frame_indices_current.min().item())
+        previous_count = min(len(self) - count, self._frame_count - eviction_key)
+
+        if previous_count > 0:
+            previous = (int(indices[0].item()) - 1 - T.arange(previous_count, device = self.device)) % self.capacity
+            self._frame_eviction_keys[previous] = self._frame_eviction_keys[previous].clamp(max = eviction_key)
+
+        self._evict_overwritten(self._frame_count - 1, count)
+
+        self.frames[frame_indices_current[fresh] % self.frame_capacity] = encoded_current[fresh]
+        self.frames[frame_indices_next % self.frame_capacity] = encoded_next
+
+        self.frame_indices_current[indices] = frame_indices_current
+        self.frame_indices_next[indices] = frame_indices_next
+        self._frame_eviction_keys[indices] = eviction_key
+
+        # Environments missing from this batch keep their entries, the table
+        # only grows when a higher environment index shows up.
+        environment_count = int(environment_indices.max().item()) + 1
+
+        if self._last_frame_indices_next is None or self._last_frame_indices_next.shape[0] < environment_count:
+            last_frame_indices_next = T.full((environment_count,), -1, dtype = T.int64, device = self.device)
+
+            if self._last_frame_indices_next is not None:
+                last_frame_indices_next[:self._last_frame_indices_next.shape[0]] = self._last_frame_indices_next
+
+            self._last_frame_indices_next = last_frame_indices_next
+
+        self._last_frame_indices_next[environment_indices] = frame_indices_next
+
+        self._last_observation_next = None
+        self._last_frame_index_next = None
+
+    def on_read_observations(self, indices: T.Tensor) -> Tuple[T.Tensor, T.Tensor]:
+        assert self.frames is not None
+        assert self.frame_indices_current is not None
+        assert self.frame_indices_next is not None
+
+        return (
+            self.frames[self.frame_indices_current[indices] % self.frame_capacity],
+            self.frames[self.frame_indices_next[indices] % self.frame_capacity]
+        )
+
+    def on_clear(self) -> None:
+        super().on_clear()
+
+        self._last_observation_next = None
+        self._last_frame_index_next = None
+        self._last_frame_indices_next = None
+
+    def close(self) -> None:
+        self.frames = None
+        self.frame_indices_current = None
+        self.frame_indices_next = None
+        self._frame_eviction_keys = None
+
+        super().close()
@@ -0,0 +1,251 @@
+# Standard library
+from collections import OrderedDict
+
+# Typing
+from typing import Any, Dict, List, Optional, Tuple
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.FrameStack import FrameStack
+from .Memory import Memory
+from .MemoryReplayBuffer import MemoryReplayBuffer
+
+class MemoryFrameStackReplayBuffer(MemoryReplayBuffer):
+    stack_count: int
+    frame_capacity: int
+    frames: Optional[T.Tensor]
+    frame_indices_current: Optional[T.Tensor]
+    frame_indices_next: Optional[T.Tensor]
+    _frame_references: Optional[T.Tensor]
+    _frame_count: int
+    _transition_count: int
+    _stored_frames: "OrderedDict[Tuple[int, int], int]"
+    _last_frame_indices_next: Dict[int, T.Tensor]
+
+    def __init__(
+        self,
+        capacity: int,
+        stack_count: int,
+        frame_capacity: Optional[int] = None,
+        **kwargs: Any) -> None:
+        super().__init__(
+            capacity,
+            **kwargs
+        )
+
+        assert stack_count > 0
+
+        # A single environment needs about one frame per transition, several
+        # interleaved environments keep older frames alive for longer. When
+        # frames run out, the oldest transitions are evicted early.
+        self.stack_count = stack_count
+        self.frame_capacity = frame_capacity if frame_capacity is not None else 2 * (capacity + stack_count)
+
+        assert self.frame_capacity > 2 * stack_count
+
+        self.frames = None
+        self.frame_indices_current = None
+        self.frame_indices_next = None
+        self._frame_references = None
+        self._frame_count = 0
+        self._transition_count = 0
+        self._stored_frames = OrderedDict()
+        self._last_frame_indices_next = {}
+
+    def on_allocate_observation_storage(self, shape: Tuple[int, ...], dtype: T.dtype) -> None:
+        assert shape[0] % self.stack_count == 0
+
+        self.frames = self.on_allocate_observations(
+            self.frame_capacity,
+            (shape[0] // self.stack_count, *shape[1:]),
+            dtype
+        )
+        self.frame_indices_current = T.zeros((self.capacity, self.stack_count), dtype = T.int64, device = self.device)
+        self.frame_indices_next = T.zeros((self.capacity, self.stack_count), dtype = T.int64, device = self.device)
+
+        # The transition number of the newest transition referencing each
+        # frame slot, so that overwriting a frame evicts exactly the
+        # transitions which still need it.
+        self._frame_references = T.full((self.frame_capacity,), -1, dtype = T.int64)
+
+    def _write_frame(self, frame: Any, protected: int) -> int:
+        assert self.frames is not None
+        assert self._frame_references is not None
+
+        frame_index = self._frame_count
+        self._frame_count += 1
+
+        slot = frame_index % self.frame_capacity
+        reference = int(self._frame_references[slot].item())
+
+        while len(self) > protected and self._transition_count - len(self) <= reference:
+            self._evict_oldest()
+
+        self._frame_references[slot] = -1
+        self.frames[slot] = self.on_encode_observation(frame)
+
+        while len(self._stored_frames) > 0 and next(iter(self._stored_frames.values())) <= self._frame_count - self.frame_capacity:
+            self._stored_frames.popitem(last = False)
+
+        return frame_index
+
+    def _store_stack(self, observation: Any, protected: int, threshold: int) -> T.Tensor:
+        frame_indices: List[int] = []
+
+        if isinstance(observation, FrameStack):
+            # Frames shared with earlier stacks are stored once, as long as
+            # they survive the frames still to be written for this push.
+            for position, ring_frame_index in enumerate(observation.frame_indices):
+                key = (observation.ring.ring_index, ring_frame_index)
+                frame_index = self._stored_frames.get(key)
+
+                if frame_index is None or frame_index < threshold:
+                    frame_index = self._write_frame(observation.frame(position), protected)
+                    self._stored_frames[key] = frame_index
+                    self._stored_frames.move_to_end(key)
+
+                frame_indices.append(frame_index)
+        else:
+            for frame in self._split_stack(observation):
+                frame_indices.append(self._write_frame(frame, protected))
+
+        return T.as_tensor(frame_indices, dtype = T.int64)
+
+    def _split_stack(self, observation: Any) -> T.Tensor:
+        frames = self.on_encode_observation(observation)
+
+        return frames.reshape(self.stack_count, frames.shape[0] // self.stack_count, *frames.shape[1:])
+
+    def _store_dense_stacks(
+        self,
+        observation_current: Any,
+        observation_next: Any,
+        environment_index: int,
+        protected: int,
+        threshold: int) -> Tuple[T.Tensor, T.Tensor]:
+        assert self.frames is not None
+
+        frames_current = self._split_stack(observation_current)
+        frames_next = self._split_stack(observation_next)
+
+        # Dense stacks cannot be told apart by their frames' origin, so the
+        # last next stack stored for the environment is reused whenever it
+        # still holds the new current stack and survives this push's writes.
+        last_frame_indices_next = self._last_frame_indices_next.get(environment_index)
+
+        if (
+            last_frame_indices_next is not None and
+            int(last_frame_indices_next.min().item()) >= threshold and
+            T.equal(self.frames[last_frame_indices_next % self.frame_capacity], frames_current.to(self.frames.device))):
+            frame_indices_current = last_frame_indices_next.tolist()
+        else:
+            frame_indices_current = [self._write_frame(frame, protected) for frame in frames_current]
+
+        # The next stack is the current one moved on by a frame, so only the
+        # frames which did not just shift down a position are written.
+        frame_indices_next: List[int] = []
+
+        for position, frame in enumerate(frames_next):
+            if position + 1 < self.stack_count and T.equal(frame, frames_current[position + 1]):
+                frame_indices_next.append(frame_indices_current[position + 1])
+            else:
+                frame_indices_next.append(self._write_frame(frame, protected))
+
+        self._last_frame_indices_next[environment_index] = T.as_tensor(frame_indices_next, dtype = T.int64)
+
+        return T.as_tensor(frame_indices_current, dtype = T.int64), T.as_tensor(frame_indices_next, dtype = T.int64)
+
+    def _write_stacks(
+        self,
+        index: int,
+        observation_current: Any,
+        observation_next: Any,
+        environment_index: int,
+        protected: int,
+        threshold: int,
+        transition: int) -> None:
+        assert self.frame_indices_current is not None
+        assert self.frame_indices_next is not None
+        assert self._frame_references is not None
+
+        if isinstance(observation_current, FrameStack) or isinstance(observation_next, FrameStack):
+            frame_indices_current = self._store_stack(observation_current, protected, threshold)
+            frame_indices_next = self._store_stack(observation_next, protected, threshold)
+        else:
+            frame_indices_current, frame_indices_next = self._store_dense_stacks(
+                observation_current,
+                observation_next,
+                environment_index,
+                protected,
+                threshold
+            )
+
+        self.frame_indices_current[index] = frame_indices_current.to(self.device)
+        self.frame_indices_next[index] = frame_indices_next.to(self.device)
+
+        self._frame_references[frame_indices_current % self.frame_capacity] = transition
+        self._frame_references[frame_indices_next % self.frame_capacity] = transition
+
+    def on_write_observations(self, index: int, memory: Memory) -> None:
+        transition = self._transition_count
+        self._transition_count += 1
+
+        self._write_stacks(
+            index,
+            memory.observation_current,
+            memory.observation_next,
+            memory.environment_index,
+            1,
+            self._frame_count + 2 * self.stack_count - self.frame_capacity,
+            transition
+        )
+
+    def on_write_observations_batch(
+        self,
+        indices: T.Tensor,
+        observations_current: T.Tensor,
+        observations_next: T.Tensor,
+        environment_indices: T.Tensor) -> None:
+        count = indices.shape[0]
+
+        assert 2 * self.stack_count * count < self.frame_capacity
+
+        transition = self._transition_count
+        self._transition_count += count
+
+        # Frames reused anywhere in the batch have to survive all of its
+        # writes, as none of its transitions can be evicted meanwhile.
+        threshold = self._frame_count + 2 * self.stack_count * count - self.frame_capacity
+
+        for i, (index, environment_index) in enumerate(zip(indices.tolist(), environment_indices.tolist())):
+            self._write_stacks(
+                index,
+                observations_current[i],
+                observations_next[i],
+                environment_index,
+                count,
+                threshold,
+                transition + i
+            )
+
+    def on_read_observations(self, indices: T.Tensor) -> Tuple[T.Tensor, T.Tensor]:
+        assert self.frames is not None
+        assert self.frame_indices_current is not None
+        assert self.frame_indices_next is not None
+
+        def read(frame_indices: T.Tensor) -> T.Tensor:
+            stacks = self.frames[(frame_indices % self.frame_capacity).to(self.frames.device)] # type: ignore
+
+            return stacks.reshape(stacks.shape[0], -1, *stacks.shape[3:])
+
+        return read(self.frame_indices_current[indices]), read(self.frame_indices_next[indices])
+
+    def on_clear(self) -> None:
+        super().on_clear()
+
+        # Transitions are numbered across clears, so no stored frame counts
+        # as referenced any more.
+        self._stored_frames.clear()
+        self._last_frame_indices_next.clear()
@@ -0,0 +1,6 @@
+# Internal
+from .MemoryFrameReplayBuffer import MemoryFrameReplayBuffer
+from .MemoryMappedReplayBuffer import MemoryMappedReplayBuffer
+
+class MemoryMappedFrameReplayBuffer(MemoryMappedReplayBuffer, MemoryFrameReplayBuffer):
+    pass
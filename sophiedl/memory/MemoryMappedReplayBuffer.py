@@ -0,0 +1,86 @@
+# Standard library
+import os
+import tempfile
+
+# Typing
+from typing import Any, Optional, Tuple
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.FrameStack import FrameStack
+from .MemoryReplayBuffer import MemoryReplayBuffer
+
+class MemoryMappedReplayBuffer(MemoryReplayBuffer):
+    path: str
+    quantization_scale: float
+    _temporary_directory: "Optional[tempfile.TemporaryDirectory[str]]"
+    _allocation_count: int
+
+    def __init__(
+        self,
+        capacity: int,
+        path: Optional[str] = None,
+        quantization_scale: float = 255.,
+        **kwargs: Any) -> None:
+        super().__init__(
+            capacity,
+            observation_dtype = T.uint8,
+            **kwargs
+        )
+
+        assert quantization_scale > 0
+
+        if path is None:
+            self._temporary_directory = tempfile.TemporaryDirectory(prefix = "sophiedl-replay-")
+            self.path = self._temporary_directory.name
+        else:
+            self._temporary_directory = None
+            self.path = path
+            os.makedirs(self.path, exist_ok = True)
+
+        self.quantization_scale = quantization_scale
+        self._allocation_count = 0
+
+    def on_encode_observation(self, observation: Any) -> T.Tensor:
+        encoded = T.as_tensor(FrameStack.materialize(observation))
+
+        if encoded.dtype == T.uint8:
+            return encoded
+
+        return (encoded.to(dtype = T.float32) * self.quantization_scale).round_().clamp_(0, 255).to(dtype = T.uint8)
+
+    def on_decode_observations(self, observations: T.Tensor) -> T.Tensor:
+        return observations.to(dtype = T.float32) / self.quantization_scale
+
+    def on_allocate_observations(self, count: int, shape: Tuple[int, ...], dtype: T.dtype) -> T.Tensor:
+        assert dtype == T.uint8
+
+        observations = np.memmap(
+            os.path.join(self.path, "observations_{0}.bin".format(self._allocation_count)),
+            dtype = np.uint8,
+            mode = "w+",
+            shape = (count, *shape)
+        )
+
+        self._allocation_count += 1
+
+        return T.from_numpy(observations)
+
+    def close(self) -> None:
+        self.clear()
+        self.observations_current = None
+        self.observations_next = None
+        self.actions = None
+
+        # Subclasses drop their own storage (such as the frames of
+        # MemoryMappedFrameReplayBuffer) before the files are removed.
+        super().close()
+
+        if self._temporary_directory is not None:
+            self._temporary_directory.cleanup()
+            self._temporary_directory = None
@@ -0,0 +1,6 @@
+# Internal
+from .MemoryFrameReplayBuffer import MemoryFrameReplayBuffer
+from .MemoryPrioritizedReplayBuffer import MemoryPrioritizedReplayBuffer
+
+class MemoryPrioritizedFrameReplayBuffer(MemoryPrioritizedReplayBuffer, MemoryFrameReplayBuffer):
+    pass
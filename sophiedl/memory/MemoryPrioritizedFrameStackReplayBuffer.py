@@ -0,0 +1,6 @@
+# Internal
+from .MemoryFrameStackReplayBuffer import MemoryFrameStackReplayBuffer
+from .MemoryPrioritizedReplayBuffer import MemoryPrioritizedReplayBuffer
+
+class MemoryPrioritizedFrameStackReplayBuffer(MemoryPrioritizedReplayBuffer, MemoryFrameStackReplayBuffer):
+    pass
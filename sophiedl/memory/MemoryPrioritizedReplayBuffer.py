@@ -0,0 +1,124 @@
+# Typing
+from typing import Any, Optional, Tuple
+
+# PyTorch
+import torch as T
+
+# Internal
+from .Memory import Memory
+from .MemoryReplayBuffer import MemoryReplayBuffer
+from .SumTree import SumTree
+
+class MemoryPrioritizedReplayBuffer(MemoryReplayBuffer):
+    alpha: float
+    beta: float
+    beta_increment: float
+    epsilon: float
+    sum_tree: SumTree
+    _max_priority: float
+
+    def __init__(
+        self,
+        capacity: int,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        beta_increment: float = 0.,
+        epsilon: float = 1e-6,
+        observation_dtype: Optional[T.dtype] = T.float32,
+        device: T.device = T.device("cpu"),
+        **kwargs: Any) -> None:
+        super().__init__(
+            capacity,
+            observation_dtype = observation_dtype,
+            device = device,
+            **kwargs
+        )
+
+        assert alpha >= 0
+        assert beta >= 0 and beta <= 1
+
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.sum_tree = SumTree(capacity, device = device)
+        self._max_priority = 1.
+
+    def _evict_oldest(self, count: int = 1) -> None:
+        # Frame buffers evict transitions before they are overwritten, whose
+        # slots must not be sampled any more.
+        indices = (self._head + T.arange(count, device = self.device)) % self.capacity
+
+        super()._evict_oldest(count)
+
+        self.sum_tree.update(indices, T.zeros(count, dtype = T.float64))
+
+    def on_write(self, index: int, memory: Memory) -> None:
+        super().on_write(index, memory)
+
+        self.sum_tree.update(
+            T.as_tensor([index]),
+            T.as_tensor([self._max_priority ** self.alpha])
+        )
+
+    def on_write_batch(
+        self,
+        indices: T.Tensor,
+        observations_current: T.Tensor,
+        actions: T.Tensor,
+        action_samples: Optional[T.Tensor],
+        rewards: T.Tensor,
+        observations_next: T.Tensor,
+        dones: T.Tensor,
+        environment_indices: T.Tensor,
+        truncations: T.Tensor) -> None:
+        super().on_write_batch(
+            indices,
+            observations_current,
+            actions,
+            action_samples,
+            rewards,
+            observations_next,
+            dones,
+            environment_indices,
+            truncations
+        )
+
+        self.sum_tree.update(
+            indices,
+            T.full(indices.shape, self._max_priority ** self.alpha, dtype = T.float64)
+        )
+
+    def on_clear(self) -> None:
+        super().on_clear()
+
+        self.sum_tree.clear()
+        self._max_priority = 1.
+
+    def on_sample(self, batch_size: int) -> Tuple[T.Tensor, T.Tensor]:
+        total = self.sum_tree.total
+        segment = total / batch_size
+
+        indices = self.sum_tree.find(
+            (T.arange(batch_size, dtype = T.float64) + T.rand(batch_size, dtype = T.float64)) * segment
+        )
+
+        probabilities = self.sum_tree[indices] / total
+        weights = (len(self) * probabilities) ** -self.beta
+        weights /= weights.max()
+
+        self.beta = min(1., self.beta + self.beta_increment)
+
+        return indices.to(self.device), weights.to(dtype = T.float32)
+
+    def update_priorities(self, indices: T.Tensor, priorities: T.Tensor) -> None:
+        priorities = priorities.detach().to(dtype = T.float64, device = self.device) + self.epsilon
+
+        with self.lock:
+            # Transitions evicted since they were sampled keep their slots
+            # empty.
+            stored = (indices.to(self.device) - self._head) % self.capacity < self._size
+
+            self._max_priority = max(self._max_priority, priorities.max().item())
+
+            self.sum_tree.update(indices[stored], priorities[stored] ** self.alpha)
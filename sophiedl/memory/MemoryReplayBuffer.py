@@ -0,0 +1,293 @@
+# Standard library
+from collections import namedtuple
+
+# Typing
+from typing import Any, Optional, Tuple
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..domain.FrameStack import FrameStack
+from .Memory import Memory
+from .MemoryBufferBase import MemoryBufferBase
+
+MemoryBatch = namedtuple(
+    "MemoryBatch",
+    [
+        "observations_current",
+        "actions",
+        "action_samples",
+        "rewards",
+        "observations_next",
+        "dones",
+        "indices",
+        "weights",
+        "environment_indices",
+        "truncations"
+    ]
+)
+
+class MemoryReplayBuffer(MemoryBufferBase):
+    capacity: int
+    observation_dtype: Optional[T.dtype]
+    device: T.device
+    observations_current: Optional[T.Tensor]
+    observations_next: Optional[T.Tensor]
+    actions: Optional[T.Tensor]
+    action_samples: Optional[T.Tensor]
+    rewards: Optional[T.Tensor]
+    dones: Optional[T.Tensor]
+    environment_indices: Optional[T.Tensor]
+    truncations: Optional[T.Tensor]
+    _head: int
+    _size: int
+
+    def __init__(
+        self,
+        capacity: int,
+        observation_dtype: Optional[T.dtype] = T.float32,
+        device: T.device = T.device("cpu"),
+        **kwargs: Any) -> None:
+        super().__init__()
+
+        # Buffers combined through multiple inheritance pass their arguments
+        # along the MRO, all of them have been taken by the time they get here.
+        if len(kwargs) > 0:
+            raise Exception("unexpected arguments: {0}".format(", ".join(sorted(kwargs))))
+
+        assert capacity > 0
+
+        self.capacity = capacity
+        self.observation_dtype = observation_dtype
+        self.device = device
+        self.observations_current = None
+        self.observations_next = None
+        self.actions = None
+        self.action_samples = None
+        self.rewards = None
+        self.dones = None
+        self.environment_indices = None
+        self.truncations = None
+        self._head = 0
+        self._size = 0
+
+    def on_encode_observation(self, observation: Any) -> T.Tensor:
+        return T.as_tensor(FrameStack.materialize(observation), dtype = self.observation_dtype)
+
+    def on_decode_observations(self, observations: T.Tensor) -> T.Tensor:
+        return observations.to(dtype = T.float32)
+
+    def on_allocate_observations(self, count: int, shape: Tuple[int, ...], dtype: T.dtype) -> T.Tensor:
+        return T.zeros((count, *shape), dtype = dtype, device = self.device)
+
+    def on_allocate_observation_storage(self, shape: Tuple[int, ...], dtype: T.dtype) -> None:
+        self.observations_current = self.on_allocate_observations(self.capacity, shape, dtype)
+        self.observations_next = self.on_allocate_observations(self.capacity, shape, dtype)
+
+    def on_copies_observations(self) -> bool:
+        return True
+
+    def on_allocate(self, memory: Memory) -> None:
+        observation = self.on_encode_observation(memory.observation_current)
+        action = T.as_tensor(memory.action)
+
+        self.on_allocate_observation_storage(tuple(observation.shape), observation.dtype)
+        self.actions = T.zeros((self.capacity, *action.shape), dtype = action.dtype, device = self.device)
+
+        if memory.action_sample is not None:
+            self.action_samples = T.zeros((self.capacity, *memory.action_sample.shape), dtype = memory.action_sample.dtype, device = self.device)
+
+        self.rewards = T.zeros(self.capacity, dtype = T.float32, device = self.device)
+        self.dones = T.zeros(self.capacity, dtype = T.bool, device = self.device)
+        self.environment_indices = T.zeros(self.capacity, dtype = T.int64, device = self.device)
+        self.truncations = T.zeros(self.capacity, dtype = T.bool, device = self.device)
+
+    def on_write_observations(self, index: int, memory: Memory) -> None:
+        assert self.observations_current is not None
+        assert self.observations_next is not None
+
+        self.observations_current[index] = self.on_encode_observation(memory.observation_current)
+        self.observations_next[index] = self.on_encode_observation(memory.observation_next)
+
+    def on_write(self, index: int, memory: Memory) -> None:
+        assert self.actions is not None
+        assert self.rewards is not None
+        assert self.dones is not None
+        assert self.environment_indices is not None
+        assert self.truncations is not None
+
+        self.on_write_observations(index, memory)
+        self.actions[index] = T.as_tensor(memory.action)
+
+        if self.action_samples is not None:
+            assert memory.action_sample is not None
+            self.action_samples[index] = memory.action_sample
+
+        self.rewards[index] = 0. if memory.reward is None else memory.reward
+        self.dones[index] = memory.done
+        self.environment_indices[index] = memory.environment_index
+        self.truncations[index] = memory.truncated
+
+    def on_write_observations_batch(
+        self,
+        indices: T.Tensor,
+        observations_current: T.Tensor,
+        observations_next: T.Tensor,
+        environment_indices: T.Tensor) -> None:
+        assert self.observations_current is not None
+        assert self.observations_next is not None
+
+        self.observations_current[indices] = self.on_encode_observation(observations_current).to(self.device)
+        self.observations_next[indices] = self.on_encode_observation(observations_next).to(self.device)
+
+    def on_write_batch(
+        self,
+        indices: T.Tensor,
+        observations_current: T.Tensor,
+        actions: T.Tensor,
+        action_samples: Optional[T.Tensor],
+        rewards: T.Tensor,
+        observations_next: T.Tensor,
+        dones: T.Tensor,
+        environment_indices: T.Tensor,
+        truncations: T.Tensor) -> None:
+        assert self.actions is not None
+        assert self.rewards is not None
+        assert self.dones is not None
+        assert self.environment_indices is not None
+        assert self.truncations is not None
+
+        self.on_write_observations_batch(indices, observations_current, observations_next, environment_indices)
+        self.actions[indices] = actions.to(self.device, dtype = self.actions.dtype)
+
+        if self.action_samples is not None:
+            assert action_samples is not None
+            self.action_samples[indices] = action_samples.to(self.device, dtype = self.action_samples.dtype)
+
+        self.rewards[indices] = rewards.to(self.device)
+        self.dones[indices] = dones.to(self.device)
+        self.environment_indices[indices] = environment_indices.to(self.device)
+        self.truncations[indices] = truncations.to(self.device)
+
+    def on_read_observations(self, indices: T.Tensor) -> Tuple[T.Tensor, T.Tensor]:
+        assert self.observations_current is not None
+        assert self.observations_next is not None
+
+        return self.observations_current[indices], self.observations_next[indices]
+
+    def on_sample(self, batch_size: int) -> Tuple[T.Tensor, T.Tensor]:
+        return (
+            (self._head + T.randint(self._size, (batch_size,), device = self.device)) % self.capacity,
+            T.ones(batch_size, dtype = T.float32)
+        )
+
+    def _evict_oldest(self, count: int = 1) -> None:
+        assert self._size >= count
+
+        self._head = (self._head + count) % self.capacity
+        self._size -= count
+
+    def _reserve(self, count: int) -> T.Tensor:
+        assert count <= self.capacity
+
+        overflow = self._size + count - self.capacity
+
+        if overflow > 0:
+            self._evict_oldest(overflow)
+
+        indices = (self._head + self._size + T.arange(count, device = self.device)) % self.capacity
+        self._size += count
+
+        return indices
+
+    def on_push(self, memory: Memory) -> None:
+        if self.actions is None:
+            self.on_allocate(memory)
+
+        if self._size == self.capacity:
+            self._evict_oldest()
+
+        index = (self._head + self._size) % self.capacity
+        self._size += 1
+
+        self.on_write(index, memory)
+
+    def on_push_transitions(
+        self,
+        observations_current: T.Tensor,
+        actions: T.Tensor,
+        action_samples: Optional[T.Tensor],
+        rewards: T.Tensor,
+        observations_next: T.Tensor,
+        dones: T.Tensor,
+        environment_indices: T.Tensor,
+        truncations: T.Tensor) -> None:
+        if self.actions is None:
+            self.on_allocate(
+                Memory(
+                    observation_current = observations_current[0],
+                    action = actions[0],
+                    action_sample = action_samples[0] if action_samples is not None else None
+                )
+            )
+
+        self.on_write_batch(
+            self._reserve(observations_current.shape[0]),
+            observations_current,
+            actions,
+            action_samples,
+            rewards,
+            observations_next,
+            dones,
+            environment_indices,
+            truncations
+        )
+
+    def on_clear(self) -> None:
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def gather(self, indices: T.Tensor, device: T.device, weights: Optional[T.Tensor] = None) -> MemoryBatch:
+        assert self.actions is not None
+        assert self.rewards is not None
+        assert self.dones is not None
+        assert self.environment_indices is not None
+        assert self.truncations is not None
+
+        observations_current, observations_next = self.on_read_observations(indices)
+
+        return MemoryBatch(
+            self.on_decode_observations(observations_current.to(device)),
+            self.actions[indices].to(device),
+            self.action_samples[indices].to(device) if self.action_samples is not None else None,
+            self.rewards[indices].to(device),
+            self.on_decode_observations(observations_next.to(device)),
+            self.dones[indices].to(device),
+            indices,
+            (weights if weights is not None else T.ones(indices.shape[0], dtype = T.float32)).to(device),
+            self.environment_indices[indices].to(device),
+            self.truncations[indices].to(device)
+        )
+
+    def sample(self, batch_size: int, device: T.device) -> MemoryBatch:
+        with self.lock:
+            if self._size == 0:
+                raise Exception("cannot sample from an empty replay buffer")
+
+            indices, weights = self.on_sample(batch_size)
+
+            return self.gather(indices, device, weights)
+
+    def read_all(self, device: T.device) -> MemoryBatch:
+        with self.lock:
+            return self.gather(
+                (self._head + T.arange(self._size, device = self.device)) % self.capacity,
+                device
+            )
+
+    def update_priorities(self, indices: T.Tensor, priorities: T.Tensor) -> None:
+        pass
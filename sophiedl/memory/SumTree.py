@@ -0,0 +1,48 @@
+# PyTorch
+import torch as T
+
+class SumTree(object):
+    capacity: int
+    _leaf_offset: int
+    _depth: int
+    _nodes: T.Tensor
+
+    def __init__(self, capacity: int, device: T.device = T.device("cpu")) -> None:
+        assert capacity > 0
+
+        self.capacity = capacity
+        self._depth = max(0, (capacity - 1).bit_length())
+        self._leaf_offset = 1 << self._depth
+        self._nodes = T.zeros(2 * self._leaf_offset, dtype = T.float64, device = device)
+
+    @property
+    def total(self) -> float:
+        return float(self._nodes[1].item())
+
+    def __getitem__(self, indices: T.Tensor) -> T.Tensor:
+        return self._nodes[indices + self._leaf_offset]
+
+    def clear(self) -> None:
+        self._nodes.zero_()
+
+    def update(self, indices: T.Tensor, priorities: T.Tensor) -> None:
+        nodes = indices.to(dtype = T.int64, device = self._nodes.device) + self._leaf_offset
+
+        self._nodes[nodes] = priorities.to(dtype = T.float64, device = self._nodes.device)
+
+        for _ in range(self._depth):
+            nodes = T.unique(nodes // 2)
+            self._nodes[nodes] = self._nodes[2 * nodes] + self._nodes[2 * nodes + 1]
+
+    def find(self, values: T.Tensor) -> T.Tensor:
+        values = values.to(dtype = T.float64, device = self._nodes.device)
+        nodes = T.ones(values.shape, dtype = T.int64, device = self._nodes.device)
+
+        for _ in range(self._depth):
+            left = 2 * nodes
+            left_values = self._nodes[left]
+            go_right = (values >= left_values) & (self._nodes[left + 1] > 0)
+            values = T.where(go_right, values - left_values, values)
+            nodes = T.where(go_right, left + 1, left)
+
+        return nodes - self._leaf_offset
@@ -3,9 +3,15 @@ import torch as T
 import torch.nn as nn
 import torch.optim as O
 
+# Internal
+from .SharedParameters import SharedParameters
+
 class OptimizedModule(nn.Module):
     learning_rate: float
     optimizer: O.Optimizer
     device: T.device
 
     def forward(self, _: T.Tensor) -> T.Tensor: ...
+
+    def share_parameters(self) -> SharedParameters:
+        return SharedParameters(self)
@@ -0,0 +1,13 @@
+# PyTorch
+import torch as T
+import torch.nn as nn
+
+class Scale(nn.Module):
+    factor: float
+
+    def __init__(self, factor: float) -> None:
+        super().__init__()
+        self.factor = factor
+
+    def forward(self, x: T.Tensor) -> T.Tensor:
+        return x * self.factor
@@ -0,0 +1,85 @@
+# Typing
+from typing import Any, Dict, Optional
+
+# PyTorch
+import torch as T
+import torch.nn as nn
+
+class SharedParameters(object):
+    attempt_count: int
+    _tensors: Dict[str, T.Tensor]
+    _sequence: T.Tensor
+    _loaded_sequence: int
+    _staging: Optional[Dict[str, T.Tensor]]
+
+    def __init__(self, module: nn.Module, attempt_count: int = 3) -> None:
+        assert attempt_count > 0
+
+        # The module's state lives in shared memory next to a sequence counter,
+        # which one writer makes odd while it copies new weights in. Readers
+        # copy without locking and start over when the counter moved in the
+        # meantime. Processes started afterwards share the same memory.
+        self.attempt_count = attempt_count
+        self._tensors = {k: v.detach().cpu().clone().share_memory_() for k, v in module.state_dict().items()}
+        self._sequence = T.zeros(1, dtype = T.int64).share_memory_() # type: ignore
+        self._loaded_sequence = 0
+        self._staging = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Every reader copies into staging tensors of its own, which must not
+        # end up in shared memory along with the rest.
+        state = self.__dict__.copy()
+        state["_staging"] = None
+
+        return state
+
+    @property
+    def version(self) -> int:
+        return int(self._sequence.item()) // 2
+
+    def publish(self, module: nn.Module) -> int:
+        state = module.state_dict()
+        sequence = int(self._sequence.item())
+
+        self._sequence.fill_(sequence + 1)
+
+        with T.no_grad():
+            for k, tensor in self._tensors.items():
+                tensor.copy_(state[k])
+
+        self._sequence.fill_(sequence + 2)
+
+        return (sequence + 2) // 2
+
+    def load(self, module: nn.Module) -> bool:
+        # Returns whether the module was updated, which only happens when a
+        # version newer than the last one loaded here has been published.
+        for _ in range(self.attempt_count):
+            sequence = int(self._sequence.item())
+
+            # While a new version is being written the current weights are
+            # kept, the next call picks it up.
+            if sequence == self._loaded_sequence or sequence % 2 == 1:
+                return False
+
+            if self._staging is None:
+                self._staging = {k: T.empty_like(v) for k, v in self._tensors.items()}
+
+            # A torn copy only ever reaches the staging tensors, the module is
+            # updated once the copy is known to be consistent.
+            with T.no_grad():
+                for k, tensor in self._tensors.items():
+                    self._staging[k].copy_(tensor)
+
+            if int(self._sequence.item()) == sequence:
+                state = module.state_dict()
+
+                with T.no_grad():
+                    for k, tensor in self._staging.items():
+                        state[k].copy_(tensor)
+
+                self._loaded_sequence = sequence
+
+                return True
+
+        return False
@@ -1,5 +1,6 @@
 # Standard library
 import abc
+import functools
 
 # Typing
 from typing import Optional, Union
@@ -9,9 +10,23 @@ import torch as T
 
 # Internal
 from ...agent.AgentBase import AgentBase
+from ...agent.AgentContinuousActorCritic import AgentContinuousActorCritic
+from ...agent.AgentDiscreteActorCritic import AgentDiscreteActorCritic
+from ...agent.AgentDQN import AgentDQN
+from ...agent.AgentPGO import AgentPGO
 from ...environment.EnvironmentBase import EnvironmentBase
+from ...environment.EnvironmentRemote import EnvironmentRemote
+from ...environment.EnvironmentTraceReplay import EnvironmentTraceReplay
+from ...environment.EnvironmentTransformFused import EnvironmentTransformFused
+from ...environment.EnvironmentTransformRecordTrace import EnvironmentTransformRecordTrace
+from ...environment.EnvironmentTransformResetPool import EnvironmentTransformResetPool
+from ...environment.EnvironmentVectorBase import EnvironmentVectorBase
+from ...environment.EnvironmentVectorRemote import EnvironmentVectorRemote
+from ...environment.EnvironmentVectorSubprocess import EnvironmentVectorSubprocess
 from ...hyperparameters.HyperparameterSet import HyperparameterSet
 from ...running.RunnerRL import RunnerRL
+from ...running.RunnerRLDistributed import RunnerRLDistributed
+from ...running.RunnerRLRolloutPool import RunnerRLRolloutPool
 from .RunnerFactoryBase import RunnerFactoryBase
 
 class RunnerRLFactoryBase(RunnerFactoryBase):
@@ -19,18 +34,171 @@ class RunnerRLFactoryBase(RunnerFactoryBase):
     def on_create_environment(self) -> EnvironmentBase:
         pass
 
+    def on_create_vector_environment(self, environment_count: int) -> Optional[EnvironmentVectorBase]:
+        # Factories whose environment has a batched implementation, stepping
+        # all instances at once in-process, return it here.
+        return None
+
     @abc.abstractmethod
     def on_create_agent(
         self,
-        environment: EnvironmentBase,
+        environment: Union[EnvironmentBase, EnvironmentVectorBase],
         hyperparameter_set: HyperparameterSet) -> AgentBase:
         pass
 
+    def _create_environment(self, hyperparameter_set: HyperparameterSet, primary: bool = True) -> EnvironmentBase:
+        # A recorded trace stands in for the environment, which then does not
+        # need to be created (or even installed) at all.
+        if "environment_trace_replay" in hyperparameter_set and hyperparameter_set["environment_trace_replay"]:
+            environment: EnvironmentBase = EnvironmentTraceReplay(hyperparameter_set["environment_trace_replay"])
+        elif "environment_remote" in hyperparameter_set and hyperparameter_set["environment_remote"]:
+            # The stack is built and run by an environment server, see
+            # create_environment.
+            environment = EnvironmentRemote(hyperparameter_set["environment_remote"])
+        else:
+            environment = self.on_create_environment()
+
+            if primary and "environment_trace_record" in hyperparameter_set and hyperparameter_set["environment_trace_record"]:
+                environment = EnvironmentTransformRecordTrace(environment, hyperparameter_set["environment_trace_record"])
+
+        if "environment_fusion" in hyperparameter_set and hyperparameter_set["environment_fusion"]:
+            environment = EnvironmentTransformFused(environment)
+
+        # Environments preparing start states in the background are only
+        # helpers of the primary one.
+        if primary and "environment_reset_pool" in hyperparameter_set and hyperparameter_set["environment_reset_pool"] > 0:
+            environment = EnvironmentTransformResetPool(
+                environment,
+                pool_size = hyperparameter_set["environment_reset_pool"],
+                environment_factory = functools.partial(self._create_environment, hyperparameter_set, False)
+                    if "environment_reset_pool_background" in hyperparameter_set and hyperparameter_set["environment_reset_pool_background"]
+                    else None,
+                reuse_count = hyperparameter_set["environment_reset_pool_reuse"] if "environment_reset_pool_reuse" in hyperparameter_set else 8
+            )
+
+        if "environment_validation" in hyperparameter_set:
+            environment.set_validation(
+                hyperparameter_set["environment_validation"],
+                count = hyperparameter_set["environment_validation_count"] if "environment_validation_count" in hyperparameter_set else 0,
+                interval = hyperparameter_set["environment_validation_interval"] if "environment_validation_interval" in hyperparameter_set else 1
+            )
+
+        return environment
+
+    def create_environment(self, hyperparameter_set: HyperparameterSet) -> EnvironmentBase:
+        return self._create_environment(hyperparameter_set)
+
     def on_create_runner(
         self,
         hyperparameter_set: HyperparameterSet,
         tensorboard_output_dir: Optional[str]) -> RunnerRL:
-        environment = self.on_create_environment()
+        environment_count = hyperparameter_set["environment_count"] if "environment_count" in hyperparameter_set else 1
+
+        if "environment_numpy" in hyperparameter_set and hyperparameter_set["environment_numpy"]:
+            vector_environment = self.on_create_vector_environment(environment_count)
+
+            if vector_environment is None:
+                raise Exception("{0} has no batched environment".format(type(self).__name__))
+
+            return RunnerRL(
+                vector_environment,
+                self.on_create_agent(vector_environment, hyperparameter_set),
+                hyperparameter_set = hyperparameter_set,
+                tensorboard_output_dir = tensorboard_output_dir
+            )
+
+        if environment_count > 1:
+            if "environment_trace_record" in hyperparameter_set and hyperparameter_set["environment_trace_record"]:
+                raise Exception("traces can only be recorded from a single environment")
+
+            # A server hosting several environments is driven as a whole, one
+            # request stepping all of them.
+            if "environment_remote" in hyperparameter_set and hyperparameter_set["environment_remote"]:
+                remote_environment = EnvironmentVectorRemote(hyperparameter_set["environment_remote"])
+
+                if remote_environment.environment_count != environment_count:
+                    remote_environment.close()
+
+                    raise Exception(
+                        "{0} hosts {1} environments, not {2}".format(
+                            hyperparameter_set["environment_remote"],
+                            remote_environment.environment_count,
+                            environment_count
+                        )
+                    )
+
+                return RunnerRL(
+                    remote_environment,
+                    self.on_create_agent(remote_environment, hyperparameter_set),
+                    hyperparameter_set = hyperparameter_set,
+                    tensorboard_output_dir = tensorboard_output_dir
+                )
+
+        distributed = "distributed_actor_count" in hyperparameter_set and hyperparameter_set["distributed_actor_count"] > 0
+
+        if distributed:
+            # Only the actors step environments, the learner's environment is
+            # just used to build the agent. Nothing would be recorded and no
+            # start states would be prepared.
+            if "environment_trace_record" in hyperparameter_set and hyperparameter_set["environment_trace_record"]:
+                raise Exception("traces cannot be recorded from distributed actors")
+
+            if "environment_reset_pool" in hyperparameter_set and hyperparameter_set["environment_reset_pool"] > 0:
+                raise Exception("reset pools are not supported with distributed actors")
+
+        rollout_pool = "rollout_pool_size" in hyperparameter_set and hyperparameter_set["rollout_pool_size"] > 0
+
+        # With several environments the runner steps copies of the environment
+        # in worker processes, and the agent is built from their shapes.
+        if environment_count > 1 and not distributed and not rollout_pool:
+            subprocess_environment = EnvironmentVectorSubprocess(
+                functools.partial(self._create_environment, hyperparameter_set),
+                environment_count
+            )
+
+            return RunnerRL(
+                subprocess_environment,
+                self.on_create_agent(subprocess_environment, hyperparameter_set),
+                hyperparameter_set = hyperparameter_set,
+                tensorboard_output_dir = tensorboard_output_dir
+            )
+
+        environment = self._create_environment(hyperparameter_set, primary = not distributed)
+
+        if distributed:
+            agent = self.on_create_agent(environment, hyperparameter_set)
+
+            if not isinstance(agent, AgentDQN):
+                raise Exception("distributed actors need a DQN agent, not {0}".format(type(agent).__name__))
+
+            # Actors build their environments without the primary-only parts
+            # such as trace recording.
+            return RunnerRLDistributed(
+                environment,
+                functools.partial(self._create_environment, hyperparameter_set, False),
+                agent,
+                hyperparameter_set = hyperparameter_set,
+                actor_count = hyperparameter_set["distributed_actor_count"],
+                tensorboard_output_dir = tensorboard_output_dir
+            )
+
+        if rollout_pool:
+            agent = self.on_create_agent(environment, hyperparameter_set)
+
+            # Every update replaces the agent's memory with freshly collected
+            # episodes, which only suits agents learning from their own policy.
+            if not isinstance(agent, (AgentContinuousActorCritic, AgentDiscreteActorCritic, AgentPGO)):
+                raise Exception("rollout pools need an on-policy agent, not {0}".format(type(agent).__name__))
+
+            return RunnerRLRolloutPool(
+                environment,
+                functools.partial(self._create_environment, hyperparameter_set, False),
+                agent,
+                hyperparameter_set = hyperparameter_set,
+                rollout_episode_count = hyperparameter_set["rollout_pool_size"],
+                worker_count = hyperparameter_set["rollout_pool_worker_count"] if "rollout_pool_worker_count" in hyperparameter_set else None,
+                tensorboard_output_dir = tensorboard_output_dir
+            )
 
         return RunnerRL(
             environment,
@@ -1,5 +1,5 @@
 # Typing
-from typing import cast, Tuple, Union
+from typing import cast, Optional, Tuple, Union
 
 # NumPy
 import numpy as np # type: ignore
@@ -16,6 +16,8 @@ from ...agent.AgentBase import AgentBase
 from ...agent.AgentContinuousActorCritic import AgentContinuousActorCritic
 from ...environment.EnvironmentBase import EnvironmentBase
 from ...environment.EnvironmentGymWrapper import EnvironmentGymWrapper
+from ...environment.EnvironmentVectorBase import EnvironmentVectorBase
+from ...environment.EnvironmentVectorMountainCarContinuous import EnvironmentVectorMountainCarContinuous
 from ...hyperparameters.HyperparameterSet import HyperparameterSet
 from ...network.OptimizedSequential import OptimizedSequential
 from ..base.RunnerRLFactoryBase import RunnerRLFactoryBase
@@ -36,7 +38,10 @@ class RunnerRLFactoryContinuousActorCriticMountainCarContinuousV0(RunnerRLFactor
             np.ndarray
         )
     
-    def on_create_agent(self, environment: EnvironmentBase, hyperparameter_set: HyperparameterSet) -> AgentBase:
+    def on_create_vector_environment(self, environment_count: int) -> Optional[EnvironmentVectorBase]:
+        return EnvironmentVectorMountainCarContinuous(environment_count)
+    
+    def on_create_agent(self, environment: Union[EnvironmentBase, EnvironmentVectorBase], hyperparameter_set: HyperparameterSet) -> AgentBase:
         return AgentContinuousActorCritic(
             actor_network = OptimizedSequential(
                 nn.Linear(
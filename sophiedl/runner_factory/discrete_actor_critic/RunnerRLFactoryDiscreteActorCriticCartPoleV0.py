@@ -16,6 +16,7 @@ from ...agent.AgentBase import AgentBase
 from ...agent.AgentDiscreteActorCritic import AgentDiscreteActorCritic
 from ...environment.EnvironmentBase import EnvironmentBase
 from ...environment.EnvironmentGymWrapper import EnvironmentGymWrapper
+from ...environment.EnvironmentVectorBase import EnvironmentVectorBase
 from ...hyperparameters.HyperparameterSet import HyperparameterSet
 from ...network.OptimizedSequential import OptimizedSequential
 from ..base.RunnerRLFactoryBase import RunnerRLFactoryBase
@@ -36,7 +37,7 @@ class RunnerRLFactoryDiscreteActorCriticCartPoleV0(RunnerRLFactoryBase):
             int
         )
     
-    def on_create_agent(self, environment: EnvironmentBase, hyperparameter_set: HyperparameterSet) -> AgentBase:
+    def on_create_agent(self, environment: Union[EnvironmentBase, EnvironmentVectorBase], hyperparameter_set: HyperparameterSet) -> AgentBase:
         return AgentDiscreteActorCritic(
             actor_network = OptimizedSequential(
                 nn.Linear(
@@ -1,5 +1,5 @@
 # Typing
-from typing import cast, Union
+from typing import cast, Optional, Union
 
 # NumPy
 import numpy as np # type: ignore
@@ -17,6 +17,8 @@ from ...agent.AgentDQN import AgentDQN
 from ...agent.EpsilonGreedyStrategy import EpsilonGreedyStrategy
 from ...environment.EnvironmentBase import EnvironmentBase
 from ...environment.EnvironmentGymWrapper import EnvironmentGymWrapper
+from ...environment.EnvironmentVectorBase import EnvironmentVectorBase
+from ...environment.EnvironmentVectorCartPole import EnvironmentVectorCartPole
 from ...hyperparameters.HyperparameterSet import HyperparameterSet
 from ...network.OptimizedSequential import OptimizedSequential
 from ..base.RunnerRLFactoryBase import RunnerRLFactoryBase
@@ -30,6 +32,9 @@ class RunnerRLFactoryDQNCartPoleV0(RunnerRLFactoryBase):
         hyperparameter_set.add("epsilon_end", 0.05)
         hyperparameter_set.add("epsilon_decay", 0.005)
         hyperparameter_set.add("memory_batch_size", 100)
+        hyperparameter_set.add("memory_capacity", 100000)
+        hyperparameter_set.add("memory_prioritized", False)
+        hyperparameter_set.add("memory_frame_deduplication", True)
         hyperparameter_set.add("target_update_interval", 2)
         hyperparameter_set.add("episode_count", 500)
         return hyperparameter_set
@@ -41,7 +46,10 @@ class RunnerRLFactoryDQNCartPoleV0(RunnerRLFactoryBase):
             int
         )
     
-    def on_create_agent(self, environment: EnvironmentBase, hyperparameter_set: HyperparameterSet) -> AgentBase:
+    def on_create_vector_environment(self, environment_count: int) -> Optional[EnvironmentVectorBase]:
+        return EnvironmentVectorCartPole(environment_count)
+    
+    def on_create_agent(self, environment: Union[EnvironmentBase, EnvironmentVectorBase], hyperparameter_set: HyperparameterSet) -> AgentBase:
         return AgentDQN(
             policy_network = OptimizedSequential(
                 nn.Linear(
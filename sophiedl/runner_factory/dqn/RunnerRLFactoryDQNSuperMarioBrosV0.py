@@ -7,7 +7,6 @@ import numpy as np # type: ignore
 # PyTorch
 import torch as T
 import torch.nn as nn
-import torchvision.transforms as transforms # type: ignore
 
 # Gym Super Mario Bros
 from nes_py.wrappers import JoypadSpace # type: ignore
@@ -21,12 +20,17 @@ from ...agent.EpsilonGreedyStrategy import EpsilonGreedyStrategy
 from ...domain.Shape import Shape
 from ...environment.EnvironmentBase import EnvironmentBase
 from ...environment.EnvironmentGymWrapper import EnvironmentGymWrapper
-from ...environment.EnvironmentTransformCopyNDArray import EnvironmentTransformCopyNDArray
-from ...environment.EnvironmentTransformPyTorchTransforms import EnvironmentTransformPyTorchTransforms
+from ...environment.EnvironmentVectorBase import EnvironmentVectorBase
+from ...environment.EnvironmentTransformGrayscale import EnvironmentTransformGrayscale
+from ...environment.EnvironmentTransformResize import EnvironmentTransformResize
 from ...environment.EnvironmentTransformSkipFrames import EnvironmentTransformSkipFrames
 from ...hyperparameters.HyperparameterSet import HyperparameterSet
+from ...memory.MemoryMappedFrameReplayBuffer import MemoryMappedFrameReplayBuffer
+from ...memory.MemoryMappedReplayBuffer import MemoryMappedReplayBuffer
+from ...memory.MemoryReplayBuffer import MemoryReplayBuffer
 from ...network.CNNCell import CNNCell
 from ...network.OptimizedSequential import OptimizedSequential
+from ...network.Scale import Scale
 from ..base.RunnerRLFactoryBase import RunnerRLFactoryBase
 
 class RunnerRLFactoryDQNSuperMarioBrosV0(RunnerRLFactoryBase):
@@ -38,14 +42,20 @@ class RunnerRLFactoryDQNSuperMarioBrosV0(RunnerRLFactoryBase):
         hyperparameter_set.add("epsilon_end", 0.05)
         hyperparameter_set.add("epsilon_decay", 0.005)
         hyperparameter_set.add("memory_batch_size", 32)
+        hyperparameter_set.add("memory_capacity", 100000)
+        hyperparameter_set.add("memory_mapped", True)
+        hyperparameter_set.add("memory_frame_deduplication", True)
         hyperparameter_set.add("target_update_interval", 2)
         hyperparameter_set.add("episode_count", 100)
         hyperparameter_set.add("episode_max_length", 1000)
+        hyperparameter_set.add("environment_fusion", True)
         return hyperparameter_set
 
     def on_create_environment(self) -> EnvironmentBase:
-        return EnvironmentTransformPyTorchTransforms(
-            EnvironmentTransformCopyNDArray(
+        # Frames stay uint8 from the emulator to the replay buffer; the
+        # network scales them itself.
+        return EnvironmentTransformResize(
+            EnvironmentTransformGrayscale(
                 EnvironmentTransformSkipFrames(
                     EnvironmentGymWrapper(
                         JoypadSpace(
@@ -60,20 +70,13 @@ class RunnerRLFactoryDQNSuperMarioBrosV0(RunnerRLFactoryBase):
                     skip_count = 4
                 )
             ),
-            T.Tensor,
-            Shape((1, 84, 89)),
-            int,
-            transforms.ToPILImage(),
-            transforms.Resize(84),
-            transforms.Grayscale(),
-            transforms.ToTensor()#,
-            # transforms.Lambda(
-            #     lambda x: x / 255.
-            # )
+            height = 84,
+            width = 89
         )
-    
-    def _create_network(self, environment: EnvironmentBase, hyperparameter_set: HyperparameterSet) -> OptimizedSequential:
+
+    def _create_network(self, environment: Union[EnvironmentBase, EnvironmentVectorBase], hyperparameter_set: HyperparameterSet) -> OptimizedSequential:
         return OptimizedSequential(
+            Scale(1. / 255.),
             # CNNCell(
             #     in_channels = 1,
             #     out_channels = 8,
@@ -152,7 +155,22 @@ class RunnerRLFactoryDQNSuperMarioBrosV0(RunnerRLFactoryBase):
             learning_rate = hyperparameter_set["learning_rate"]
         )
 
-    def on_create_agent(self, environment: EnvironmentBase, hyperparameter_set: HyperparameterSet) -> AgentBase:
+    def _create_memory_buffer(self, hyperparameter_set: HyperparameterSet) -> Optional[MemoryReplayBuffer]:
+        if not hyperparameter_set["memory_mapped"]:
+            return None
+
+        if "memory_prioritized" in hyperparameter_set and hyperparameter_set["memory_prioritized"]:
+            raise Exception("memory_mapped cannot be combined with memory_prioritized")
+
+        if "memory_frame_stacking" in hyperparameter_set and hyperparameter_set["memory_frame_stacking"] > 1:
+            raise Exception("memory_mapped cannot be combined with memory_frame_stacking")
+
+        if hyperparameter_set["memory_frame_deduplication"]:
+            return MemoryMappedFrameReplayBuffer(hyperparameter_set["memory_capacity"], quantization_scale = 1.)
+        else:
+            return MemoryMappedReplayBuffer(hyperparameter_set["memory_capacity"], quantization_scale = 1.)
+
+    def on_create_agent(self, environment: Union[EnvironmentBase, EnvironmentVectorBase], hyperparameter_set: HyperparameterSet) -> AgentBase:
         return AgentDQN(
             policy_network = self._create_network(environment, hyperparameter_set),
             target_network = self._create_network(environment, hyperparameter_set),
@@ -161,5 +179,6 @@ class RunnerRLFactoryDQNSuperMarioBrosV0(RunnerRLFactoryBase):
                 end = hyperparameter_set["epsilon_end"],
                 decay = hyperparameter_set["epsilon_decay"]
             ),
-            hyperparameter_set = hyperparameter_set
+            hyperparameter_set = hyperparameter_set,
+            memory_buffer = self._create_memory_buffer(hyperparameter_set)
         )
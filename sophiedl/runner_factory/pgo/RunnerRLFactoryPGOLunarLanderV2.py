@@ -16,6 +16,7 @@ from ...agent.AgentBase import AgentBase
 from ...agent.AgentPGO import AgentPGO
 from ...environment.EnvironmentBase import EnvironmentBase
 from ...environment.EnvironmentGymWrapper import EnvironmentGymWrapper
+from ...environment.EnvironmentVectorBase import EnvironmentVectorBase
 from ...hyperparameters.HyperparameterSet import HyperparameterSet
 from ...network.OptimizedSequential import OptimizedSequential
 from ..base.RunnerRLFactoryBase import RunnerRLFactoryBase
@@ -24,6 +25,7 @@ class RunnerRLFactoryPGOLunarLanderV2(RunnerRLFactoryBase):
     def on_create_default_hyperparameter_set(self) -> HyperparameterSet:
         hyperparameter_set = HyperparameterSet()
         hyperparameter_set.add("gamma", 0.99)
+        hyperparameter_set.add("recompute_log_probabilities", True)
         hyperparameter_set.add("learning_rate", 0.001)
         hyperparameter_set.add("episode_count", 2500)
         return hyperparameter_set
@@ -35,7 +37,7 @@ class RunnerRLFactoryPGOLunarLanderV2(RunnerRLFactoryBase):
             int
         )
     
-    def on_create_agent(self, environment: EnvironmentBase, hyperparameter_set: HyperparameterSet) -> AgentBase:
+    def on_create_agent(self, environment: Union[EnvironmentBase, EnvironmentVectorBase], hyperparameter_set: HyperparameterSet) -> AgentBase:
         return AgentPGO(
             policy_network = OptimizedSequential(
                 nn.Linear(
@@ -0,0 +1,239 @@
+# Standard library
+from collections import namedtuple
+from multiprocessing.connection import Connection
+import copy
+import multiprocessing
+
+# Typing
+from typing import Any, Callable, List, Optional
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+
+# Internal
+from ..agent.AgentBase import AgentBase
+from ..environment.EnvironmentBase import EnvironmentBase
+from ..memory.MemoryBuffer import MemoryBuffer
+from ..network.SharedParameters import SharedParameters
+from .RunnerRLContext import RunnerRLContext
+
+RolloutTrajectories = namedtuple(
+    "RolloutTrajectories",
+    [
+        "observations_current",
+        "actions",
+        "action_samples",
+        "rewards",
+        "observations_next",
+        "dones",
+        "environment_indices",
+        "episode_lengths",
+        "truncations"
+    ]
+)
+
+def _stack_episode(memory_buffer: MemoryBuffer) -> Any:
+    memories = memory_buffer.memories
+
+    return (
+        np.stack([np.asarray(i.observation_current) for i in memories]),
+        np.stack([np.asarray(i.action) for i in memories]),
+        np.stack([np.asarray(i.action_sample) for i in memories]) if memories[0].action_sample is not None else None,
+        np.asarray([0. if i.reward is None else i.reward for i in memories], dtype = np.float32),
+        np.stack([np.asarray(i.observation_next) for i in memories]),
+        np.asarray([i.done for i in memories], dtype = np.bool_),
+        np.asarray([i.truncated for i in memories], dtype = np.bool_)
+    )
+
+def _run_worker(
+    connection: Connection,
+    environment_factory: Callable[[], EnvironmentBase],
+    agent: AgentBase,
+    shared_parameters: List[SharedParameters],
+    episode_max_length: Optional[int]) -> None:
+    try:
+        T.set_num_threads(1)
+
+        environment = environment_factory()
+        runner_context = RunnerRLContext(environment, None)
+
+        # The worker's agent only acts, its memory collects one episode at a
+        # time.
+        agent.memory_buffer = MemoryBuffer()
+
+        connection.send((True, None))
+
+        while True:
+            command, payload = connection.recv()
+
+            if command == "collect":
+                for network, parameters in zip(agent.acting_networks, shared_parameters):
+                    parameters.load(network)
+
+                episodes = []
+
+                for _ in range(payload):
+                    runner_context.reset_episode()
+                    observation = environment.reset()
+                    done = False
+                    truncated = False
+
+                    while not done and not truncated:
+                        with T.no_grad(): # type: ignore
+                            action = agent.act(runner_context, observation)
+
+                        observation, reward, done, _ = environment.step(action)
+
+                        runner_context.step_index_episode += 1
+                        runner_context.step_index_total += 1
+
+                        # Episodes cut off at the maximum length still bootstrap
+                        # from the last observation, and are cut at the same
+                        # length as in RunnerRL.
+                        truncated = not done and episode_max_length is not None and runner_context.step_index_episode > episode_max_length
+
+                        agent.reward(reward, observation, done, truncated = truncated)
+
+                    episodes.append(_stack_episode(agent.memory_buffer))
+                    agent.clear_memory()
+
+                connection.send((True, episodes))
+            elif command == "close":
+                break
+            else:
+                raise Exception("unknown command: {0}".format(command))
+    except Exception as e:
+        connection.send((False, e))
+    finally:
+        connection.close()
+
+class RolloutPool(object):
+    agent: AgentBase
+    worker_count: int
+    _shared_parameters: List[SharedParameters]
+    _connections: List[Connection]
+    _processes: List[Any]
+
+    def __init__(
+        self,
+        environment_factory: Callable[[], EnvironmentBase],
+        agent: AgentBase,
+        worker_count: int,
+        episode_max_length: Optional[int] = None,
+        start_method: Optional[str] = None) -> None:
+        assert worker_count > 0
+
+        if len(agent.acting_networks) == 0:
+            raise Exception("{0} does not name the networks it acts with".format(type(agent).__name__))
+
+        # Every worker process runs its own environment and a copy of the
+        # agent on the CPU, whose acting networks follow the agent's through
+        # shared memory.
+        self.agent = agent
+        self.worker_count = worker_count
+        self._shared_parameters = [network.share_parameters() for network in agent.acting_networks]
+        self._connections = []
+        self._processes = []
+
+        worker_agent = copy.deepcopy(agent)
+
+        # Log probabilities cannot leave a worker together with their graph,
+        # so the learner recomputes them from the recorded actions.
+        if "recompute_log_probabilities" in worker_agent.hyperparameter_set:
+            worker_agent.hyperparameter_set["recompute_log_probabilities"] = True
+        else:
+            worker_agent.hyperparameter_set.add("recompute_log_probabilities", True)
+
+        for network in worker_agent.acting_networks:
+            network.cpu()
+            network.device = T.device("cpu")
+
+        context: Any = multiprocessing.get_context(start_method)
+
+        for i in range(worker_count):
+            connection, worker_connection = context.Pipe()
+
+            process = context.Process(
+                target = _run_worker,
+                args = (worker_connection, environment_factory, worker_agent, self._shared_parameters, episode_max_length),
+                daemon = True
+            )
+            process.start()
+            worker_connection.close()
+
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        for connection in self._connections:
+            self._receive(connection)
+
+    @staticmethod
+    def _receive(connection: Connection) -> Any:
+        success, payload = connection.recv()
+
+        if not success:
+            raise payload
+
+        return payload
+
+    def collect(self, episode_count: int) -> RolloutTrajectories:
+        assert episode_count > 0
+
+        for network, parameters in zip(self.agent.acting_networks, self._shared_parameters):
+            parameters.publish(network)
+
+        # Episodes are split evenly between the workers and come back in order,
+        # each one numbered as its own environment index.
+        counts = [episode_count // self.worker_count + (1 if i < episode_count % self.worker_count else 0) for i in range(self.worker_count)]
+
+        for connection, count in zip(self._connections, counts):
+            if count > 0:
+                connection.send(("collect", count))
+
+        episodes = []
+
+        for connection, count in zip(self._connections, counts):
+            if count > 0:
+                episodes.extend(self._receive(connection))
+
+        def concatenate(column: int) -> Optional[T.Tensor]:
+            if episodes[0][column] is None:
+                return None
+
+            return T.from_numpy(np.concatenate([i[column] for i in episodes]))
+
+        episode_lengths = T.as_tensor([i[0].shape[0] for i in episodes], dtype = T.int64)
+
+        return RolloutTrajectories(
+            concatenate(0),
+            concatenate(1),
+            concatenate(2),
+            concatenate(3),
+            concatenate(4),
+            concatenate(5),
+            T.repeat_interleave(T.arange(len(episodes)), episode_lengths),
+            episode_lengths,
+            concatenate(6)
+        )
+
+    def close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self._processes:
+            process.join(timeout = 5)
+
+            if process.is_alive():
+                process.terminate()
+
+        for connection in self._connections:
+            connection.close()
+
+        self._connections = []
+        self._processes = []
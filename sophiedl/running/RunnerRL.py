@@ -1,5 +1,5 @@
 # Typing
-from typing import List, Optional, Union
+from typing import cast, List, Optional, Union
 
 # Torch
 import torch as T
@@ -11,19 +11,20 @@ import tqdm # type: ignore
 # Internal
 from ..agent.AgentBase import AgentBase
 from ..environment.EnvironmentBase import EnvironmentBase
+from ..environment.EnvironmentVectorBase import EnvironmentVectorBase
 from ..hyperparameters.HyperparameterSet import HyperparameterSet
 from .RunnerBase import RunnerBase
 from .RunnerRLContext import RunnerRLContext
 
 class RunnerRL(RunnerBase):
-    environment: EnvironmentBase
+    environment: Union[EnvironmentBase, EnvironmentVectorBase]
     agent: AgentBase
     hyperparameter_set: HyperparameterSet
     context: Optional[RunnerRLContext]
 
     def __init__(
         self,
-        environment: EnvironmentBase,
+        environment: Union[EnvironmentBase, EnvironmentVectorBase],
         agent: AgentBase,
         hyperparameter_set: HyperparameterSet,
         tensorboard_output_dir: Optional[str] = None,
@@ -43,15 +44,33 @@ class RunnerRL(RunnerBase):
         assert self.context is not None
         self.context.reset_episode()
 
+        environment = cast(EnvironmentBase, self.environment)
+
+        episode_max_length = self.hyperparameter_set["episode_max_length"] if "episode_max_length" in self.hyperparameter_set else None
+
+        # Observations are handed back to the environment once the agent has
+        # copied them, so that it can reuse their buffers.
+        release = self.agent.memory_buffer.copies_observations
+
         done = False
-        observation = self.environment.reset()
+        observation = environment.reset()
 
         while not done:
             action = self.agent.act(self.context, observation)
             
-            observation, reward, done, _ = self.environment.step(action)
+            observation_current = observation
+            observation, reward, done, _ = environment.step(action)
+
+            # The agent is told when the episode is about to be cut off, so
+            # it can end its returns there without treating it as done. As
+            # always, episodes are cut once they are longer than
+            # episode_max_length, after episode_max_length + 1 steps.
+            truncated = not done and episode_max_length is not None and self.context.step_index_episode + 1 > episode_max_length
             
-            self.agent.reward(reward, observation, done)
+            self.agent.reward(reward, observation, done, truncated = truncated)
+
+            if release:
+                environment.release(observation_current)
             
             self.context.done = done
             self.context.reward_sum += reward
@@ -61,25 +80,132 @@ class RunnerRL(RunnerBase):
             self.context.step_index_episode += 1
             self.context.step_index_total += 1
 
-            if "episode_max_length" in self.hyperparameter_set and self.context.step_index_episode > self.hyperparameter_set["episode_max_length"]:
+            if truncated:
                 break
 
+        if release:
+            environment.release(observation)
+
         self.context.add_scalar("Reward Sum", self.context.reward_sum, self.context.episode_index)
         self.context.add_scalar("Episode Length", self.context.step_index_episode, self.context.episode_index)
 
+    def _run_vector(self, t: tqdm.tqdm, reward_sum_history: List[float]) -> None:
+        assert self.context is not None
+        self.context.reset_episode()
+
+        environment = cast(EnvironmentVectorBase, self.environment)
+        environment_count = environment.environment_count
+
+        # With a batch size below the environment count the environments are
+        # stepped asynchronously: the agent acts on whichever batch finished
+        # stepping first while the others keep running.
+        batch_size = self.hyperparameter_set["environment_batch_size"] if "environment_batch_size" in self.hyperparameter_set else environment_count
+        asynchronous = batch_size < environment_count
+        episode_max_length = self.hyperparameter_set["episode_max_length"] if "episode_max_length" in self.hyperparameter_set else None
+
+        reward_sums = [0.] * environment_count
+        episode_lengths = [0] * environment_count
+
+        environment_indices = T.arange(environment_count)
+        observations = environment.reset()
+
+        while self.context.episode_index < self.hyperparameter_set["episode_count"]:
+            actions = self.agent.act_batch(self.context, observations, environment_indices)
+
+            # Finished environments are reset by the vector environment, so
+            # the observations returned for them already start a new episode.
+            if asynchronous:
+                environment.send(actions, environment_indices)
+                environment_indices, observations, rewards, dones, _ = environment.recv(batch_size)
+            else:
+                observations, rewards, dones, _ = environment.step(actions)
+
+            truncations = T.as_tensor(
+                [
+                    not bool(dones[position].item()) and episode_max_length is not None and episode_lengths[i] + 1 > episode_max_length
+                    for position, i in enumerate(environment_indices.tolist())
+                ],
+                dtype = T.bool
+            )
+
+            self.agent.reward_batch(rewards, observations, dones, environment_indices, truncations = truncations)
+
+            self.context.done = bool(dones.any().item())
+
+            # The step counters already include this step, since with several
+            # environments an episode can finish on every step.
+            self.context.step_index_episode += environment_indices.shape[0]
+            self.context.step_index_total += environment_indices.shape[0]
+
+            self.agent.learn(self.context)
+
+            truncated_positions: List[int] = []
+
+            for position, i in enumerate(environment_indices.tolist()):
+                reward_sums[i] += rewards[position].item()
+                episode_lengths[i] += 1
+
+                done = bool(dones[position].item())
+                truncated = bool(truncations[position].item())
+
+                if not done and not truncated:
+                    continue
+
+                if truncated:
+                    truncated_positions.append(position)
+
+                if self.context.episode_index < self.hyperparameter_set["episode_count"]:
+                    self.context.reward_sum = reward_sums[i]
+
+                    self.context.add_scalar("Reward Sum", reward_sums[i], self.context.episode_index)
+                    self.context.add_scalar("Episode Length", episode_lengths[i], self.context.episode_index)
+
+                    self._finish_episode(t, reward_sum_history)
+
+                reward_sums[i] = 0.
+                episode_lengths[i] = 0
+                self.context.step_index_episode = 0
+
+            if len(truncated_positions) > 0:
+                truncated_indices = environment_indices[truncated_positions]
+                observations = observations.clone()
+                observations[truncated_positions] = environment.reset(truncated_indices)[truncated_indices]
+
+        if asynchronous:
+            environment.recv(environment_count - batch_size)
+
+    def _finish_episode(self, t: tqdm.tqdm, reward_sum_history: List[float]) -> None:
+        assert self.context is not None
+
+        self.context.episode_index += 1
+        t.postfix[0] = self.context.reward_sum
+        t.postfix[2] = sum(reward_sum_history) / len(reward_sum_history) if len(reward_sum_history) > 0 else 0
+        t.postfix[3] = self.context.episode_index
+        reward_sum_history.append(self.context.reward_sum)
+        while len(reward_sum_history) > self.moving_average_window:
+            del reward_sum_history[0]
+        t.update()
+
+    def _run(self, t: tqdm.tqdm, reward_sum_history: List[float]) -> None:
+        if isinstance(self.environment, EnvironmentVectorBase):
+            self._run_vector(t, reward_sum_history)
+        else:
+            for _ in range(self.hyperparameter_set["episode_count"]):
+                self._run_episode()
+                self._finish_episode(t, reward_sum_history)
+
     def on_run(self, tensorboard_summary_writer: Optional[SummaryWriter]) -> None:
         self.context = RunnerRLContext(self.environment, tensorboard_summary_writer)
 
         reward_sum_history: List[float] = []
 
         with tqdm.tqdm(total = self.hyperparameter_set["episode_count"], bar_format="{percentage:.1f}% {bar} Reward sum: {postfix[0]:8.3f}, moving average ({postfix[1]}): {postfix[2]:8.3f}, elapsed: {postfix[3]}/{postfix[4]}", postfix = [0, self.moving_average_window, 0, 0, self.hyperparameter_set["episode_count"]]) as t:
-            for _ in range(self.hyperparameter_set["episode_count"]):
-                self._run_episode()
-                self.context.episode_index += 1
-                t.postfix[0] = self.context.reward_sum
-                t.postfix[2] = sum(reward_sum_history) / len(reward_sum_history) if len(reward_sum_history) > 0 else 0
-                t.postfix[3] = self.context.episode_index
-                reward_sum_history.append(self.context.reward_sum)
-                while len(reward_sum_history) > self.moving_average_window:
-                    del reward_sum_history[0]
-                t.update()
+            try:
+                self._run(t, reward_sum_history)
+            finally:
+                # Environments may hold files, threads or processes, such as
+                # a trace being recorded.
+                try:
+                    self.agent.close()
+                finally:
+                    self.environment.close()
@@ -8,10 +8,11 @@ from torch.utils.tensorboard import SummaryWriter
 # Internal
 from ..domain.Repr import Repr
 from ..environment.EnvironmentBase import EnvironmentBase
+from ..environment.EnvironmentVectorBase import EnvironmentVectorBase
 from .RunnerContextBase import RunnerContextBase
 
 class RunnerRLContext(RunnerContextBase, Repr):
-    environment: EnvironmentBase
+    environment: Union[EnvironmentBase, EnvironmentVectorBase]
     tensorboard_summary_writer: Optional[SummaryWriter]
     episode_index: int
     step_index_episode: int
@@ -19,7 +20,7 @@ class RunnerRLContext(RunnerContextBase, Repr):
     reward_sum: float
     done: bool
 
-    def __init__(self, environment: EnvironmentBase, tensorboard_summary_writer: Optional[SummaryWriter]) -> None:
+    def __init__(self, environment: Union[EnvironmentBase, EnvironmentVectorBase], tensorboard_summary_writer: Optional[SummaryWriter]) -> None:
         self.environment = environment
         self.tensorboard_summary_writer = tensorboard_summary_writer
         self.episode_index = 0
@@ -0,0 +1,276 @@
+# Standard library
+import copy
+import multiprocessing
+import queue
+import random
+
+# Typing
+from typing import Any, Callable, List, Optional
+
+# NumPy
+import numpy as np # type: ignore
+
+# PyTorch
+import torch as T
+import torch.nn as nn
+
+# TQDM
+import tqdm # type: ignore
+
+# Internal
+from ..agent.AgentDQN import AgentDQN
+from ..domain.FrameStack import FrameStack
+from ..environment.EnvironmentBase import EnvironmentBase
+from ..hyperparameters.HyperparameterSet import HyperparameterSet
+from ..network.SharedParameters import SharedParameters
+from .RunnerRL import RunnerRL
+
+def _run_actor(
+    actor_index: int,
+    environment_factory: Callable[[], EnvironmentBase],
+    network: nn.Module,
+    epsilon: float,
+    transition_queue: Any,
+    shared_parameters: SharedParameters,
+    stopping: Any,
+    transition_batch_size: int,
+    weight_sync_interval: int,
+    episode_max_length: Optional[int]) -> None:
+    # Actors only do inference, more threads per actor would compete with the
+    # other actors for the same cores.
+    T.set_num_threads(1)
+
+    environment = environment_factory()
+    action_count = environment.action_space_shape.flat_size
+
+    network.eval()
+
+    transitions: List[Any] = []
+    episodes: List[Any] = []
+    reward_sum = 0.
+    episode_length = 0
+    step_index = 0
+
+    observation = environment.reset()
+
+    while not stopping.is_set():
+        if random.random() < epsilon:
+            action = random.randrange(action_count)
+        else:
+            with T.no_grad(): # type: ignore
+                action = network(T.as_tensor(FrameStack.materialize(observation), dtype = T.float32).unsqueeze(dim = 0)).argmax().item()
+
+        observation_next, reward, done, _ = environment.step(action)
+
+        transitions.append((np.asarray(observation), action, reward, np.asarray(observation_next), done))
+        reward_sum += reward
+        episode_length += 1
+        step_index += 1
+
+        # Episodes are cut at the same length as in RunnerRL.
+        if done or (episode_max_length is not None and episode_length > episode_max_length):
+            episodes.append((reward_sum, episode_length))
+            reward_sum = 0.
+            episode_length = 0
+            observation = environment.reset()
+        else:
+            observation = observation_next
+
+        # Transitions go out in batches of plain arrays, which pickle far
+        # cheaper than one message per step.
+        if len(transitions) >= transition_batch_size:
+            transition_queue.put((
+                actor_index,
+                np.stack([i[0] for i in transitions]),
+                np.asarray([i[1] for i in transitions], dtype = np.int64),
+                np.asarray([i[2] for i in transitions], dtype = np.float32),
+                np.stack([i[3] for i in transitions]),
+                np.asarray([i[4] for i in transitions], dtype = np.bool_),
+                episodes
+            ))
+
+            transitions = []
+            episodes = []
+
+        # Checking for new weights only reads the version, they are copied
+        # straight out of shared memory when it changed.
+        if step_index % weight_sync_interval == 0:
+            shared_parameters.load(network)
+
+    environment.close()
+
+class RunnerRLDistributed(RunnerRL):
+    environment_factory: Optional[Callable[[], EnvironmentBase]]
+    actor_count: int
+    actor_epsilons: List[float]
+    learn_step_count: int
+    _processes: List[Any]
+    _shared_parameters: Optional[SharedParameters]
+
+    def __init__(
+        self,
+        environment: EnvironmentBase,
+        environment_factory: Callable[[], EnvironmentBase],
+        agent: AgentDQN,
+        hyperparameter_set: HyperparameterSet,
+        actor_count: int,
+        tensorboard_output_dir: Optional[str] = None,
+        clear_tensorboard_output_dir: bool = True,
+        moving_average_window: int = 30) -> None:
+        super().__init__(
+            environment,
+            agent,
+            hyperparameter_set,
+            tensorboard_output_dir = tensorboard_output_dir,
+            clear_tensorboard_output_dir = clear_tensorboard_output_dir,
+            moving_average_window = moving_average_window
+        )
+
+        assert actor_count > 0
+
+        # The learner runs in this process and owns the agent with its replay
+        # buffer. Every actor process runs its own environment made by the
+        # factory and a copy of the policy network, exploring with its own
+        # epsilon as in Ape-X: epsilon ** (1 + alpha * i / (n - 1)).
+        self.environment_factory = environment_factory
+        self.actor_count = actor_count
+
+        epsilon = hyperparameter_set["distributed_epsilon"] if "distributed_epsilon" in hyperparameter_set else 0.4
+        alpha = hyperparameter_set["distributed_epsilon_alpha"] if "distributed_epsilon_alpha" in hyperparameter_set else 7.
+
+        self.actor_epsilons = [
+            epsilon ** (1 + alpha * i / (actor_count - 1)) if actor_count > 1 else epsilon
+            for i in range(actor_count)
+        ]
+        self.learn_step_count = 0
+        self._processes = []
+        self._shared_parameters = None
+
+    def _start_actors(self, context: Any, transition_queue: Any, stopping: Any) -> None:
+        agent = self.agent
+        assert isinstance(agent, AgentDQN)
+        assert self.environment_factory is not None
+
+        network = copy.deepcopy(agent.policy_network).cpu()
+        self._shared_parameters = agent.policy_network.share_parameters()
+
+        for i in range(self.actor_count):
+            process = context.Process(
+                target = _run_actor,
+                args = (
+                    i,
+                    self.environment_factory,
+                    network,
+                    self.actor_epsilons[i],
+                    transition_queue,
+                    self._shared_parameters,
+                    stopping,
+                    self.hyperparameter_set["distributed_transition_batch_size"] if "distributed_transition_batch_size" in self.hyperparameter_set else 32,
+                    self.hyperparameter_set["distributed_weight_sync_interval"] if "distributed_weight_sync_interval" in self.hyperparameter_set else 100,
+                    self.hyperparameter_set["episode_max_length"] if "episode_max_length" in self.hyperparameter_set else None
+                ),
+                daemon = True
+            )
+            process.start()
+
+            self._processes.append(process)
+
+    def _stop_actors(self, transition_queue: Any, stopping: Any) -> None:
+        stopping.set()
+
+        # Actors blocked on a full queue need it drained before they can see
+        # the stop event.
+        for process in self._processes:
+            while process.is_alive():
+                try:
+                    transition_queue.get(timeout = 0.1)
+                except queue.Empty:
+                    pass
+
+                process.join(timeout = 0.1)
+
+        self._processes = []
+        self._shared_parameters = None
+
+    def _receive_transitions(self, transition_batch: Any, t: tqdm.tqdm, reward_sum_history: List[float]) -> None:
+        assert self.context is not None
+
+        agent = self.agent
+        assert isinstance(agent, AgentDQN)
+
+        actor_index, observations_current, actions, rewards, observations_next, dones, episodes = transition_batch
+
+        agent.memory_buffer.push_transitions(
+            T.from_numpy(observations_current),
+            T.from_numpy(actions),
+            T.from_numpy(rewards),
+            T.from_numpy(observations_next),
+            T.from_numpy(dones),
+            environment_indices = T.full((actions.shape[0],), actor_index, dtype = T.int64)
+        )
+
+        self.context.step_index_total += actions.shape[0]
+
+        for reward_sum, episode_length in episodes:
+            if self.context.episode_index >= self.hyperparameter_set["episode_count"]:
+                break
+
+            self.context.reward_sum = reward_sum
+
+            self.context.add_scalar("Reward Sum", reward_sum, self.context.episode_index)
+            self.context.add_scalar("Episode Length", episode_length, self.context.episode_index)
+
+            self._finish_episode(t, reward_sum_history)
+
+            if self.context.episode_index % self.hyperparameter_set["target_update_interval"] == 0:
+                agent.update_target_network()
+
+    def _run(self, t: tqdm.tqdm, reward_sum_history: List[float]) -> None:
+        assert self.context is not None
+
+        agent = self.agent
+        assert isinstance(agent, AgentDQN)
+
+        context: Any = multiprocessing.get_context(
+            self.hyperparameter_set["distributed_start_method"] if "distributed_start_method" in self.hyperparameter_set else None
+        )
+
+        transition_queue = context.Queue(
+            maxsize = self.hyperparameter_set["distributed_queue_size"] if "distributed_queue_size" in self.hyperparameter_set else 4 * self.actor_count
+        )
+        stopping = context.Event()
+
+        publish_interval = self.hyperparameter_set["distributed_publish_interval"] if "distributed_publish_interval" in self.hyperparameter_set else 100
+        batch_size = self.hyperparameter_set["memory_batch_size"]
+
+        self._start_actors(context, transition_queue, stopping)
+
+        try:
+            while self.context.episode_index < self.hyperparameter_set["episode_count"]:
+                # The learner takes in up to one batch per actor between
+                # gradient steps, and only waits for the actors while there is
+                # nothing to learn from.
+                for i in range(self.actor_count):
+                    try:
+                        if i == 0 and len(agent.memory_buffer) < batch_size:
+                            transition_batch = transition_queue.get(timeout = 1.)
+                        else:
+                            transition_batch = transition_queue.get_nowait()
+                    except queue.Empty:
+                        for process in self._processes:
+                            if not process.is_alive():
+                                raise Exception("actor process exited with code {0}".format(process.exitcode))
+
+                        break
+
+                    self._receive_transitions(transition_batch, t, reward_sum_history)
+
+                if len(agent.memory_buffer) >= batch_size:
+                    agent.optimize(self.context)
+                    self.learn_step_count += 1
+
+                    if self.learn_step_count % publish_interval == 0:
+                        assert self._shared_parameters is not None
+                        self._shared_parameters.publish(agent.policy_network)
+        finally:
+            self._stop_actors(transition_queue, stopping)
@@ -0,0 +1,97 @@
+# Standard library
+import os
+
+# Typing
+from typing import Callable, List, Optional
+
+# TQDM
+import tqdm # type: ignore
+
+# Internal
+from ..agent.AgentBase import AgentBase
+from ..environment.EnvironmentBase import EnvironmentBase
+from ..hyperparameters.HyperparameterSet import HyperparameterSet
+from .RolloutPool import RolloutPool
+from .RunnerRL import RunnerRL
+
+class RunnerRLRolloutPool(RunnerRL):
+    environment_factory: Optional[Callable[[], EnvironmentBase]]
+    rollout_episode_count: int
+    worker_count: int
+
+    def __init__(
+        self,
+        environment: EnvironmentBase,
+        environment_factory: Callable[[], EnvironmentBase],
+        agent: AgentBase,
+        hyperparameter_set: HyperparameterSet,
+        rollout_episode_count: int,
+        worker_count: Optional[int] = None,
+        tensorboard_output_dir: Optional[str] = None,
+        clear_tensorboard_output_dir: bool = True,
+        moving_average_window: int = 30) -> None:
+        super().__init__(
+            environment,
+            agent,
+            hyperparameter_set,
+            tensorboard_output_dir = tensorboard_output_dir,
+            clear_tensorboard_output_dir = clear_tensorboard_output_dir,
+            moving_average_window = moving_average_window
+        )
+
+        assert rollout_episode_count > 0
+
+        # Every update learns from rollout_episode_count episodes, which are
+        # collected in parallel by the workers with the current policy.
+        self.environment_factory = environment_factory
+        self.rollout_episode_count = rollout_episode_count
+        self.worker_count = worker_count if worker_count is not None else min(rollout_episode_count, os.cpu_count() or 1)
+
+    def _run(self, t: tqdm.tqdm, reward_sum_history: List[float]) -> None:
+        assert self.context is not None
+        assert self.environment_factory is not None
+
+        pool = RolloutPool(
+            self.environment_factory,
+            self.agent,
+            self.worker_count,
+            episode_max_length = self.hyperparameter_set["episode_max_length"] if "episode_max_length" in self.hyperparameter_set else None,
+            start_method = self.hyperparameter_set["rollout_pool_start_method"] if "rollout_pool_start_method" in self.hyperparameter_set else None
+        )
+
+        try:
+            while self.context.episode_index < self.hyperparameter_set["episode_count"]:
+                trajectories = pool.collect(self.rollout_episode_count)
+
+                self.agent.clear_memory()
+                self.agent.memory_buffer.push_transitions(
+                    trajectories.observations_current,
+                    trajectories.actions,
+                    trajectories.rewards,
+                    trajectories.observations_next,
+                    trajectories.dones,
+                    action_samples = trajectories.action_samples,
+                    environment_indices = trajectories.environment_indices,
+                    truncations = trajectories.truncations
+                )
+
+                self.context.reset_episode()
+                self.context.done = True
+                self.context.step_index_total += trajectories.rewards.shape[0]
+
+                self.agent.learn(self.context)
+
+                for rewards, episode_length in zip(
+                    trajectories.rewards.split(trajectories.episode_lengths.tolist()),
+                    trajectories.episode_lengths.tolist()):
+                    if self.context.episode_index >= self.hyperparameter_set["episode_count"]:
+                        break
+
+                    self.context.reward_sum = float(rewards.sum().item())
+
+                    self.context.add_scalar("Reward Sum", self.context.reward_sum, self.context.episode_index)
+                    self.context.add_scalar("Episode Length", episode_length, self.context.episode_index)
+
+                    self._finish_episode(t, reward_sum_history)
+        finally:
+            pool.close()
@@ -1,4 +1,5 @@
 # Standard library
+import functools
 import sys
 
 # SophieDL
@@ -46,6 +47,13 @@ if __name__ == "__main__":
         help = "Output directory for TensorBoard data."
     )
 
+    parser.add_argument(
+        "--serve-environment",
+        type = str,
+        action = "append",
+        help = "Serves the factory's environment at ADDRESS (host:port or unix:path) for runners using the environment_remote hyperparameter, instead of running."
+    )
+
     args = parser.parse_args()
 
     if args.list_factories:
@@ -81,6 +89,26 @@ if __name__ == "__main__":
                 if args.epoch_count and len(args.epoch_count) > 0:
                     hyperparameter_set["epoch_count"] = args.epoch_count[-1]
 
+                if args.serve_environment and len(args.serve_environment) > 0:
+                    if not isinstance(factory, S.RunnerRLFactoryBase):
+                        sys.stderr.write("error: factory {0} has no environment\n".format(repr(args.factory[0])))
+                        sys.exit(1)
+
+                    server = S.EnvironmentRemoteServer(
+                        functools.partial(factory.create_environment, hyperparameter_set),
+                        hyperparameter_set["environment_count"] if "environment_count" in hyperparameter_set else 1,
+                        args.serve_environment[-1]
+                    )
+
+                    print("Serving environment at {0}".format(server.address))
+
+                    try:
+                        server.serve_forever()
+                    finally:
+                        server.close()
+
+                    sys.exit(0)
+
                 factory.create_runner(
                     hyperparameter_set = hyperparameter_set,
                     tensorboard_output_dir = args.tensorboard_output_dir[-1] if args.tensorboard_output_dir and len(args.tensorboard_output_dir) > 0 else None
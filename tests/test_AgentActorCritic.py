@@ -0,0 +1,83 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import torch as T
+import torch.nn as nn
+import torch.optim as O
+
+import sophiedl as S
+
+def create_network(output_count):
+    return S.OptimizedSequential(
+        nn.Linear(4, output_count),
+        optimizer_factory = lambda parameters, learning_rate: O.SGD(parameters, lr = learning_rate),
+        learning_rate = 0.1
+    )
+
+def create_agent(agent_type):
+    T.manual_seed(0)
+
+    hyperparameter_set = S.HyperparameterSet()
+    hyperparameter_set.add("gamma", 0.9)
+    hyperparameter_set.add("recompute_log_probabilities", True)
+
+    return agent_type(create_network(2), create_network(1), hyperparameter_set)
+
+def push(agent, observation, action, reward, observation_next, done):
+    agent.memory_buffer.add_observation_current(observation)
+    agent.memory_buffer.add_action(action)
+
+    if isinstance(agent, S.AgentContinuousActorCritic):
+        agent.memory_buffer.add_action_sample(T.as_tensor([0.3]))
+
+    agent.memory_buffer.add_observation_next(observation_next)
+    agent.memory_buffer.add_reward(reward)
+    agent.memory_buffer.add_done(done)
+    agent.memory_buffer.push()
+
+class TestAgentActorCritic(object):
+    def _test_step_updates_do_not_scale_with_the_number_of_transitions(self, agent_type):
+        observation = T.as_tensor([0.1, -0.2, 0.3, 0.4])
+        observation_next = T.as_tensor([0.2, 0.1, -0.3, 0.5])
+
+        parameters = []
+
+        for count in [1, 4]:
+            agent = create_agent(agent_type)
+
+            for _ in range(count):
+                push(agent, observation, 1, 1., observation_next, False)
+
+            agent.learn(S.RunnerRLContext(None, None))
+
+            assert len(agent.memory_buffer) == 0
+
+            parameters.append([i.detach().clone() for i in agent.actor_network.parameters()] + [i.detach().clone() for i in agent.critic_network.parameters()])
+
+        for single, batched in zip(*parameters):
+            assert T.allclose(single, batched, atol = 1e-6)
+
+    def test_discrete_step_updates_do_not_scale_with_the_number_of_transitions(self):
+        self._test_step_updates_do_not_scale_with_the_number_of_transitions(S.AgentDiscreteActorCritic)
+
+    def test_continuous_step_updates_do_not_scale_with_the_number_of_transitions(self):
+        self._test_step_updates_do_not_scale_with_the_number_of_transitions(S.AgentContinuousActorCritic)
+
+    def test_batched_rollouts_keep_every_transition_until_the_update(self):
+        hyperparameter_set = S.HyperparameterSet()
+        hyperparameter_set.add("gamma", 0.9)
+        hyperparameter_set.add("rollout_length", 4)
+        hyperparameter_set.add("environment_count", 3)
+
+        agent = S.AgentDiscreteActorCritic(create_network(2), create_network(1), hyperparameter_set)
+        runner_context = S.RunnerRLContext(None, None)
+
+        # The second batch of three environments takes the rollout past its
+        # length, none of the six transitions may be evicted before learning.
+        for _ in range(2):
+            agent.act_batch(runner_context, T.randn(3, 4))
+            agent.reward_batch(T.ones(3), T.randn(3, 4), T.zeros(3, dtype = T.bool))
+
+        assert len(agent.memory_buffer) == 6
@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath("."))
+
+import pytest
+import torch as T
+
+import sophiedl as S
+
+def create_memory_buffer(**options):
+    hyperparameter_set = S.HyperparameterSet()
+    hyperparameter_set.add("memory_capacity", 16)
+
+    for key, value in options.items():
+        hyperparameter_set.add(key, value)
+
+    return S.AgentDQN._create_memory_buffer(hyperparameter_set)
+
+class TestAgentDQNMemoryBuffer(object):
+    def test_options_select_the_buffer(self):
+        assert type(create_memory_buffer()) is S.MemoryReplayBuffer
+        assert type(create_memory_buffer(memory_prioritized = True)) is S.MemoryPrioritizedReplayBuffer
+        assert type(create_memory_buffer(memory_frame_deduplication = True)) is S.MemoryFrameReplayBuffer
+        assert type(create_memory_buffer(memory_frame_stacking = 4)) is S.MemoryFrameStackReplayBuffer
+
+    def test_prioritization_combines_with_frame_storage(self):
+        memory_buffer = create_memory_buffer(memory_prioritized = True, memory_priority_alpha = 0.5, memory_frame_deduplication = True)
+
+        assert type(memory_buffer) is S.MemoryPrioritizedFrameReplayBuffer
+        assert memory_buffer.alpha == 0.5
+
+        memory_buffer = create_memory_buffer(memory_prioritized = True, memory_frame_stacking = 4, memory_frame_capacity = 64)
+
+        assert type(memory_buffer) is S.MemoryPrioritizedFrameStackReplayBuffer
+        assert memory_buffer.stack_count == 4
+        assert memory_buffer.frame_capacity == 64
+
+    def test_frame_deduplication_and_stacking_are_exclusive(self):
+        with pytest.raises(Exception):
+            create_memory_buffer(memory_frame_deduplication = True, memory_frame_stacking = 4)
+
+def create_runner(**hyperparameters):
+    runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+    hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+    hyperparameter_set["episode_count"] = 3
+    hyperparameter_set["memory_batch_size"] = 16
+
+    for key, value in hyperparameters.items():
+        hyperparameter_set.add(key, value)
+
+    return runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+
+class TestAgentDQNClose(object):
+    def test_closing_the_agent_closes_its_memory_buffer(self):
+        runner = create_runner()
+        runner.agent.memory_buffer = S.MemoryMappedReplayBuffer(64)
+
+        path = runner.agent.memory_buffer.path
+
+        runner.run()
+
+        assert not os.path.exists(path)
+
+class TestMemoryBufferThreadSafety(object):
+    def test_making_a_buffer_thread_safe_locks_it_once(self):
+        memory_buffer = S.MemoryReplayBuffer(16)
+        memory_buffer.make_thread_safe()
+        lock = memory_buffer.lock
+
+        memory_buffer.make_thread_safe()
+
+        assert memory_buffer.lock is lock
+
+        # The lock is reentrant, pushing may sample or evict under it.
+        with memory_buffer.lock:
+            with memory_buffer.lock:
+                pass
+
+    def test_pushing_while_sampling_from_another_thread(self):
+        memory_buffer = S.MemoryReplayBuffer(64)
+        memory_buffer.make_thread_safe()
+        memory_buffer.push_transitions(T.zeros(8, 2), T.zeros(8, dtype = T.int64), T.zeros(8), T.zeros(8, 2), T.zeros(8, dtype = T.bool))
+
+        errors = []
+        pushing = True
+
+        def sample():
+            try:
+                while pushing:
+                    memory_batch = memory_buffer.sample(8, T.device("cpu"))
+
+                    assert memory_batch.observations_current.shape == (8, 2)
+                    assert T.equal(memory_batch.observations_current[:, 0], memory_batch.rewards)
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target = sample)
+        thread.start()
+
+        for i in range(200):
+            values = T.full((4,), float(i))
+            memory_buffer.push_transitions(
+                T.stack([values, values], dim = 1),
+                T.zeros(4, dtype = T.int64),
+                values,
+                T.stack([values, values], dim = 1),
+                T.zeros(4, dtype = T.bool)
+            )
+
+        pushing = False
+        thread.join()
+
+        assert errors == []
+        assert len(memory_buffer) == 64
+
+class TestAgentDQNLearnerThread(object):
+    def test_learns_next_to_acting_and_stops_with_the_run(self):
+        runner = create_runner(learner_thread = True, learner_max_lag = 4)
+        runner.run()
+
+        agent = runner.agent
+
+        assert agent._learner is None
+        assert isinstance(agent.memory_buffer.lock, type(threading.RLock()))
+        assert agent._learn_step_budget > 0
+        assert agent._learn_step_budget - 4 <= agent.learn_step_count <= agent._learn_step_budget
+
+    def test_acting_waits_for_the_learner(self):
+        runner = create_runner(learner_thread = True, learner_max_lag = 0)
+
+        agent = runner.agent
+        learn = agent.learn
+        lags = []
+
+        def learn_measured(runner_context):
+            learn(runner_context)
+            lags.append(agent._learn_step_budget - agent.learn_step_count)
+
+        agent.learn = learn_measured
+        runner.run()
+
+        assert len(lags) > 0
+        assert max(lags) <= 0
+
+    def test_learner_errors_are_raised_on_the_acting_thread(self):
+        runner = create_runner(learner_thread = True, learner_max_lag = 0)
+
+        def optimize_failing(runner_context):
+            raise ValueError("optimizer failed")
+
+        runner.agent.optimize = optimize_failing
+
+        with pytest.raises(Exception, match = "learner thread failed"):
+            runner.run()
+
+        assert runner.agent._learner is None
@@ -0,0 +1,75 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import torch as T
+import torch.nn as nn
+
+import sophiedl as S
+
+def create_agent(recompute_log_probabilities):
+    T.manual_seed(0)
+
+    hyperparameter_set = S.HyperparameterSet()
+    hyperparameter_set.add("gamma", 0.9)
+    hyperparameter_set.add("recompute_log_probabilities", recompute_log_probabilities)
+
+    return S.AgentPGO(
+        S.OptimizedSequential(
+            nn.Linear(4, 3),
+            optimizer_factory = S.OptimizedSequential.optimizer_factory_adam,
+            learning_rate = 0.01
+        ),
+        hyperparameter_set
+    )
+
+def run_episode(agent, length = 6):
+    T.manual_seed(1)
+
+    runner_context = S.RunnerRLContext(None, None)
+
+    for i in range(length):
+        agent.act(runner_context, T.randn(4))
+        agent.reward(float(i), T.randn(4), i == length - 1)
+
+    return runner_context
+
+class TestAgentPGO(object):
+    def test_acting_without_log_probabilities_keeps_no_graph(self):
+        agent = create_agent(True)
+
+        run_episode(agent)
+
+        assert all(i.action_log_probabilities is None for i in agent.memory_buffer.memories)
+
+    def test_recomputed_log_probabilities_give_the_same_update(self):
+        agents = [create_agent(False), create_agent(True)]
+
+        for agent in agents:
+            runner_context = run_episode(agent)
+            runner_context.done = True
+
+            agent.learn(runner_context)
+
+            assert len(agent.memory_buffer) == 0
+
+        for stored, recomputed in zip(agents[0].policy_network.parameters(), agents[1].policy_network.parameters()):
+            assert T.allclose(stored, recomputed, atol = 1e-6)
+
+    def test_unfinished_episodes_of_other_environments_are_kept(self):
+        agent = create_agent(True)
+        runner_context = S.RunnerRLContext(None, None)
+
+        for i in range(3):
+            observations = T.randn(2, 4)
+
+            agent.act_batch(runner_context, observations)
+            agent.reward_batch(T.ones(2), T.randn(2, 4), T.as_tensor([False, i == 2]))
+
+        runner_context.done = True
+        agent.learn(runner_context)
+
+        # Environment 1 finished its episode and was learned from, the three
+        # steps of environment 0 wait for the end of theirs.
+        assert [i.environment_index for i in agent.memory_buffer.memories] == [0, 0, 0]
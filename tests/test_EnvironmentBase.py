@@ -0,0 +1,98 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentBroken(S.EnvironmentBase):
+    # Observations have the wrong shape from the given step on.
+    def __init__(self, broken_from = 0):
+        super().__init__(np.ndarray, int)
+
+        self.broken_from = broken_from
+        self.step_index = 0
+        self.shape_request_count = 0
+
+    def on_get_observation_space_shape(self):
+        self.shape_request_count += 1
+
+        return (2,)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def on_reset(self):
+        self.step_index = 0
+
+        return np.zeros(2)
+
+    def on_step(self, action):
+        self.step_index += 1
+
+        return EnvironmentStepResult(np.zeros(3 if self.step_index >= self.broken_from else 2), 0., False, {})
+
+class TestEnvironmentValidation(object):
+    def test_space_shapes_are_computed_once_and_interned(self):
+        environments = [EnvironmentBroken(), EnvironmentBroken()]
+
+        for _ in range(3):
+            shapes = [i.observation_space_shape for i in environments]
+
+        assert shapes[0] is shapes[1]
+        assert environments[0].shape_request_count == 1
+
+    def test_always_validates_every_step(self):
+        environment = EnvironmentBroken(broken_from = 3)
+        environment.reset()
+
+        for _ in range(2):
+            environment.step(0)
+
+        with pytest.raises(Exception):
+            environment.step(0)
+
+        with pytest.raises(TypeError):
+            environment.step(0.5)
+
+    def test_first_validates_the_first_calls_only(self):
+        environment = EnvironmentBroken(broken_from = 3)
+        environment.set_validation(S.EnvironmentBase.VALIDATION_FIRST, count = 3)
+
+        # The reset and two steps are validated, the broken third step is not.
+        environment.reset()
+
+        for _ in range(3):
+            environment.step(0)
+
+    def test_sampled_validates_every_interval(self):
+        environment = EnvironmentBroken(broken_from = 1)
+        environment.set_validation(S.EnvironmentBase.VALIDATION_SAMPLED, interval = 3)
+
+        environment.reset()
+        environment.step(0)
+        environment.step(0)
+
+        with pytest.raises(Exception):
+            environment.step(0)
+
+    def test_off_validates_nothing(self):
+        environment = EnvironmentBroken()
+        environment.set_validation(S.EnvironmentBase.VALIDATION_OFF)
+
+        environment.reset()
+
+        assert environment.step(0.5).observation.shape == (3,)
+
+    def test_unknown_policies_are_rejected(self):
+        environment = EnvironmentBroken()
+
+        with pytest.raises(Exception):
+            environment.set_validation("sometimes")
+
+        with pytest.raises(Exception):
+            environment.set_validation(S.EnvironmentBase.VALIDATION_SAMPLED, interval = 0)
@@ -0,0 +1,157 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentScreen(S.EnvironmentBase):
+    # Like an emulator, every observation is the same screen buffer, which
+    # shows the number of steps taken. Observations handed back are recorded.
+    def __init__(self, length = 100):
+        super().__init__(np.ndarray, int)
+
+        self.length = length
+        self.screen = np.zeros((2, 2, 3), dtype = np.uint8)
+        self.step_index = 0
+        self.released = []
+
+    def on_get_observation_space_shape(self):
+        return (2, 2, 3)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def on_reset(self):
+        self.step_index = 0
+        self.screen[...] = 0
+
+        return self.screen
+
+    def on_step(self, action):
+        self.step_index += 1
+        self.screen[...] = self.step_index
+
+        return EnvironmentStepResult(self.screen, 1., self.step_index >= self.length, {})
+
+    def on_skip(self, action):
+        self.step_index += 1
+
+        return EnvironmentStepResult(None, 1., self.step_index >= self.length, {})
+
+    def on_release(self, observation):
+        self.released.append(observation)
+
+class TestEnvironmentTransformCopyNDArray(object):
+    def test_observations_lent_out_are_never_reused(self):
+        environment = S.EnvironmentTransformCopyNDArray(EnvironmentScreen(), pool_size = 2)
+
+        observations = [environment.reset()] + [environment.step(0).observation for _ in range(4)]
+
+        # Once the pool is exhausted, fresh copies are made.
+        assert [int(i[0, 0, 0]) for i in observations] == [0, 1, 2, 3, 4]
+        assert len(set(id(i) for i in observations)) == 5
+        assert len(environment._pool) == 2
+
+    def test_released_arrays_are_reused(self):
+        environment = S.EnvironmentTransformCopyNDArray(EnvironmentScreen(), pool_size = 2)
+
+        observation = environment.reset()
+
+        for i in range(5):
+            observation_next = environment.step(0).observation
+            environment.release(observation)
+
+            assert int(observation_next[0, 0, 0]) == i + 1
+
+            observation = observation_next
+
+        assert len(environment._pool) == 2
+        assert any(i is observation for i in environment._pool)
+
+    def test_releasing_twice_lends_an_array_out_once(self):
+        environment = S.EnvironmentTransformCopyNDArray(EnvironmentScreen(), pool_size = 2)
+
+        observation = environment.reset()
+        environment.release(observation)
+        environment.release(observation)
+
+        assert environment.step(0).observation is observation
+        assert environment.step(0).observation is not observation
+
+    def test_arrays_the_pool_does_not_own_are_handed_down(self):
+        pre_environment = EnvironmentScreen()
+        environment = S.EnvironmentTransformCopyNDArray(pre_environment)
+
+        array = np.zeros(3)
+        environment.release(array)
+
+        assert pre_environment.released == [array]
+
+    def test_read_only_views_share_the_buffer(self):
+        pre_environment = EnvironmentScreen()
+        environment = S.EnvironmentTransformCopyNDArray(pre_environment, read_only_view = True)
+
+        observation = environment.reset()
+
+        assert np.shares_memory(observation, pre_environment.screen)
+        assert not observation.flags.writeable
+
+class TestObservationRelease(object):
+    def test_allocating_transforms_release_their_input_right_away(self):
+        copy_environment = S.EnvironmentTransformCopyNDArray(EnvironmentScreen(), pool_size = 1)
+        environment = S.EnvironmentTransformGrayscale(copy_environment)
+
+        observations = [environment.reset()] + [environment.step(0).observation for _ in range(3)]
+
+        assert [int(i[0, 0, 0]) for i in observations] == [0, 1, 2, 3]
+        assert len(copy_environment._pool) == 1
+        assert len(copy_environment._free) == 1
+
+    def test_fused_stacks_release_through_their_layers(self):
+        pre_environment = EnvironmentScreen()
+        environment = S.EnvironmentTransformFused(S.EnvironmentTransformCopyNDArray(pre_environment, pool_size = 1))
+
+        observation = environment.reset()
+        environment.release(observation)
+
+        assert environment.step(0).observation is observation
+        assert pre_environment.released[-1] is pre_environment.screen
+
+    def test_skipped_episode_ends_keep_the_last_observation(self):
+        copy_environment = S.EnvironmentTransformCopyNDArray(EnvironmentScreen(length = 6), pool_size = 1)
+        environment = S.EnvironmentTransformSkipFrames(copy_environment, 4)
+
+        environment.reset()
+        observation = environment.step(0).observation
+        environment.release(observation)
+
+        # The episode ends on a skipped frame, so the released observation is
+        # handed out once more and must not have been overwritten meanwhile.
+        observation_final, _, done, _ = environment.step(0)
+
+        assert done
+        assert observation_final is observation
+        assert int(observation_final[0, 0, 0]) == 4
+        assert len(copy_environment._free) == 0
+
+    def test_runner_releases_what_replay_has_copied(self):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set["episode_count"] = 1
+
+        runner = runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+
+        copy_environment = S.EnvironmentTransformCopyNDArray(runner.environment, pool_size = 2)
+        runner.environment = copy_environment
+        runner.run()
+
+        assert runner.agent.memory_buffer.copies_observations
+        assert len(copy_environment._pool) == 2
+        assert len(copy_environment._free) == 2
@@ -0,0 +1,89 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import torch as T
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentFrames(S.EnvironmentBase):
+    # Produces seeded random RGB screens, always in the same buffer like an
+    # emulator, and counts how often its step is called.
+    def __init__(self):
+        super().__init__(np.ndarray, int)
+
+        self.random_state = np.random.RandomState(0)
+        self.screen = np.zeros((8, 8, 3), dtype = np.uint8)
+        self.step_count = 0
+
+    def on_get_observation_space_shape(self):
+        return (8, 8, 3)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def _observe(self):
+        self.screen[...] = self.random_state.randint(0, 256, size = self.screen.shape)
+
+        return self.screen
+
+    def on_reset(self):
+        return self._observe()
+
+    def on_step(self, action):
+        self.step_count += 1
+
+        return EnvironmentStepResult(self._observe(), 1., self.step_count % 5 == 0, {})
+
+def create_stack(environment):
+    return S.EnvironmentTransformResize(
+        S.EnvironmentTransformGrayscale(S.EnvironmentTransformCopyNDArray(environment)),
+        4,
+        4
+    )
+
+class TestEnvironmentTransformFused(object):
+    def test_copies_made_redundant_by_later_layers_are_dropped(self):
+        environment = S.EnvironmentTransformFused(create_stack(EnvironmentFrames()))
+
+        assert [type(i) for i in environment.fused_environments] == [S.EnvironmentTransformGrayscale, S.EnvironmentTransformResize]
+        assert [type(i) for i in environment.dropped_environments] == [S.EnvironmentTransformCopyNDArray]
+        assert type(environment.pre_environment) is EnvironmentFrames
+        assert "Dropped: EnvironmentTransformCopyNDArray" in str(environment)
+
+    def test_observations_match_the_unfused_stack(self):
+        unfused = create_stack(EnvironmentFrames())
+        fused = S.EnvironmentTransformFused(create_stack(EnvironmentFrames()))
+
+        assert fused.observation_space_shape == unfused.observation_space_shape
+        assert T.equal(fused.reset(), unfused.reset())
+
+        for _ in range(6):
+            expected = unfused.step(0)
+            result = fused.step(0)
+
+            assert T.equal(result.observation, expected.observation)
+            assert result[1:] == expected[1:]
+
+    def test_layers_which_do_more_than_map_observations_stay(self):
+        environment = S.EnvironmentTransformFused(
+            S.EnvironmentTransformGrayscale(S.EnvironmentTransformSkipFrames(EnvironmentFrames(), 2))
+        )
+
+        assert type(environment.pre_environment) is S.EnvironmentTransformSkipFrames
+
+        environment.reset()
+        observation, reward, _, _ = environment.step(0)
+
+        assert tuple(observation.shape) == (1, 8, 8)
+        assert reward == 2.
+
+    def test_skipped_frames_are_not_transformed(self):
+        environment = S.EnvironmentTransformFused(create_stack(EnvironmentFrames()))
+
+        environment.reset()
+
+        assert environment.skip(0).observation is None
@@ -0,0 +1,147 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentCounter(S.EnvironmentBase):
+    # Observes the episode and step index, pays the action as reward and ends
+    # episodes after length steps.
+    def __init__(self, length = 3):
+        super().__init__(np.ndarray, int)
+
+        self.length = length
+        self.episode_index = -1
+        self.step_index = 0
+
+    def on_get_observation_space_shape(self):
+        return (2,)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def _observe(self):
+        return np.asarray([self.episode_index, self.step_index], dtype = np.int16)
+
+    def on_reset(self):
+        self.episode_index += 1
+        self.step_index = 0
+
+        return self._observe()
+
+    def on_step(self, action):
+        self.step_index += 1
+
+        return EnvironmentStepResult(self._observe(), float(action), self.step_index >= self.length, {})
+
+def record(environment, episode_count, length = 3):
+    records = []
+
+    for _ in range(episode_count):
+        records.append((environment.reset().tolist(), None, None, None))
+
+        for i in range(length):
+            observation, reward, done, _ = environment.step(i % 2)
+            records.append((observation.tolist(), reward, done, i % 2))
+
+    return records
+
+def replay(environment, episode_count, length = 3):
+    records = []
+
+    for _ in range(episode_count):
+        records.append((environment.reset().tolist(), None, None, None))
+
+        for _ in range(length):
+            observation, reward, done, info = environment.step(0)
+            records.append((observation.tolist(), reward, done, int(info["recorded_action"])))
+
+    return records
+
+class TestEnvironmentTransformRecordTrace(object):
+    @pytest.mark.parametrize("compression", ["zlib", "none"])
+    def test_replay_matches_the_recording(self, tmp_path, compression):
+        environment = S.EnvironmentTransformRecordTrace(EnvironmentCounter(), str(tmp_path), chunk_size = 2, compression = compression)
+
+        expected = record(environment, 3)
+        environment.close()
+
+        replay_environment = S.EnvironmentTraceReplay(str(tmp_path), loop = False)
+
+        assert replay_environment.record_count == 12
+        assert replay(replay_environment, 3) == expected
+
+        with pytest.raises(Exception):
+            replay_environment.reset()
+
+    def test_replay_loops_over_the_episodes(self, tmp_path):
+        environment = S.EnvironmentTransformRecordTrace(EnvironmentCounter(), str(tmp_path))
+
+        expected = record(environment, 2)
+        environment.close()
+
+        assert replay(S.EnvironmentTraceReplay(str(tmp_path)), 4) == expected + expected
+
+    @pytest.mark.parametrize("compression", ["zlib", "none"])
+    def test_unclosed_traces_replay_their_finished_episodes(self, tmp_path, compression):
+        environment = S.EnvironmentTransformRecordTrace(EnvironmentCounter(), str(tmp_path), chunk_size = 2, compression = compression)
+
+        expected = record(environment, 2)
+
+        # The chunk holding the start of this episode is written, but the
+        # episode never finishes.
+        environment.reset()
+        environment.step(1)
+        environment.step(0)
+
+        replay_environment = S.EnvironmentTraceReplay(str(tmp_path), loop = False)
+
+        assert replay_environment.record_count == 8
+        assert replay(replay_environment, 2) == expected
+
+        with pytest.raises(Exception):
+            replay_environment.reset()
+
+        environment.close()
+
+    def test_closing_keeps_the_unfinished_episode(self, tmp_path):
+        environment = S.EnvironmentTransformRecordTrace(EnvironmentCounter(), str(tmp_path), chunk_size = 2)
+
+        record(environment, 1)
+        environment.reset()
+        environment.step(1)
+        environment.close()
+
+        replay_environment = S.EnvironmentTraceReplay(str(tmp_path), loop = False)
+        replay(replay_environment, 1)
+
+        assert replay_environment.reset().tolist() == [1, 0]
+        assert replay_environment.step(0).observation.tolist() == [1, 1]
+
+        with pytest.raises(Exception):
+            replay_environment.step(0)
+
+    def test_runner_closes_the_environment(self):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set["episode_count"] = 1
+
+        runner = runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+
+        closed = []
+        close = runner.environment.close
+
+        def close_environment():
+            closed.append(True)
+            close()
+
+        runner.environment.close = close_environment
+        runner.run()
+
+        assert closed == [True]
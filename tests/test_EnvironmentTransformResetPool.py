@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentSeeded(S.EnvironmentBase):
+    # Every real reset starts a new layout, which is observed along with the
+    # number of steps taken. Snapshots hold both.
+    def __init__(self, snapshots = True):
+        super().__init__(np.ndarray, int)
+
+        self.snapshots = snapshots
+        self.reset_count = 0
+        self.layout = 0
+        self.step_index = 0
+
+    def on_get_observation_space_shape(self):
+        return (2,)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def _observe(self):
+        return np.asarray([self.layout, self.step_index], dtype = np.float32)
+
+    def on_reset(self):
+        self.reset_count += 1
+        self.layout = self.reset_count
+        self.step_index = 0
+
+        return self._observe()
+
+    def on_step(self, action):
+        self.step_index += 1
+
+        return EnvironmentStepResult(self._observe(), 0., False, {})
+
+    def on_clone_state(self):
+        return (self.layout, self.step_index) if self.snapshots else None
+
+    def on_restore_state(self, state):
+        self.layout, self.step_index = state
+
+        return self._observe()
+
+class TestEnvironmentTransformResetPool(object):
+    def test_restored_episodes_start_where_the_snapshot_was_taken(self):
+        environment = S.EnvironmentTransformResetPool(EnvironmentSeeded(), pool_size = 1)
+
+        assert environment.reset().tolist() == [1., 0.]
+
+        environment.step(0)
+
+        assert environment.reset().tolist() == [1., 0.]
+        assert environment.restored_count == 1
+
+    def test_used_up_snapshots_are_replaced_by_real_resets(self):
+        pre_environment = EnvironmentSeeded()
+        environment = S.EnvironmentTransformResetPool(pre_environment, pool_size = 2, reuse_count = 2)
+
+        layouts = [int(environment.reset()[0]) for _ in range(12)]
+
+        # Two real resets fill the pool, each snapshot is restored twice and
+        # then replaced, so new start states keep coming in.
+        assert layouts == [1, 2, 1, 2, 1, 2, 3, 4, 3, 4, 3, 4]
+        assert environment.refreshed_count == 4
+        assert environment.restored_count == 8
+        assert pre_environment.reset_count == 4
+
+    def test_environments_without_snapshots_always_reset(self):
+        pre_environment = EnvironmentSeeded(snapshots = False)
+        environment = S.EnvironmentTransformResetPool(pre_environment, pool_size = 2)
+
+        layouts = [int(environment.reset()[0]) for _ in range(4)]
+
+        assert layouts == [1, 2, 3, 4]
+        assert environment.fallback_count == 4
+        assert environment.restored_count == 0
+
+    def test_background_environment_prepares_fresh_start_states(self):
+        environment = S.EnvironmentTransformResetPool(EnvironmentSeeded(), pool_size = 2, environment_factory = EnvironmentSeeded)
+
+        try:
+            environment.reset()
+
+            deadline = time.time() + 10
+
+            while environment._queue.qsize() < 2 and time.time() < deadline:
+                time.sleep(0.01)
+
+            restored_count = environment.restored_count
+            layouts = [int(environment.reset()[0]) for _ in range(2)]
+
+            assert environment.restored_count == restored_count + 2
+            assert len(set(layouts)) == 2
+        finally:
+            environment.close()
+
+        assert environment._thread is None
+
+    def test_background_environment_is_closed(self):
+        background_environments = []
+
+        def create_environment():
+            background_environment = EnvironmentSeeded()
+            background_environment.closed = False
+            background_environment.close = lambda: setattr(background_environment, "closed", True)
+            background_environments.append(background_environment)
+
+            return background_environment
+
+        environment = S.EnvironmentTransformResetPool(EnvironmentSeeded(), environment_factory = create_environment)
+        environment.reset()
+        environment.close()
+
+        assert len(background_environments) == 1
+        assert background_environments[0].closed
+
+    def test_background_errors_are_raised_on_reset(self):
+        def create_environment():
+            raise ValueError("factory failed")
+
+        environment = S.EnvironmentTransformResetPool(EnvironmentSeeded(), environment_factory = create_environment)
+
+        try:
+            environment.reset()
+            environment._thread.join()
+
+            with pytest.raises(Exception, match = "preparing start states failed"):
+                environment.reset()
+        finally:
+            environment.close()
@@ -0,0 +1,108 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import torch as T
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentFrames(S.EnvironmentBase):
+    # Frame i shows (i, -i), pays i as reward and the episode ends after
+    # length frames. Skipped frames are counted and not rendered.
+    def __init__(self, length = 100):
+        super().__init__(np.ndarray, int)
+
+        self.length = length
+        self.frame_index = 0
+        self.rendered_count = 0
+        self.skipped_count = 0
+
+    def on_get_observation_space_shape(self):
+        return (2,)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def _observe(self):
+        self.rendered_count += 1
+
+        return np.asarray([self.frame_index, -self.frame_index], dtype = np.float32)
+
+    def on_reset(self):
+        self.frame_index = 0
+
+        return self._observe()
+
+    def on_step(self, action):
+        self.frame_index += 1
+
+        return EnvironmentStepResult(self._observe(), float(self.frame_index), self.frame_index >= self.length, {})
+
+    def on_skip(self, action):
+        self.frame_index += 1
+        self.skipped_count += 1
+
+        return EnvironmentStepResult(None, float(self.frame_index), self.frame_index >= self.length, {})
+
+class TestEnvironmentTransformSkipFrames(object):
+    def test_rewards_of_skipped_frames_are_summed(self):
+        environment = S.EnvironmentTransformSkipFrames(EnvironmentFrames(), 4)
+
+        environment.reset()
+        observation, reward, done, _ = environment.step(0)
+
+        assert observation.tolist() == [4., -4.]
+        assert reward == 1. + 2. + 3. + 4.
+        assert not done
+
+    def test_intermediate_frames_are_not_rendered(self):
+        pre_environment = EnvironmentFrames()
+        environment = S.EnvironmentTransformSkipFrames(pre_environment, 4)
+
+        environment.reset()
+
+        for _ in range(3):
+            environment.step(0)
+
+        assert pre_environment.skipped_count == 9
+        assert pre_environment.rendered_count == 1 + 3
+
+    def test_max_pooling_combines_the_last_two_frames(self):
+        pre_environment = EnvironmentFrames()
+        environment = S.EnvironmentTransformSkipFrames(pre_environment, 4, max_pool = True)
+
+        environment.reset()
+        observation = environment.step(0).observation
+
+        assert observation.tolist() == [4., -3.]
+        assert pre_environment.skipped_count == 2
+
+    def test_episodes_ending_on_a_skipped_frame_stop_there(self):
+        environment = S.EnvironmentTransformSkipFrames(EnvironmentFrames(length = 6), 4)
+
+        environment.reset()
+        environment.step(0)
+        observation, reward, done, _ = environment.step(0)
+
+        # The wrapped environment did not render its final frame, so the last
+        # observation stands in for it.
+        assert done
+        assert reward == 5. + 6.
+        assert observation.tolist() == [4., -4.]
+
+    def test_skipping_a_skip_transform_renders_nothing(self):
+        pre_environment = EnvironmentFrames()
+        environment = S.EnvironmentTransformSkipFrames(pre_environment, 3)
+
+        environment.reset()
+        result = environment.skip(0)
+
+        assert result.observation is None
+        assert result.reward == 1. + 2. + 3.
+        assert pre_environment.rendered_count == 1
+
+    def test_tensor_observations_are_max_pooled(self):
+        assert S.EnvironmentTransformSkipFrames._max_pool(T.as_tensor([1., 5.]), T.as_tensor([3., 2.])).tolist() == [3., 5.]
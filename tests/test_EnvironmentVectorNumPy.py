@@ -0,0 +1,182 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import gym
+import numpy as np
+import pytest
+import torch as T
+
+import sophiedl as S
+
+def gym_step(name, state, action):
+    environment = gym.make(name).unwrapped
+    environment.reset()
+    environment.state = np.array(state)
+
+    observation, reward, done, _ = environment.step(action)
+
+    return np.asarray(observation, dtype = np.float64), reward, done
+
+class TestEnvironmentVectorCartPole(object):
+    def test_matches_the_gym_dynamics(self):
+        environment = S.EnvironmentVectorCartPole(16, seed = 0)
+        environment.reset()
+        environment.states[:, 2] = np.linspace(-0.2, 0.2, 16)
+
+        states = environment.states.copy()
+        actions = np.arange(16) % 2
+
+        observations, rewards, dones, _ = environment.step(T.as_tensor(actions))
+
+        for i in range(16):
+            observation, reward, done = gym_step("CartPole-v0", states[i], int(actions[i]))
+
+            assert bool(dones[i]) == done
+            assert rewards[i].item() == reward
+
+            if not done:
+                assert np.allclose(observations[i].numpy(), observation)
+
+    def test_finished_instances_are_reset_in_place(self):
+        environment = S.EnvironmentVectorCartPole(3, seed = 0)
+        environment.reset()
+        environment.states[1, 2] = 0.5
+
+        observations, _, dones, infos = environment.step(T.as_tensor([0, 0, 0]))
+
+        assert dones.tolist() == [False, True, False]
+        assert infos[1]["terminal_observation"][2] > environment.THETA_THRESHOLD
+        assert "TimeLimit.truncated" not in infos[1]
+        assert np.abs(observations[1].numpy()).max() <= 0.05
+        assert environment.step_counts.tolist() == [1, 0, 1]
+
+    def test_episodes_are_cut_off_after_max_episode_steps(self):
+        environment = S.EnvironmentVectorCartPole(2, max_episode_steps = 3, seed = 0)
+        environment.reset()
+
+        for _ in range(2):
+            assert not environment.step(T.as_tensor([0, 1])).dones.any()
+
+        _, _, dones, infos = environment.step(T.as_tensor([0, 1]))
+
+        assert dones.tolist() == [True, True]
+        assert all(i["TimeLimit.truncated"] for i in infos)
+        assert environment.step_counts.tolist() == [0, 0]
+
+    def test_seeds_make_runs_repeatable(self):
+        observations = []
+
+        for _ in range(2):
+            environment = S.EnvironmentVectorCartPole(4, seed = 3)
+            environment.reset()
+            observations.append(environment.step(T.as_tensor([1, 0, 1, 0])).observations)
+
+        assert T.equal(observations[0], observations[1])
+
+class TestEnvironmentVectorMountainCarContinuous(object):
+    def test_matches_the_gym_dynamics(self):
+        environment = S.EnvironmentVectorMountainCarContinuous(8, seed = 0)
+        environment.reset()
+        environment.states[:, 0] = np.linspace(-1.2, 0.44, 8)
+        environment.states[:, 1] = np.linspace(-0.07, 0.07, 8)
+
+        states = environment.states.copy()
+        actions = np.linspace(-2., 2., 8).reshape(8, 1)
+
+        observations, rewards, dones, infos = environment.step(T.as_tensor(actions))
+
+        for i in range(8):
+            observation, reward, done = gym_step("MountainCarContinuous-v0", states[i], actions[i])
+
+            assert bool(dones[i]) == done
+            assert rewards[i].item() == pytest.approx(reward)
+            assert np.allclose(infos[i]["terminal_observation"] if done else observations[i].numpy(), observation)
+
+    def test_reaching_the_goal_finishes_the_episode(self):
+        environment = S.EnvironmentVectorMountainCarContinuous(2, seed = 0)
+        environment.reset()
+        environment.states[0] = [0.44, 0.07]
+
+        observations, rewards, dones, infos = environment.step(T.zeros(2, 1))
+
+        assert dones.tolist() == [True, False]
+        assert rewards[0].item() == 100.
+        assert -0.6 <= observations[0, 0].item() <= -0.4
+
+class TestEnvironmentVectorNumPyBase(object):
+    def test_reset_only_touches_the_given_instances(self):
+        environment = S.EnvironmentVectorCartPole(3, seed = 0)
+        environment.reset()
+        environment.step(T.as_tensor([1, 1, 1]))
+
+        states = environment.states.copy()
+        observations = environment.reset(T.as_tensor([2]))
+
+        assert np.array_equal(observations[:2].numpy(), states[:2])
+        assert not np.array_equal(observations[2].numpy(), states[2])
+        assert environment.step_counts.tolist() == [1, 1, 0]
+
+    def test_send_and_recv_match_step(self):
+        stepped = S.EnvironmentVectorCartPole(4, seed = 0)
+        stepped.reset()
+        expected = stepped.step(T.as_tensor([0, 1, 0, 1])).observations
+
+        environment = S.EnvironmentVectorCartPole(4, seed = 0)
+        environment.reset()
+        environment.send(T.as_tensor([1, 0]), T.as_tensor([3, 2]))
+        environment.send(T.as_tensor([1, 0]), T.as_tensor([1, 0]))
+
+        with pytest.raises(Exception):
+            environment.send(T.as_tensor([1]), T.as_tensor([0]))
+
+        with pytest.raises(Exception):
+            environment.recv(5)
+
+        indices, observations, _, _, _ = environment.recv(2)
+
+        assert indices.tolist() == [3, 2]
+        assert T.equal(observations, expected[[3, 2]])
+
+        indices, observations, _, _, _ = environment.recv(2)
+
+        assert indices.tolist() == [1, 0]
+        assert T.equal(observations, expected[[1, 0]])
+
+    def test_stepping_environments_cannot_be_reset(self):
+        environment = S.EnvironmentVectorCartPole(2, seed = 0)
+        environment.reset()
+        environment.send(T.as_tensor([1]), T.as_tensor([0]))
+
+        with pytest.raises(Exception):
+            environment.reset()
+
+        with pytest.raises(Exception):
+            environment.step(T.as_tensor([0, 0]))
+
+    def test_factories_select_the_batched_environment(self):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set["episode_count"] = 4
+        hyperparameter_set.add("environment_count", 4)
+        hyperparameter_set.add("environment_numpy", True)
+
+        runner = runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+
+        assert isinstance(runner.environment, S.EnvironmentVectorCartPole)
+        assert runner.environment.environment_count == 4
+
+        runner.run()
+
+        assert runner.context.episode_index == 4
+
+    def test_factories_without_a_batched_environment_fail(self):
+        runner_factory = S.RunnerRLFactoryDiscreteActorCriticCartPoleV0()
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set.add("environment_numpy", True)
+
+        with pytest.raises(Exception):
+            runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
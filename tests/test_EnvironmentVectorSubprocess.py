@@ -0,0 +1,195 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentCounter(S.EnvironmentBase):
+    # Observes the sum of its actions and how many steps it took, pays the
+    # action as reward and ends after length steps.
+    def __init__(self, length = 3):
+        super().__init__(np.ndarray, int)
+
+        self.length = length
+        self.action_sum = 0
+        self.step_index = 0
+
+    def on_get_observation_space_shape(self):
+        return (2,)
+
+    def on_get_action_space_shape(self):
+        return (4,)
+
+    def _observe(self):
+        return np.asarray([self.action_sum, self.step_index], dtype = np.float32)
+
+    def on_reset(self):
+        self.action_sum = 0
+        self.step_index = 0
+
+        return self._observe()
+
+    def on_step(self, action):
+        self.action_sum += action
+        self.step_index += 1
+
+        return EnvironmentStepResult(self._observe(), float(action), self.step_index >= self.length, {})
+
+class TestEnvironmentVectorSubprocess(object):
+    def test_step_gathers_every_environment(self):
+        environment = S.EnvironmentVectorSubprocess(EnvironmentCounter, 3)
+
+        try:
+            assert environment.observation_space_shape == S.Shape((2,))
+            assert environment.reset().tolist() == [[0., 0.]] * 3
+
+            environment.step(T.as_tensor([1, 2, 3]))
+            observations, rewards, dones, infos = environment.step(T.as_tensor([1, 2, 3]))
+
+            assert observations.tolist() == [[2., 2.], [4., 2.], [6., 2.]]
+            assert rewards.tolist() == [1., 2., 3.]
+            assert dones.tolist() == [False, False, False]
+        finally:
+            environment.close()
+
+    def test_finished_episodes_reset_and_keep_the_final_observation(self):
+        environment = S.EnvironmentVectorSubprocess(EnvironmentCounter, 2)
+
+        try:
+            environment.reset()
+
+            for _ in range(2):
+                environment.step(T.as_tensor([1, 2]))
+
+            observations, _, dones, infos = environment.step(T.as_tensor([1, 2]))
+
+            assert dones.tolist() == [True, True]
+            assert observations.tolist() == [[0., 0.], [0., 0.]]
+            assert infos[1]["terminal_observation"].tolist() == [6., 3.]
+        finally:
+            environment.close()
+
+    def test_reset_only_touches_the_given_environments(self):
+        environment = S.EnvironmentVectorSubprocess(EnvironmentCounter, 2)
+
+        try:
+            environment.reset()
+            environment.step(T.as_tensor([0, 0]))
+
+            observations = environment.reset(T.as_tensor([1]))
+
+            assert observations[:, 1].tolist() == [1., 0.]
+        finally:
+            environment.close()
+
+    def test_close_removes_the_shared_buffers(self):
+        environment = S.EnvironmentVectorSubprocess(EnvironmentCounter, 1)
+        path = environment._temporary_directory.name
+
+        assert os.path.isdir(path)
+
+        environment.close()
+
+        assert not os.path.exists(path)
+
+class TestEnvironmentVectorSubprocessAsynchronous(object):
+    def test_results_are_received_in_batches(self):
+        environment = S.EnvironmentVectorSubprocess(EnvironmentCounter, 3)
+
+        try:
+            environment.reset()
+            environment.send(T.as_tensor([1, 2, 3]), T.as_tensor([0, 1, 2]))
+
+            results = [environment.recv(2), environment.recv(1)]
+            environment_indices = T.cat([i.environment_indices for i in results])
+            observations = T.cat([i.observations for i in results])
+            rewards = T.cat([i.rewards for i in results])
+
+            assert sorted(environment_indices.tolist()) == [0, 1, 2]
+            assert observations[:, 0].tolist() == (environment_indices + 1).tolist()
+            assert rewards.tolist() == (environment_indices + 1).tolist()
+        finally:
+            environment.close()
+
+    def test_stepping_environments_cannot_be_sent_to_again(self):
+        environment = S.EnvironmentVectorSubprocess(EnvironmentCounter, 2)
+
+        try:
+            environment.reset()
+            environment.send(T.as_tensor([1]), T.as_tensor([0]))
+
+            with pytest.raises(Exception):
+                environment.send(T.as_tensor([1]), T.as_tensor([0]))
+
+            with pytest.raises(Exception):
+                environment.step(T.as_tensor([1, 1]))
+
+            # The other environment is free to step meanwhile.
+            environment.send(T.as_tensor([2]), T.as_tensor([1]))
+
+            assert len(environment.recv(2).environment_indices) == 2
+        finally:
+            environment.close()
+
+    def test_receiving_more_than_is_stepping_fails(self):
+        environment = S.EnvironmentVectorSubprocess(EnvironmentCounter, 2)
+
+        try:
+            environment.reset()
+            environment.send(T.as_tensor([1]), T.as_tensor([1]))
+
+            with pytest.raises(Exception):
+                environment.recv(2)
+
+            assert environment.recv(1).environment_indices.tolist() == [1]
+        finally:
+            environment.close()
+
+    def test_runner_acts_on_partial_batches(self):
+        runner_factory = S.RunnerRLFactoryDiscreteActorCriticCartPoleV0()
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set["episode_count"] = 4
+        hyperparameter_set.add("environment_count", 3)
+        hyperparameter_set.add("environment_batch_size", 2)
+
+        runner = runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+
+        try:
+            runner.run()
+
+            # Every environment still stepping at the end was waited for.
+            assert runner.context.episode_index == 4
+            assert len(runner.environment._pending_indices) == 0
+        finally:
+            runner.environment.close()
+
+    def test_factory_builds_no_local_environment(self):
+        runner_factory = S.RunnerRLFactoryDiscreteActorCriticCartPoleV0()
+        created = []
+        create_environment = runner_factory.on_create_environment
+
+        def create_environment_recorded():
+            created.append(os.getpid())
+
+            return create_environment()
+
+        runner_factory.on_create_environment = create_environment_recorded
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set.add("environment_count", 2)
+
+        runner = runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+
+        try:
+            # Only the workers build environments, none is left open here.
+            assert os.getpid() not in created
+            assert tuple(runner.environment.observation_space_shape) == (4,)
+        finally:
+            runner.environment.close()
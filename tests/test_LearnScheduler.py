@@ -0,0 +1,151 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import pytest
+
+import sophiedl as S
+
+class RunnerContextCounted(object):
+    # Only what the scheduler reads from a runner context.
+    def __init__(self):
+        self.step_index_total = 0
+        self.scalars = []
+
+    def add_scalar(self, tag, value, step):
+        self.scalars.append((tag, value, step))
+
+def schedule(learn_scheduler, step_counts, memory_size = 1000):
+    # Calls the scheduler once per entry, after that many environment steps.
+    runner_context = RunnerContextCounted()
+    gradient_step_counts = []
+
+    for step_count in step_counts:
+        runner_context.step_index_total += step_count
+
+        gradient_step_count = learn_scheduler.get_gradient_step_count(runner_context, memory_size)
+        learn_scheduler.finish_learning(gradient_step_count)
+
+        gradient_step_counts.append(gradient_step_count)
+
+    return gradient_step_counts
+
+class TestLearnScheduler(object):
+    def test_by_default_every_call_takes_one_gradient_step(self):
+        learn_scheduler = S.LearnScheduler()
+
+        assert schedule(learn_scheduler, [1, 1, 1]) == [1, 1, 1]
+
+        # Vector environments push several transitions per call.
+        learn_scheduler = S.LearnScheduler()
+
+        assert schedule(learn_scheduler, [8, 8, 8]) == [1, 1, 1]
+        assert learn_scheduler.replay_ratio == 1 / 8
+
+    def test_intervals_count_environment_steps(self):
+        learn_scheduler = S.LearnScheduler(interval = 4, gradient_steps = 2)
+
+        assert schedule(learn_scheduler, [0] + [1] * 8) == [2, 0, 0, 0, 2, 0, 0, 0, 2]
+        assert learn_scheduler.replay_ratio == 0.5
+
+    def test_calls_covering_several_intervals_catch_up(self):
+        learn_scheduler = S.LearnScheduler(interval = 1)
+
+        assert schedule(learn_scheduler, [8, 8, 3]) == [9, 8, 3]
+
+    def test_fractional_gradient_steps_carry_over(self):
+        learn_scheduler = S.LearnScheduler(gradient_steps = 0.5)
+
+        assert schedule(learn_scheduler, [1] * 6) == [0, 1, 0, 1, 0, 1]
+
+    def test_learning_waits_for_the_warm_up(self):
+        learn_scheduler = S.LearnScheduler(interval = 1, start_steps = 3)
+
+        assert schedule(learn_scheduler, [1] * 5) == [0, 0, 1, 1, 1]
+
+        # Intervals passing while the memory fills up are not owed later.
+        learn_scheduler = S.LearnScheduler(interval = 1, start_memory = 10)
+        runner_context = RunnerContextCounted()
+
+        for memory_size in (4, 8):
+            runner_context.step_index_total += 4
+
+            assert learn_scheduler.get_gradient_step_count(runner_context, memory_size) == 0
+
+        runner_context.step_index_total += 4
+
+        assert learn_scheduler.get_gradient_step_count(runner_context, 12) == 4
+
+    def test_adaptive_steps_follow_the_measured_times(self):
+        learn_scheduler = S.LearnScheduler(target_fraction = 0.5, gradient_steps_min = 0.5, gradient_steps_max = 8)
+        runner_context = RunnerContextCounted()
+
+        learn_scheduler._acting_time = 0.01
+        learn_scheduler._gradient_step_time = 0.004
+        learn_scheduler._adapt(runner_context)
+
+        assert learn_scheduler.gradient_steps == pytest.approx(2.5)
+        assert runner_context.scalars == [("Gradient Steps/Interval", learn_scheduler.gradient_steps, 0)]
+
+        learn_scheduler._gradient_step_time = 0.0001
+        learn_scheduler._adapt(runner_context)
+
+        assert learn_scheduler.gradient_steps == 8
+
+        learn_scheduler._gradient_step_time = 1.
+        learn_scheduler._adapt(runner_context)
+
+        assert learn_scheduler.gradient_steps == 0.5
+
+    def test_adaptive_schedules_measure_acting_and_learning(self):
+        learn_scheduler = S.LearnScheduler(target_fraction = 0.5)
+
+        schedule(learn_scheduler, [1] * 4)
+
+        assert learn_scheduler._acting_time is not None
+        assert learn_scheduler._gradient_step_time is not None
+
+class TestAgentDQNLearnScheduler(object):
+    def _create_runner(self, **hyperparameters):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set["episode_count"] = 4
+        hyperparameter_set["memory_batch_size"] = 16
+        hyperparameter_set.add("environment_count", 4)
+        hyperparameter_set.add("environment_numpy", True)
+
+        for key, value in hyperparameters.items():
+            hyperparameter_set.add(key, value)
+
+        runner = runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+
+        learn_scheduler = runner.agent.learn_scheduler
+        get_gradient_step_count = learn_scheduler.get_gradient_step_count
+        gradient_step_counts = []
+
+        def get_gradient_step_count_recorded(runner_context, memory_size):
+            gradient_step_counts.append(get_gradient_step_count(runner_context, memory_size))
+
+            return gradient_step_counts[-1]
+
+        learn_scheduler.get_gradient_step_count = get_gradient_step_count_recorded
+
+        return runner, gradient_step_counts
+
+    def test_vector_environments_learn_once_per_batch_by_default(self):
+        runner, gradient_step_counts = self._create_runner()
+        runner.run()
+
+        assert runner.agent.learn_scheduler.interval is None
+        assert set(gradient_step_counts) == {0, 1}
+        assert runner.agent.learn_step_count == sum(gradient_step_counts)
+
+    def test_learn_interval_follows_environment_steps(self):
+        runner, gradient_step_counts = self._create_runner(learn_interval = 1)
+        runner.run()
+
+        assert runner.agent.learn_scheduler.interval == 1
+        assert max(gradient_step_counts) == 4
+        assert runner.agent.learn_step_count == sum(gradient_step_counts)
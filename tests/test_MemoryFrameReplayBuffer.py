@@ -0,0 +1,148 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import torch as T
+
+import sophiedl as S
+
+def push_episode(memory_buffer, start, length):
+    observation = T.full((3,), float(start))
+
+    for i in range(length):
+        observation_next = T.full((3,), float(start + i + 1))
+
+        memory_buffer.add_observation_current(observation)
+        memory_buffer.add_action(T.as_tensor(0))
+        memory_buffer.add_observation_next(observation_next)
+        memory_buffer.add_reward(float(start + i))
+        memory_buffer.add_done(i == length - 1)
+        memory_buffer.push()
+
+        observation = observation_next
+
+def assert_consistent(memory_buffer):
+    # Every stored transition was pushed with its reward equal to its current
+    # observation and a next observation one higher.
+    batch = memory_buffer.read_all(T.device("cpu"))
+
+    assert T.equal(batch.observations_current[:, 0], batch.rewards)
+    assert T.equal(batch.observations_next[:, 0], batch.rewards + 1)
+
+class TestMemoryFrameReplayBuffer(object):
+    def test_consecutive_steps_share_frames(self):
+        memory_buffer = S.MemoryFrameReplayBuffer(100)
+
+        push_episode(memory_buffer, 0, 10)
+
+        assert len(memory_buffer) == 10
+        assert memory_buffer._frame_count == 11
+        assert_consistent(memory_buffer)
+
+    def test_new_episodes_store_their_first_frame(self):
+        memory_buffer = S.MemoryFrameReplayBuffer(100)
+
+        push_episode(memory_buffer, 0, 5)
+        push_episode(memory_buffer, 100, 5)
+
+        assert memory_buffer._frame_count == 12
+        assert_consistent(memory_buffer)
+
+    def test_recycled_arrays_do_not_carry_frames_across_episodes(self):
+        memory_buffer = S.MemoryFrameReplayBuffer(100)
+        observation = T.full((3,), 0.)
+        observation_next = T.full((3,), 1.)
+
+        memory_buffer.add_observation_current(observation)
+        memory_buffer.add_action(T.as_tensor(0))
+        memory_buffer.add_observation_next(observation_next)
+        memory_buffer.add_reward(0.)
+        memory_buffer.add_done(True)
+        memory_buffer.push()
+
+        # The last observation's array comes back filled with the reset one.
+        observation_next.fill_(5.)
+
+        memory_buffer.add_observation_current(observation_next)
+        memory_buffer.add_action(T.as_tensor(0))
+        memory_buffer.add_observation_next(T.full((3,), 6.))
+        memory_buffer.add_reward(5.)
+        memory_buffer.add_done(False)
+        memory_buffer.push()
+
+        assert memory_buffer._frame_count == 4
+        assert_consistent(memory_buffer)
+
+    def test_transitions_are_evicted_before_their_frames_are_overwritten(self):
+        memory_buffer = S.MemoryFrameReplayBuffer(100, frame_capacity = 8)
+
+        for episode in range(10):
+            push_episode(memory_buffer, 100 * episode, 5)
+
+            assert len(memory_buffer) <= 7
+            assert_consistent(memory_buffer)
+
+    def test_capacity_eviction_keeps_the_newest_transitions(self):
+        memory_buffer = S.MemoryFrameReplayBuffer(4)
+
+        push_episode(memory_buffer, 0, 10)
+
+        assert len(memory_buffer) == 4
+        assert memory_buffer.read_all(T.device("cpu")).rewards.tolist() == [6., 7., 8., 9.]
+        assert_consistent(memory_buffer)
+
+class TestMemoryFrameReplayBufferBatches(object):
+    def _run(self, memory_buffer, batches, environment_count):
+        observations = T.arange(environment_count, dtype = T.float32) * 1000
+        frame_counts = []
+
+        for environment_indices in batches:
+            environment_indices = T.as_tensor(environment_indices)
+            observations_current = observations[environment_indices].unsqueeze(dim = 1).expand(-1, 3).clone()
+            observations_next = observations_current + 1
+
+            memory_buffer.push_transitions(
+                observations_current,
+                T.zeros(environment_indices.shape[0], dtype = T.int64),
+                observations_current[:, 0],
+                observations_next,
+                T.zeros(environment_indices.shape[0], dtype = T.bool),
+                environment_indices = environment_indices
+            )
+
+            observations[environment_indices] += 1
+            frame_counts.append(memory_buffer._frame_count)
+
+            assert_consistent(memory_buffer)
+
+        return frame_counts
+
+    def test_synchronous_batches_share_frames(self):
+        memory_buffer = S.MemoryFrameReplayBuffer(1000)
+
+        frame_counts = self._run(memory_buffer, [[0, 1, 2]] * 5, 3)
+
+        assert frame_counts == [6, 9, 12, 15, 18]
+
+    def test_environments_missing_from_a_batch_keep_their_frames(self):
+        memory_buffer = S.MemoryFrameReplayBuffer(1000)
+
+        # Half of the environments step in every batch, in turns.
+        frame_counts = self._run(memory_buffer, [[0, 1], [2, 3]] * 10, 4)
+
+        assert frame_counts[1] == 8
+
+        # Once every environment has been seen, each transition only stores
+        # its next frame.
+        assert [b - a for a, b in zip(frame_counts[1:], frame_counts[2:])] == [2] * 18
+
+    def test_random_batches_stay_consistent_under_eviction(self):
+        generator = T.Generator().manual_seed(0)
+        memory_buffer = S.MemoryFrameReplayBuffer(50, frame_capacity = 40)
+
+        batches = [T.randperm(8, generator = generator)[:3].tolist() for _ in range(200)]
+
+        frame_counts = self._run(memory_buffer, batches, 8)
+
+        assert frame_counts[-1] < 2 * 3 * 200
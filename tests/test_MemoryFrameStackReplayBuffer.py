@@ -0,0 +1,200 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+
+import sophiedl as S
+from sophiedl.domain.FrameStack import FrameRing, FrameStack
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentCounter(S.EnvironmentBase):
+    # Every frame is filled with the number of steps taken.
+    def __init__(self):
+        super().__init__(np.ndarray, int)
+
+        self.step_index = 0
+
+    def on_get_observation_space_shape(self):
+        return (1, 2)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def _observe(self):
+        return np.full((1, 2), self.step_index, dtype = np.float32)
+
+    def on_reset(self):
+        self.step_index = 0
+
+        return self._observe()
+
+    def on_step(self, action):
+        self.step_index += 1
+
+        return EnvironmentStepResult(self._observe(), 0., False, {})
+
+class TestFrameStack(object):
+    def test_stacks_are_views_until_converted(self):
+        ring = FrameRing(4)
+
+        for i in range(3):
+            ring.append(T.full((1, 2), float(i)))
+
+        stack = FrameStack(ring, (1, 2))
+
+        assert stack.shape == (2, 2)
+        assert stack.to_tensor().tolist() == [[1., 1.], [2., 2.]]
+        assert FrameStack.materialize(stack).tolist() == [[1., 1.], [2., 2.]]
+        assert np.asarray(stack).tolist() == [[1., 1.], [2., 2.]]
+
+    def test_overwritten_frames_cannot_be_read(self):
+        ring = FrameRing(2)
+        stack = FrameStack(ring, (ring.append(T.zeros(1)), ring.append(T.ones(1))))
+
+        ring.append(T.ones(1))
+
+        assert not stack.is_valid
+
+        with pytest.raises(Exception):
+            stack.to_tensor()
+
+class TestEnvironmentTransformFrameStack(object):
+    def test_episodes_start_with_the_first_frame_repeated(self):
+        environment = S.EnvironmentTransformFrameStack(EnvironmentCounter(), 3)
+
+        assert tuple(environment.observation_space_shape) == (3, 2)
+        assert environment.reset().to_tensor()[:, 0].tolist() == [0., 0., 0.]
+
+        environment.step(0)
+
+        assert environment.step(0).observation.to_tensor()[:, 0].tolist() == [0., 1., 2.]
+
+    def test_each_frame_is_written_once(self):
+        environment = S.EnvironmentTransformFrameStack(EnvironmentCounter(), 3)
+
+        environment.reset()
+
+        for _ in range(5):
+            observation = environment.step(0).observation
+
+        assert environment.ring.frame_count == 6
+        assert observation.frame_indices == (3, 4, 5)
+
+class TestMemoryFrameStackReplayBuffer(object):
+    def _push_episode(self, memory_buffer, environment, length):
+        observation = environment.reset()
+
+        for _ in range(length):
+            observation_next = environment.step(0).observation
+
+            memory_buffer.add_observation_current(observation)
+            memory_buffer.add_action(T.as_tensor(0))
+            memory_buffer.add_observation_next(observation_next)
+            memory_buffer.add_reward(float(observation_next.frame_indices[-1]))
+            memory_buffer.add_done(False)
+            memory_buffer.push()
+
+            observation = observation_next
+
+    def test_stacks_share_their_stored_frames(self):
+        environment = S.EnvironmentTransformFrameStack(EnvironmentCounter(), 3)
+        memory_buffer = S.MemoryFrameStackReplayBuffer(100, 3)
+
+        self._push_episode(memory_buffer, environment, 10)
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        # The repeated first frame and every later frame are stored once.
+        assert memory_buffer._frame_count == 11
+        assert batch.observations_next[:, :, 0].tolist() == [[max(0, i - 2), max(0, i - 1), i] for i in range(1, 11)]
+        assert T.equal(batch.observations_current[1:], batch.observations_next[:-1])
+
+    def test_transitions_are_evicted_before_their_frames(self):
+        environment = S.EnvironmentTransformFrameStack(EnvironmentCounter(), 2)
+        memory_buffer = S.MemoryFrameStackReplayBuffer(100, 2, frame_capacity = 8)
+
+        self._push_episode(memory_buffer, environment, 30)
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert 0 < len(memory_buffer) < 8
+        assert batch.observations_next[:, -1, 0].tolist() == batch.rewards.tolist()
+        assert T.equal(batch.observations_next[:, 0], batch.observations_current[:, 1])
+
+    def _stacks(self, environment_indices, step_index):
+        # Frames of environment e hold 100 * e plus the step they were taken
+        # at, with the first frame repeated at the start of the episode.
+        return T.stack([
+            T.stack([T.full((1, 2), 100. * e + max(0, step_index - i)) for i in (2, 1, 0)]).reshape(3, 2)
+            for e in environment_indices
+        ])
+
+    def test_dense_batches_store_one_frame_per_transition(self):
+        memory_buffer = S.MemoryFrameStackReplayBuffer(20, 3)
+        environment_indices = T.arange(2)
+
+        for step_index in range(25):
+            memory_buffer.push_transitions(
+                self._stacks(environment_indices.tolist(), step_index),
+                T.zeros(2, dtype = T.int64),
+                T.full((2,), float(step_index + 1)),
+                self._stacks(environment_indices.tolist(), step_index + 1),
+                T.zeros(2, dtype = T.bool),
+                environment_indices = environment_indices
+            )
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        # Each environment writes its first stack and then one frame a step.
+        assert len(memory_buffer) == 20
+        assert memory_buffer._frame_count == 2 * (3 + 25)
+        assert T.equal(batch.observations_next[:, -1, 0] % 100, batch.rewards)
+        assert T.equal(batch.observations_next[:, :-1], batch.observations_current[:, 1:])
+
+    def test_actor_batches_reuse_frames_within_the_batch(self):
+        memory_buffer = S.MemoryFrameStackReplayBuffer(20, 3)
+
+        for start in range(0, 40, 4):
+            memory_buffer.push_transitions(
+                T.cat([self._stacks([0], i) for i in range(start, start + 4)]),
+                T.zeros(4, dtype = T.int64),
+                T.arange(start + 1, start + 5, dtype = T.float32),
+                T.cat([self._stacks([0], i + 1) for i in range(start, start + 4)]),
+                T.zeros(4, dtype = T.bool),
+                environment_indices = T.zeros(4, dtype = T.int64)
+            )
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert len(memory_buffer) == 20
+        assert memory_buffer._frame_count == 3 + 40
+        assert batch.observations_next[:, -1, 0].tolist() == batch.rewards.tolist()
+
+    def test_rebuilt_rings_do_not_reuse_stored_frames(self):
+        memory_buffer = S.MemoryFrameStackReplayBuffer(100, 3)
+
+        self._push_episode(memory_buffer, S.EnvironmentTransformFrameStack(EnvironmentCounter(), 3), 2)
+
+        # A new ring starts counting its frames from zero again, which must
+        # not be mistaken for the frames of the old one.
+        ring = FrameRing(4)
+        ring.append(T.full((1, 2), 50.))
+
+        observation = FrameStack(ring, (0, 0, 0))
+        observation_next = FrameStack(ring, (0, 0, ring.append(T.full((1, 2), 51.))))
+
+        memory_buffer.add_observation_current(observation)
+        memory_buffer.add_action(T.as_tensor(0))
+        memory_buffer.add_observation_next(observation_next)
+        memory_buffer.add_reward(0.)
+        memory_buffer.add_done(False)
+        memory_buffer.push()
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert batch.observations_current[-1, :, 0].tolist() == [50., 50., 50.]
+        assert batch.observations_next[-1, :, 0].tolist() == [50., 50., 51.]
@@ -0,0 +1,76 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import torch as T
+
+import sophiedl as S
+
+def push(memory_buffer, observations_current, observations_next):
+    count = observations_current.shape[0]
+
+    memory_buffer.push_transitions(
+        observations_current,
+        T.zeros(count, dtype = T.int64),
+        T.zeros(count),
+        observations_next,
+        T.zeros(count, dtype = T.bool)
+    )
+
+class TestMemoryMappedReplayBuffer(object):
+    def test_observations_are_stored_as_uint8_on_disk(self, tmp_path):
+        memory_buffer = S.MemoryMappedReplayBuffer(4, path = str(tmp_path))
+
+        observations = T.rand(3, 2, 5)
+        push(memory_buffer, observations, observations.flip(dims = (0,)))
+
+        assert memory_buffer.observations_current.dtype == T.uint8
+        assert sorted(os.listdir(str(tmp_path))) == ["observations_0.bin", "observations_1.bin"]
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert batch.observations_current.dtype == T.float32
+        assert T.allclose(batch.observations_current, observations, atol = 0.5 / 255)
+        assert T.allclose(batch.observations_next, observations.flip(dims = (0,)), atol = 0.5 / 255)
+
+        memory_buffer.close()
+
+    def test_uint8_observations_round_trip_exactly(self):
+        memory_buffer = S.MemoryMappedReplayBuffer(4)
+
+        observations = T.randint(256, (2, 3, 3), dtype = T.uint8)
+        push(memory_buffer, observations, observations)
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert T.equal((batch.observations_current * 255).round().to(T.uint8), observations)
+
+        memory_buffer.close()
+
+    def test_temporary_directory_is_removed_on_close(self):
+        memory_buffer = S.MemoryMappedReplayBuffer(2)
+
+        push(memory_buffer, T.zeros(1, 4), T.ones(1, 4))
+
+        path = memory_buffer.path
+
+        assert os.path.isdir(path)
+
+        memory_buffer.close()
+
+        assert not os.path.exists(path)
+
+    def test_frames_are_released_on_close(self):
+        memory_buffer = S.MemoryMappedFrameReplayBuffer(2)
+
+        push(memory_buffer, T.zeros(1, 4), T.ones(1, 4))
+
+        path = memory_buffer.path
+
+        assert memory_buffer.frames is not None
+
+        memory_buffer.close()
+
+        assert memory_buffer.frames is None
+        assert not os.path.exists(path)
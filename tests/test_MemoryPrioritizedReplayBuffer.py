@@ -0,0 +1,163 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import pytest
+import torch as T
+
+import sophiedl as S
+
+class TestSumTree(object):
+    def test_total_and_leaves(self):
+        sum_tree = S.SumTree(5)
+
+        sum_tree.update(T.arange(5), T.as_tensor([1., 2., 3., 4., 5.]))
+
+        assert sum_tree.total == 15.
+        assert sum_tree[T.as_tensor([0, 4])].tolist() == [1., 5.]
+
+        sum_tree.update(T.as_tensor([1, 3]), T.as_tensor([0., 10.]))
+
+        assert sum_tree.total == 19.
+
+    def test_find_maps_prefix_sums_to_leaves(self):
+        sum_tree = S.SumTree(4)
+
+        sum_tree.update(T.arange(4), T.as_tensor([1., 0., 2., 3.]))
+
+        found = sum_tree.find(T.as_tensor([0., 0.5, 1., 2.9, 3., 5.99]))
+
+        assert found.tolist() == [0, 0, 2, 2, 3, 3]
+
+    def test_find_never_returns_empty_leaves(self):
+        sum_tree = S.SumTree(7)
+
+        sum_tree.update(T.as_tensor([2, 5]), T.as_tensor([1., 1.]))
+
+        # Values at or past the total, as rounding can produce, still land on
+        # a leaf with a priority.
+        found = sum_tree.find(T.linspace(0., sum_tree.total, 50))
+
+        assert set(found.tolist()) <= {2, 5}
+
+    def test_sampling_frequencies_follow_priorities(self):
+        T.manual_seed(0)
+
+        sum_tree = S.SumTree(3)
+        sum_tree.update(T.arange(3), T.as_tensor([1., 2., 7.]))
+
+        found = sum_tree.find(T.rand(20000, dtype = T.float64) * sum_tree.total)
+        frequencies = T.bincount(found, minlength = 3).to(T.float64) / found.shape[0]
+
+        assert T.allclose(frequencies, T.as_tensor([.1, .2, .7], dtype = T.float64), atol = 0.02)
+
+class TestMemoryPrioritizedReplayBuffer(object):
+    def _push(self, memory_buffer, count):
+        memory_buffer.push_transitions(
+            T.arange(count, dtype = T.float32).unsqueeze(dim = 1),
+            T.zeros(count, dtype = T.int64),
+            T.arange(count, dtype = T.float32),
+            T.arange(count, dtype = T.float32).unsqueeze(dim = 1) + 1,
+            T.zeros(count, dtype = T.bool)
+        )
+
+    def test_new_memories_get_the_maximum_priority(self):
+        memory_buffer = S.MemoryPrioritizedReplayBuffer(8, alpha = 1.)
+
+        self._push(memory_buffer, 2)
+        memory_buffer.update_priorities(T.as_tensor([0, 1]), T.as_tensor([3., 0.5]))
+        self._push(memory_buffer, 1)
+
+        assert memory_buffer.sum_tree[T.as_tensor([2])].item() == pytest.approx(3. + memory_buffer.epsilon)
+
+    def test_sampling_prefers_high_priorities_and_weights_them_down(self):
+        T.manual_seed(0)
+
+        memory_buffer = S.MemoryPrioritizedReplayBuffer(4, alpha = 1., beta = 1.)
+
+        self._push(memory_buffer, 4)
+        memory_buffer.update_priorities(T.arange(4), T.as_tensor([1., 1., 1., 7.]))
+
+        batch = memory_buffer.sample(1000, T.device("cpu"))
+
+        assert (batch.indices == 3).float().mean().item() == pytest.approx(0.7, abs = 0.05)
+
+        # With beta = 1 the weights undo the sampling bias, normalized to the
+        # least likely memory.
+        assert T.allclose(batch.weights[batch.indices != 3], T.ones(1))
+        assert T.allclose(batch.weights[batch.indices == 3], T.as_tensor(1. / 7.), atol = 1e-5)
+
+    def test_evicted_slots_are_reused_with_their_new_priority(self):
+        memory_buffer = S.MemoryPrioritizedReplayBuffer(2, alpha = 1.)
+
+        self._push(memory_buffer, 2)
+        memory_buffer.update_priorities(T.arange(2), T.as_tensor([5., 1.]))
+        self._push(memory_buffer, 2)
+
+        assert len(memory_buffer) == 2
+        assert memory_buffer.sum_tree.total == pytest.approx(2 * (5. + memory_buffer.epsilon))
+
+    def test_clear_resets_priorities(self):
+        memory_buffer = S.MemoryPrioritizedReplayBuffer(4)
+
+        self._push(memory_buffer, 3)
+        memory_buffer.update_priorities(T.arange(3), T.as_tensor([4., 4., 4.]))
+        memory_buffer.clear()
+
+        assert len(memory_buffer) == 0
+        assert memory_buffer.sum_tree.total == 0.
+
+class TestMemoryPrioritizedFrameReplayBuffer(object):
+    def _push_episode(self, memory_buffer, start, length):
+        for i in range(length):
+            memory_buffer.add_observation_current(T.full((3,), float(start + i)))
+            memory_buffer.add_action(T.as_tensor(0))
+            memory_buffer.add_observation_next(T.full((3,), float(start + i + 1)))
+            memory_buffer.add_reward(float(start + i))
+            memory_buffer.add_done(i == length - 1)
+            memory_buffer.push()
+
+    def test_transitions_evicted_for_their_frames_are_never_sampled(self):
+        T.manual_seed(0)
+
+        memory_buffer = S.MemoryPrioritizedFrameReplayBuffer(100, frame_capacity = 8, alpha = 1.)
+
+        for episode in range(10):
+            self._push_episode(memory_buffer, 100 * episode, 5)
+
+        batch = memory_buffer.sample(256, T.device("cpu"))
+
+        assert len(memory_buffer) < 8
+        assert memory_buffer.sum_tree.total == pytest.approx(len(memory_buffer))
+        assert T.equal(batch.observations_current[:, 0], batch.rewards)
+        assert T.equal(batch.observations_next[:, 0], batch.rewards + 1)
+
+    def test_priorities_of_evicted_transitions_are_dropped(self):
+        memory_buffer = S.MemoryPrioritizedFrameReplayBuffer(100, frame_capacity = 8, alpha = 1.)
+
+        self._push_episode(memory_buffer, 0, 5)
+        indices = memory_buffer.sample(16, T.device("cpu")).indices
+        self._push_episode(memory_buffer, 100, 5)
+
+        memory_buffer.update_priorities(indices, T.full(indices.shape, 9.))
+
+        stored = (T.arange(100) - memory_buffer._head) % 100 < len(memory_buffer)
+
+        assert (memory_buffer.sum_tree[T.arange(100)][~stored] == 0).all()
+
+    def test_frame_stacks_can_be_prioritized(self):
+        memory_buffer = S.MemoryPrioritizedFrameStackReplayBuffer(16, stack_count = 2, alpha = 1.)
+
+        memory_buffer.push_transitions(
+            T.arange(8, dtype = T.float32).reshape(2, 4),
+            T.zeros(2, dtype = T.int64),
+            T.zeros(2),
+            T.arange(8, dtype = T.float32).reshape(2, 4) + 1,
+            T.zeros(2, dtype = T.bool)
+        )
+
+        batch = memory_buffer.sample(8, T.device("cpu"))
+
+        assert memory_buffer.sum_tree.total == pytest.approx(2.)
+        assert T.equal(batch.observations_next - batch.observations_current, T.ones(8, 4))
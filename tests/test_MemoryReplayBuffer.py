@@ -0,0 +1,120 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import pytest
+import torch as T
+
+import sophiedl as S
+
+def push_step(memory_buffer, i, environment_index = 0):
+    memory_buffer.add_observation_current(T.full((2,), float(i)))
+    memory_buffer.add_action(T.as_tensor(i % 3))
+    memory_buffer.add_observation_next(T.full((2,), float(i + 1)))
+    memory_buffer.add_reward(float(i))
+    memory_buffer.add_done(i % 4 == 3)
+    memory_buffer.memory_staging.environment_index = environment_index
+    memory_buffer.push()
+
+class TestMemoryReplayBuffer(object):
+    def test_push_and_read_all_in_order(self):
+        memory_buffer = S.MemoryReplayBuffer(8)
+
+        for i in range(5):
+            push_step(memory_buffer, i)
+
+        assert len(memory_buffer) == 5
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert batch.observations_current[:, 0].tolist() == [0., 1., 2., 3., 4.]
+        assert batch.observations_next[:, 0].tolist() == [1., 2., 3., 4., 5.]
+        assert batch.actions.tolist() == [0, 1, 2, 0, 1]
+        assert batch.rewards.tolist() == [0., 1., 2., 3., 4.]
+        assert batch.dones.tolist() == [False, False, False, True, False]
+        assert batch.weights.tolist() == [1.] * 5
+
+    def test_oldest_memories_are_evicted_at_capacity(self):
+        memory_buffer = S.MemoryReplayBuffer(4)
+
+        for i in range(10):
+            push_step(memory_buffer, i)
+
+        assert len(memory_buffer) == 4
+        assert memory_buffer.read_all(T.device("cpu")).rewards.tolist() == [6., 7., 8., 9.]
+
+    def test_push_transitions_wraps_around(self):
+        memory_buffer = S.MemoryReplayBuffer(5)
+
+        for i in range(3):
+            push_step(memory_buffer, i)
+
+        memory_buffer.push_transitions(
+            T.arange(4, dtype = T.float32).unsqueeze(dim = 1).expand(4, 2) + 10,
+            T.as_tensor([0, 1, 2, 0]),
+            T.as_tensor([10., 11., 12., 13.]),
+            T.arange(4, dtype = T.float32).unsqueeze(dim = 1).expand(4, 2) + 11,
+            T.as_tensor([False, True, False, False]),
+            environment_indices = T.as_tensor([0, 1, 0, 1])
+        )
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert len(memory_buffer) == 5
+        assert batch.rewards.tolist() == [2., 10., 11., 12., 13.]
+        assert batch.observations_current[:, 1].tolist() == [2., 10., 11., 12., 13.]
+        assert batch.environment_indices.tolist() == [0, 0, 1, 0, 1]
+
+    def test_sample_only_returns_stored_memories(self):
+        memory_buffer = S.MemoryReplayBuffer(16)
+
+        for i in range(6):
+            push_step(memory_buffer, i)
+
+        batch = memory_buffer.sample(64, T.device("cpu"))
+
+        assert batch.observations_current.shape == (64, 2)
+        assert set(batch.rewards.tolist()) <= {0., 1., 2., 3., 4., 5.}
+        assert T.equal(batch.observations_next - batch.observations_current, T.ones(64, 2))
+
+    def test_clear_and_empty_sample(self):
+        memory_buffer = S.MemoryReplayBuffer(4)
+
+        with pytest.raises(Exception):
+            memory_buffer.sample(1, T.device("cpu"))
+
+        for i in range(3):
+            push_step(memory_buffer, i)
+
+        memory_buffer.clear()
+
+        assert len(memory_buffer) == 0
+
+        with pytest.raises(Exception):
+            memory_buffer.sample(1, T.device("cpu"))
+
+class TestMemoryReplayBufferBatches(object):
+    def test_staged_batches_are_pushed_per_environment(self):
+        memory_buffer = S.MemoryReplayBuffer(16)
+
+        # Environments 0 and 2 act, then only environment 2 finishes its step.
+        memory_buffer.add_batch(T.as_tensor([0, 2]), T.as_tensor([[0., 0.], [2., 2.]]), T.as_tensor([5, 7]))
+        memory_buffer.push_batch(T.as_tensor([2]), T.as_tensor([1.]), T.as_tensor([[3., 3.]]), T.as_tensor([False]))
+
+        memory_buffer.add_batch(T.as_tensor([2]), T.as_tensor([[3., 3.]]), T.as_tensor([8]))
+        memory_buffer.push_batch(T.as_tensor([0, 2]), T.as_tensor([2., 3.]), T.as_tensor([[1., 1.], [4., 4.]]), T.as_tensor([True, False]))
+
+        batch = memory_buffer.read_all(T.device("cpu"))
+
+        assert batch.environment_indices.tolist() == [2, 0, 2]
+        assert batch.observations_current[:, 0].tolist() == [2., 0., 3.]
+        assert batch.observations_next[:, 0].tolist() == [3., 1., 4.]
+        assert batch.actions.tolist() == [7, 5, 8]
+        assert batch.dones.tolist() == [False, True, False]
+
+    def test_pushing_without_a_staged_batch_fails(self):
+        memory_buffer = S.MemoryReplayBuffer(4)
+
+        with pytest.raises(Exception):
+            memory_buffer.push_batch(T.as_tensor([0]), T.ones(1), T.ones(1, 2), T.zeros(1, dtype = T.bool))
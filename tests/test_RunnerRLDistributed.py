@@ -0,0 +1,119 @@
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+import torch.nn as nn
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+from sophiedl.running.RunnerRLDistributed import _run_actor
+
+class EnvironmentEndless(S.EnvironmentBase):
+    # Pays one per step and never ends by itself.
+    def __init__(self):
+        super().__init__(np.ndarray, int)
+
+    def on_get_observation_space_shape(self):
+        return (4,)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def on_reset(self):
+        return np.zeros(4, dtype = np.float32)
+
+    def on_step(self, action):
+        return EnvironmentStepResult(np.zeros(4, dtype = np.float32), 1., False, {})
+
+class QueueStopping(object):
+    # Keeps the first batch and stops the actor.
+    def __init__(self, stopping):
+        self.stopping = stopping
+        self.batches = []
+
+    def put(self, batch):
+        self.batches.append(batch)
+        self.stopping.set()
+
+def create_hyperparameter_set(runner_factory, actor_count = 2, **hyperparameters):
+    hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+    hyperparameter_set["episode_count"] = 5
+    hyperparameter_set.add("distributed_actor_count", actor_count)
+
+    for key, value in hyperparameters.items():
+        hyperparameter_set.add(key, value)
+
+    return hyperparameter_set
+
+class TestRunnerRLDistributed(object):
+    def test_actors_feed_the_learner(self):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        runner = runner_factory.create_runner(hyperparameter_set = create_hyperparameter_set(runner_factory))
+
+        assert isinstance(runner, S.RunnerRLDistributed)
+
+        runner.run()
+
+        assert runner.context.episode_index == 5
+        assert runner.context.step_index_total == len(runner.agent.memory_buffer)
+        assert runner._processes == []
+
+    def test_actors_cut_episodes_at_the_maximum_length(self):
+        network = nn.Linear(4, 2)
+        stopping = threading.Event()
+        transition_queue = QueueStopping(stopping)
+        thread_count = T.get_num_threads()
+
+        try:
+            _run_actor(0, EnvironmentEndless, network, 1., transition_queue, S.SharedParameters(network), stopping, 12, 100, 5)
+        finally:
+            T.set_num_threads(thread_count)
+
+        # Episodes end after as many steps as RunnerRL takes.
+        assert transition_queue.batches[0][-1] == [(6., 6), (6., 6)]
+
+    def test_actor_epsilons_follow_ape_x(self):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        runner = runner_factory.create_runner(hyperparameter_set = create_hyperparameter_set(
+            runner_factory,
+            actor_count = 3,
+            distributed_epsilon = 0.4,
+            distributed_epsilon_alpha = 7.
+        ))
+
+        assert runner.actor_epsilons == pytest.approx([0.4, 0.4 ** 4.5, 0.4 ** 8])
+
+    def test_the_learner_environment_is_not_primary(self):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+        primaries = []
+        create_environment = runner_factory._create_environment
+
+        def create_environment_recorded(hyperparameter_set, primary = True):
+            primaries.append(primary)
+
+            return create_environment(hyperparameter_set, primary)
+
+        runner_factory._create_environment = create_environment_recorded
+        runner_factory.create_runner(hyperparameter_set = create_hyperparameter_set(runner_factory))
+
+        assert primaries == [False]
+
+    @pytest.mark.parametrize("key, value", [("environment_trace_record", "trace"), ("environment_reset_pool", 4)])
+    def test_primary_only_options_are_rejected(self, key, value):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        with pytest.raises(Exception):
+            runner_factory.create_runner(hyperparameter_set = create_hyperparameter_set(runner_factory, **{key: value}))
+
+    def test_other_agents_are_rejected(self):
+        runner_factory = S.RunnerRLFactoryDiscreteActorCriticCartPoleV0()
+
+        with pytest.raises(Exception):
+            runner_factory.create_runner(hyperparameter_set = create_hyperparameter_set(runner_factory))
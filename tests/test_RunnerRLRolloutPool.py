@@ -0,0 +1,188 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+
+class EnvironmentCorridor(S.EnvironmentBase):
+    # Shaped like CartPole, observes the step index and pays one per step
+    # until the episode ends after length steps.
+    def __init__(self, length = 5):
+        super().__init__(np.ndarray, int)
+
+        self.length = length
+        self.step_index = 0
+
+    def on_get_observation_space_shape(self):
+        return (4,)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def _observe(self):
+        return np.full(4, self.step_index, dtype = np.float32)
+
+    def on_reset(self):
+        self.step_index = 0
+
+        return self._observe()
+
+    def on_step(self, action):
+        self.step_index += 1
+
+        return EnvironmentStepResult(self._observe(), 1., self.step_index >= self.length, {})
+
+def create_hyperparameter_set(runner_factory, **hyperparameters):
+    hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+    hyperparameter_set["episode_count"] = 4
+
+    for key, value in hyperparameters.items():
+        hyperparameter_set.add(key, value)
+
+    return hyperparameter_set
+
+def create_agent():
+    runner_factory = S.RunnerRLFactoryDiscreteActorCriticCartPoleV0()
+
+    return runner_factory.on_create_agent(EnvironmentCorridor(), runner_factory.create_default_hyperparameter_set())
+
+class TestRolloutPool(object):
+    def test_episodes_are_split_between_the_workers(self):
+        pool = S.RolloutPool(EnvironmentCorridor, create_agent(), 2)
+
+        try:
+            trajectories = pool.collect(3)
+        finally:
+            pool.close()
+
+        assert trajectories.episode_lengths.tolist() == [5, 5, 5]
+        assert trajectories.environment_indices.tolist() == [0] * 5 + [1] * 5 + [2] * 5
+        assert trajectories.rewards.tolist() == [1.] * 15
+        assert trajectories.dones.tolist() == ([False] * 4 + [True]) * 3
+        assert trajectories.observations_current[:5, 0].tolist() == [0., 1., 2., 3., 4.]
+        assert trajectories.observations_next[:5, 0].tolist() == [1., 2., 3., 4., 5.]
+        assert trajectories.actions.shape[0] == 15
+
+    def test_episodes_are_cut_off_at_the_maximum_length(self):
+        pool = S.RolloutPool(EnvironmentCorridor, create_agent(), 1, episode_max_length = 2)
+
+        try:
+            trajectories = pool.collect(2)
+        finally:
+            pool.close()
+
+        assert trajectories.episode_lengths.tolist() == [3, 3]
+        assert trajectories.dones.tolist() == [False, False, False] * 2
+        assert trajectories.truncations.tolist() == [False, False, True] * 2
+
+    def test_cut_off_episodes_bootstrap_from_the_last_observation(self):
+        pool = S.RolloutPool(EnvironmentCorridor, create_agent(), 1, episode_max_length = 2)
+
+        try:
+            trajectories = pool.collect(2)
+        finally:
+            pool.close()
+
+        memory_buffer = S.MemoryReplayBuffer(6)
+        memory_buffer.push_transitions(
+            trajectories.observations_current,
+            trajectories.actions,
+            trajectories.rewards,
+            trajectories.observations_next,
+            trajectories.dones,
+            action_samples = trajectories.action_samples,
+            environment_indices = trajectories.environment_indices,
+            truncations = trajectories.truncations
+        )
+
+        rollout = memory_buffer.read_all(T.device("cpu"))
+        advantages = S.generalized_advantage_estimates(
+            rollout.rewards,
+            T.zeros(6),
+            T.ones(6),
+            rollout.dones,
+            0.5,
+            1.,
+            rollout.environment_indices,
+            rollout.truncations
+        )
+
+        # The truncated step counts the next value like any other step, and
+        # the ones before it continue into it.
+        assert advantages.tolist() == [1.5 + 0.5 * (1.5 + 0.5 * 1.5), 1.5 + 0.5 * 1.5, 1.5] * 2
+
+    def test_networks_are_published_for_every_collection(self):
+        agent = create_agent()
+        pool = S.RolloutPool(EnvironmentCorridor, agent, 1)
+
+        try:
+            pool.collect(1)
+
+            with T.no_grad():
+                for network in agent.acting_networks:
+                    for parameter in network.parameters():
+                        parameter.fill_(0.5)
+
+            pool.collect(1)
+        finally:
+            pool.close()
+
+        assert all(i.version == 2 for i in pool._shared_parameters)
+
+    def test_cut_off_episodes_are_learned_by_policy_gradients(self):
+        runner_factory = S.RunnerRLFactoryPGOLunarLanderV2()
+        agent = runner_factory.on_create_agent(EnvironmentCorridor(), runner_factory.create_default_hyperparameter_set())
+        pool = S.RolloutPool(EnvironmentCorridor, agent, 1, episode_max_length = 3)
+
+        try:
+            trajectories = pool.collect(2)
+        finally:
+            pool.close()
+
+        agent.memory_buffer.push_transitions(
+            trajectories.observations_current,
+            trajectories.actions,
+            trajectories.rewards,
+            trajectories.observations_next,
+            trajectories.dones,
+            environment_indices = trajectories.environment_indices,
+            truncations = trajectories.truncations
+        )
+
+        runner_context = S.RunnerRLContext(None, None)
+        runner_context.done = True
+
+        agent.learn(runner_context)
+
+        # Both episodes ended at the cut, none is carried over unlearned.
+        assert trajectories.episode_lengths.tolist() == [4, 4]
+        assert len(agent.memory_buffer) == 0
+
+class TestRunnerRLRolloutPool(object):
+    def test_learns_from_collected_episodes(self):
+        runner_factory = S.RunnerRLFactoryDiscreteActorCriticCartPoleV0()
+
+        runner = runner_factory.create_runner(hyperparameter_set = create_hyperparameter_set(
+            runner_factory,
+            rollout_pool_size = 2,
+            rollout_pool_worker_count = 2
+        ))
+
+        assert isinstance(runner, S.RunnerRLRolloutPool)
+
+        runner.run()
+
+        assert runner.context.episode_index == 4
+        assert runner.context.step_index_total > 0
+
+    def test_agents_that_are_not_on_policy_are_rejected(self):
+        runner_factory = S.RunnerRLFactoryDQNCartPoleV0()
+
+        with pytest.raises(Exception):
+            runner_factory.create_runner(hyperparameter_set = create_hyperparameter_set(runner_factory, rollout_pool_size = 2))
@@ -0,0 +1,54 @@
+import copy
+import os
+import pickle
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+
+import sophiedl as S
+
+class TestShape(object):
+    def test_shapes_are_tuples_of_ints(self):
+        shape = S.Shape([np.int64(2), 3.0])
+
+        assert shape == (2, 3)
+        assert all(type(i) is int for i in shape)
+        assert hash(shape) == hash((2, 3))
+        assert shape.flat_size == 6
+
+    def test_only_explicitly_interned_shapes_are_kept(self):
+        before = len(S.Shape._interned)
+
+        for i in range(100):
+            S.Shape.get_shape(T.zeros(i + 1000, 1))
+
+        assert len(S.Shape._interned) == before
+
+        interned = S.Shape.intern((7, 1001))
+
+        assert S.Shape.intern([7, 1001]) is interned
+        assert S.Shape.intern(S.Shape((7, 1001))) is interned
+
+    def test_copies_are_the_same_object(self):
+        shape = S.Shape((1, 2))
+
+        assert copy.copy(shape) is shape
+        assert copy.deepcopy(shape) is shape
+        assert S.Shape.to_shape(shape) is shape
+
+    def test_shapes_survive_pickling(self):
+        shape = pickle.loads(pickle.dumps(S.Shape((4, 5))))
+
+        assert type(shape) is S.Shape
+        assert shape == (4, 5)
+
+    def test_get_shape(self):
+        assert S.Shape.get_shape(np.zeros((2, 3))) == (2, 3)
+        assert S.Shape.get_shape(T.zeros(4)) == (4,)
+
+        with pytest.raises(TypeError):
+            S.Shape.get_shape([1, 2])
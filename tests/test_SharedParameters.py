@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import torch as T
+import torch.nn as nn
+
+import sophiedl as S
+
+class SequenceScripted(object):
+    # Stands in for the shared sequence counter, reading the given values one
+    # after the other as if a writer were publishing meanwhile.
+    def __init__(self, values):
+        self.values = list(values)
+
+    def item(self):
+        return self.values.pop(0)
+
+def create_module(value = 0.):
+    module = nn.Linear(3, 2)
+
+    with T.no_grad():
+        for parameter in module.parameters():
+            parameter.fill_(value)
+
+    return module
+
+def create_network():
+    return S.OptimizedSequential(
+        nn.Linear(3, 2),
+        optimizer_factory = S.OptimizedSequential.optimizer_factory_adam,
+        learning_rate = 0.001
+    )
+
+def publish_filled(shared_parameters, value):
+    shared_parameters.publish(create_module(value))
+
+class TestSharedParameters(object):
+    def test_published_weights_are_loaded_once(self):
+        shared_parameters = S.SharedParameters(create_module(1.))
+        module = create_module(0.)
+
+        # Nothing was published yet.
+        assert shared_parameters.version == 0
+        assert not shared_parameters.load(module)
+
+        assert shared_parameters.publish(create_module(2.)) == 1
+        assert shared_parameters.version == 1
+        assert shared_parameters.load(module)
+        assert T.all(module.weight == 2.)
+        assert not shared_parameters.load(module)
+
+        shared_parameters.publish(create_module(3.))
+        shared_parameters.publish(create_module(4.))
+
+        assert shared_parameters.version == 3
+        assert shared_parameters.load(module)
+        assert T.all(module.bias == 4.)
+
+    def test_weights_being_written_are_not_loaded(self):
+        shared_parameters = S.SharedParameters(create_module())
+        shared_parameters.publish(create_module(2.))
+        shared_parameters._sequence.fill_(3)
+
+        module = create_module(1.)
+
+        assert not shared_parameters.load(module)
+        assert T.all(module.weight == 1.)
+
+    def test_torn_reads_are_retried(self):
+        shared_parameters = S.SharedParameters(create_module(), attempt_count = 3)
+        shared_parameters.publish(create_module(2.))
+
+        # The first copy overlaps a publish, the second one does not.
+        shared_parameters._sequence = SequenceScripted([2, 4, 4, 4])
+
+        assert shared_parameters.load(create_module())
+        assert shared_parameters._loaded_sequence == 4
+
+    def test_loading_gives_up_after_the_attempts(self):
+        shared_parameters = S.SharedParameters(create_module(), attempt_count = 2)
+        shared_parameters._sequence = SequenceScripted([2, 4, 4, 6])
+
+        module = create_module(1.)
+
+        # Neither torn copy reaches the module.
+        assert not shared_parameters.load(module)
+        assert shared_parameters._loaded_sequence == 0
+        assert T.all(module.weight == 1.)
+        assert T.all(module.bias == 1.)
+
+    def test_torn_reads_followed_by_a_publish_keep_the_weights(self):
+        shared_parameters = S.SharedParameters(create_module(), attempt_count = 3)
+        shared_parameters._sequence = SequenceScripted([2, 4, 5])
+
+        module = create_module(1.)
+
+        assert not shared_parameters.load(module)
+        assert T.all(module.weight == 1.)
+
+    def test_weights_published_in_another_process_are_shared(self):
+        shared_parameters = S.SharedParameters(create_module())
+
+        process = multiprocessing.get_context("fork").Process(target = publish_filled, args = (shared_parameters, 5.))
+        process.start()
+        process.join()
+
+        module = create_module()
+
+        assert process.exitcode == 0
+        assert shared_parameters.version == 1
+        assert shared_parameters.load(module)
+        assert T.all(module.weight == 5.)
+
+    def test_modules_share_their_parameters(self):
+        network = create_network()
+        shared_parameters = network.share_parameters()
+
+        with T.no_grad():
+            network[0].weight.fill_(7.)
+
+        shared_parameters.publish(network)
+
+        module = create_network()
+
+        assert shared_parameters.load(module)
+        assert T.all(module[0].weight == 7.)
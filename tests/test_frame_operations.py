@@ -0,0 +1,129 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+from PIL import Image
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+from sophiedl.environment.frame_operations import crop, grayscale, resize_area
+
+def random_frames(*shape, seed = 0):
+    return np.random.RandomState(seed).randint(0, 256, size = shape, dtype = np.uint8)
+
+class EnvironmentFrames(S.EnvironmentBase):
+    # Produces random RGB screens, channels last, as emulators do.
+    def __init__(self):
+        super().__init__(np.ndarray, int)
+
+        self.random_state = np.random.RandomState(0)
+
+    def on_get_observation_space_shape(self):
+        return (12, 16, 3)
+
+    def on_get_action_space_shape(self):
+        return (2,)
+
+    def _observe(self):
+        return self.random_state.randint(0, 256, size = (12, 16, 3), dtype = np.uint8)
+
+    def on_reset(self):
+        return self._observe()
+
+    def on_step(self, action):
+        return EnvironmentStepResult(self._observe(), 0., False, {})
+
+class TestGrayscale(object):
+    def test_stays_within_one_level_of_pil(self):
+        frame = random_frames(32, 48, 3)
+
+        expected = np.asarray(Image.fromarray(frame).convert("L"), dtype = np.int32)
+        luminance = grayscale(frame)
+
+        assert luminance.dtype == T.uint8
+        assert luminance.shape == (1, 32, 48)
+        assert np.abs(luminance[0].numpy().astype(np.int32) - expected).max() <= 1
+
+    def test_numpy_tensor_and_channel_layouts_agree(self):
+        frames = random_frames(4, 10, 12, 3)
+        luminance = grayscale(frames)
+
+        assert luminance.shape == (4, 1, 10, 12)
+        assert T.equal(grayscale(T.from_numpy(frames)), luminance)
+        assert T.equal(grayscale(np.moveaxis(frames, -1, -3), channels_last = False), luminance)
+        assert T.equal(grayscale(T.from_numpy(frames).movedim(-1, -3), channels_last = False), luminance)
+
+    def test_reads_strided_views(self):
+        frame = random_frames(10, 12, 3)
+        flipped = frame[::-1]
+
+        assert T.equal(grayscale(flipped), grayscale(np.ascontiguousarray(flipped)))
+
+class TestResizeArea(object):
+    def test_integer_factors_average_blocks(self):
+        frames = T.arange(16, dtype = T.uint8).reshape(1, 4, 4)
+
+        resized = resize_area(frames, 2, 2)
+
+        assert resized.dtype == T.uint8
+        assert resized.tolist() == [[[2, 4], [10, 12]]]
+
+    def test_other_sizes_match_area_interpolation(self):
+        frames = T.from_numpy(random_frames(3, 1, 10, 14))
+
+        resized = resize_area(frames, 4, 6)
+        expected = T.nn.functional.interpolate(frames.float(), size = (4, 6), mode = "area").round()
+
+        assert resized.shape == (3, 1, 4, 6)
+        assert T.equal(resized.float(), expected)
+
+    def test_frames_of_the_target_size_are_returned_as_is(self):
+        frames = T.from_numpy(random_frames(1, 8, 8))
+
+        assert resize_area(frames, 8, 8) is frames
+
+class TestCrop(object):
+    def test_returns_a_view(self):
+        frames = T.arange(2 * 1 * 5 * 6).reshape(2, 1, 5, 6)
+
+        cropped = crop(frames, 1, 2, 3, 4)
+
+        assert cropped.shape == (2, 1, 3, 4)
+        assert cropped.data_ptr() == frames[..., 1, 2].data_ptr()
+        assert T.equal(cropped, frames[..., 1:4, 2:6])
+
+    def test_out_of_bounds_fails(self):
+        with pytest.raises(Exception):
+            crop(T.zeros(1, 5, 6), 3, 0, 3, 6)
+
+class TestFrameTransforms(object):
+    def test_chain_produces_small_uint8_frames(self):
+        environment = S.EnvironmentTransformCrop(
+            S.EnvironmentTransformResize(S.EnvironmentTransformGrayscale(EnvironmentFrames()), 6, 8),
+            1, 0, 4, 8
+        )
+
+        assert tuple(environment.observation_space_shape) == (1, 4, 8)
+
+        observation = environment.reset()
+        step_observation = environment.step(0).observation
+
+        for i in (observation, step_observation):
+            assert i.dtype == T.uint8
+            assert tuple(i.shape) == (1, 4, 8)
+
+    def test_transforms_match_the_frame_operations(self):
+        frame = EnvironmentFrames().reset()
+
+        expected = crop(resize_area(grayscale(frame), 6, 8), 1, 0, 4, 8)
+
+        environment = S.EnvironmentTransformCrop(
+            S.EnvironmentTransformResize(S.EnvironmentTransformGrayscale(EnvironmentFrames()), 6, 8),
+            1, 0, 4, 8
+        )
+
+        assert T.equal(environment.reset(), expected)
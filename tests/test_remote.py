@@ -0,0 +1,268 @@
+import os
+import socket
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import numpy as np
+import pytest
+import torch as T
+
+import sophiedl as S
+from sophiedl.environment.EnvironmentBase import EnvironmentStepResult
+from sophiedl.environment.remote import (
+    format_remote_address,
+    parse_remote_address,
+    receive_remote_message,
+    REMOTE_STATUS_ERROR,
+    REMOTE_STATUS_OK,
+    send_remote_message
+)
+
+class EnvironmentCounter(S.EnvironmentBase):
+    # Observes the sum of its actions and how many steps it took, pays the
+    # action as reward and ends after length steps. Negative actions fail.
+    def __init__(self, length = 3):
+        super().__init__(np.ndarray, int)
+
+        self.length = length
+        self.action_sum = 0
+        self.step_index = 0
+
+    def on_get_observation_space_shape(self):
+        return (2,)
+
+    def on_get_action_space_shape(self):
+        return (4,)
+
+    def _observe(self):
+        return np.asarray([self.action_sum, self.step_index], dtype = np.float32)
+
+    def on_reset(self):
+        self.action_sum = 0
+        self.step_index = 0
+
+        return self._observe()
+
+    def on_step(self, action):
+        if action < 0:
+            raise Exception("negative action")
+
+        self.action_sum += action
+        self.step_index += 1
+
+        return EnvironmentStepResult(self._observe(), float(action), self.step_index >= self.length, {})
+
+def round_trip(document, status = REMOTE_STATUS_OK):
+    left, right = socket.socketpair()
+
+    with left, right:
+        send_remote_message(left, 7, status, document)
+
+        return receive_remote_message(right)
+
+class TestRemoteMessages(object):
+    def test_documents_survive_the_round_trip(self):
+        document = {
+            "command": "step",
+            "indices": [0, 2],
+            "nested": [{"value": np.float32(1.5)}, None, True, "text"],
+            "count": np.int64(3)
+        }
+
+        request_id, status, received = round_trip(document, REMOTE_STATUS_ERROR)
+
+        assert request_id == 7
+        assert status == REMOTE_STATUS_ERROR
+        assert received == {
+            "command": "step",
+            "indices": [0, 2],
+            "nested": [{"value": 1.5}, None, True, "text"],
+            "count": 3
+        }
+
+    def test_arrays_and_tensors_keep_their_type_dtype_and_shape(self):
+        document = {
+            "bytes": np.arange(5, dtype = np.uint8),
+            "floats": np.arange(6, dtype = np.float64).reshape(2, 3),
+            "tensor": T.arange(4, dtype = T.int16).reshape(2, 2),
+            "strided": np.arange(12, dtype = np.int32).reshape(3, 4)[:, ::2],
+            "empty": np.zeros((0, 3), dtype = np.float32)
+        }
+
+        _, _, received = round_trip(document)
+
+        for key in ("bytes", "floats", "strided", "empty"):
+            assert isinstance(received[key], np.ndarray)
+            assert received[key].dtype == document[key].dtype
+            assert np.array_equal(received[key], document[key])
+
+        assert isinstance(received["tensor"], T.Tensor)
+        assert T.equal(received["tensor"], document["tensor"])
+
+    def test_received_arrays_are_aligned_and_writable(self):
+        _, _, received = round_trip([np.arange(3, dtype = np.uint8), np.arange(3, dtype = np.float64)])
+
+        assert received[1].ctypes.data % 8 == 0
+
+        received[1][0] = 5.
+
+        assert received[1].tolist() == [5., 1., 2.]
+
+    def test_values_that_cannot_be_sent_fail(self):
+        left, right = socket.socketpair()
+
+        with left, right:
+            with pytest.raises(Exception):
+                send_remote_message(left, 0, REMOTE_STATUS_OK, {"objects": np.asarray([object()])})
+
+            with pytest.raises(Exception):
+                send_remote_message(left, 0, REMOTE_STATUS_OK, {"set": {1, 2}})
+
+    def test_closed_connections_end_the_message(self):
+        left, right = socket.socketpair()
+
+        with right:
+            left.close()
+
+            with pytest.raises(EOFError):
+                receive_remote_message(right)
+
+    def test_addresses(self):
+        assert parse_remote_address("unix:/tmp/socket") == (socket.AF_UNIX, "/tmp/socket")
+        assert parse_remote_address("127.0.0.1:5000") == (socket.AF_INET, ("127.0.0.1", 5000))
+        assert format_remote_address(socket.AF_INET, ("127.0.0.1", 5000)) == "127.0.0.1:5000"
+
+        with pytest.raises(Exception):
+            parse_remote_address("localhost")
+
+class TestEnvironmentRemote(object):
+    def test_steps_the_hosted_environment(self):
+        server = S.EnvironmentRemoteServer(EnvironmentCounter, 2).start()
+
+        try:
+            environment = S.EnvironmentRemote(server.address, environment_index = 1)
+
+            try:
+                assert environment.observation_space_shape == S.Shape((2,))
+                assert environment.reset().tolist() == [0., 0.]
+
+                observation, reward, done, _ = environment.step(2)
+
+                assert observation.tolist() == [2., 1.]
+                assert reward == 2.
+                assert not done
+                assert server.environments[1].action_sum == 2
+                assert server.environments[0].action_sum == 0
+            finally:
+                environment.close()
+        finally:
+            server.close()
+
+    def test_missing_environments_are_rejected(self):
+        server = S.EnvironmentRemoteServer(EnvironmentCounter).start()
+
+        try:
+            with pytest.raises(Exception):
+                S.EnvironmentRemote(server.address, environment_index = 1)
+        finally:
+            server.close()
+
+    def test_environment_failures_are_reported(self, tmp_path):
+        server = S.EnvironmentRemoteServer(EnvironmentCounter, address = "unix:" + str(tmp_path / "socket")).start()
+
+        try:
+            environment = S.EnvironmentRemote(server.address)
+            environment.reset()
+
+            with pytest.raises(Exception, match = "negative action"):
+                environment.step(-1)
+
+            # The connection stays usable.
+            assert environment.step(1).observation.tolist() == [1., 1.]
+
+            environment.close()
+        finally:
+            server.close()
+
+        assert not os.path.exists(str(tmp_path / "socket"))
+
+class TestEnvironmentVectorRemote(object):
+    def test_step_resets_finished_environments(self):
+        server = S.EnvironmentRemoteServer(EnvironmentCounter, 3).start()
+
+        try:
+            environment = S.EnvironmentVectorRemote(server.address)
+
+            try:
+                assert environment.environment_count == 3
+                assert environment.reset().tolist() == [[0., 0.]] * 3
+
+                for _ in range(2):
+                    environment.step(T.as_tensor([1, 2, 3]))
+
+                observations, rewards, dones, infos = environment.step(T.as_tensor([1, 2, 3]))
+
+                assert observations.tolist() == [[0., 0.]] * 3
+                assert rewards.tolist() == [1., 2., 3.]
+                assert dones.tolist() == [True, True, True]
+                assert infos[2]["terminal_observation"].tolist() == [9., 3.]
+            finally:
+                environment.close()
+        finally:
+            server.close()
+
+    def test_batches_in_flight_are_received_in_order(self):
+        server = S.EnvironmentRemoteServer(EnvironmentCounter, 4).start()
+
+        try:
+            environment = S.EnvironmentVectorRemote(server.address)
+
+            try:
+                environment.reset()
+                environment.send(T.as_tensor([1, 2]), T.as_tensor([3, 1]))
+                environment.send(T.as_tensor([3, 4]), T.as_tensor([0, 2]))
+
+                with pytest.raises(Exception):
+                    environment.send(T.as_tensor([1]), T.as_tensor([1]))
+
+                indices, observations, _, _, _ = environment.recv(3)
+
+                assert indices.tolist() == [3, 1, 0]
+                assert observations[:, 0].tolist() == [1., 2., 3.]
+
+                indices, observations, rewards, _, _ = environment.recv(1)
+
+                assert indices.tolist() == [2]
+                assert rewards.tolist() == [4.]
+                assert environment._pending_indices == set()
+            finally:
+                environment.close()
+        finally:
+            server.close()
+
+    def test_failed_batches_stop_stepping(self):
+        server = S.EnvironmentRemoteServer(EnvironmentCounter, 2).start()
+
+        try:
+            environment = S.EnvironmentVectorRemote(server.address)
+
+            try:
+                environment.reset()
+                environment.send(T.as_tensor([1, -1]), T.as_tensor([0, 1]))
+
+                with pytest.raises(Exception, match = "negative action"):
+                    environment.recv(2)
+
+                assert environment._pending_indices == set()
+
+                # The environments of the failed batch can be used again.
+                assert environment.reset().tolist() == [[0., 0.], [0., 0.]]
+
+                environment.send(T.as_tensor([1, 1]), T.as_tensor([0, 1]))
+
+                assert environment.recv(2).environment_indices.tolist() == [0, 1]
+            finally:
+                environment.close()
+        finally:
+            server.close()
@@ -0,0 +1,134 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+import pytest
+import torch as T
+
+import sophiedl as S
+
+class TestDiscountedReturns(object):
+    def test_matches_the_definition(self):
+        rewards = T.as_tensor([1., 2., 3., 4.])
+
+        returns = S.discounted_returns(rewards, 0.5)
+
+        assert returns.tolist() == [1. + 0.5 * 2. + 0.25 * 3. + 0.125 * 4., 2. + 0.5 * 3. + 0.25 * 4., 3. + 0.5 * 4., 4.]
+
+    def test_returns_do_not_cross_episode_ends(self):
+        rewards = T.as_tensor([1., 1., 1., 1., 1.])
+        dones = T.as_tensor([False, True, False, False, True])
+
+        returns = S.discounted_returns(rewards, 0.9, dones)
+
+        assert returns.tolist() == pytest.approx([1.9, 1., 2.71, 1.9, 1.])
+
+    def test_returns_do_not_cross_truncations(self):
+        rewards = T.as_tensor([1., 1., 1., 1.])
+        truncations = T.as_tensor([False, True, False, False])
+
+        returns = S.discounted_returns(rewards, 0.9, T.zeros(4, dtype = T.bool), truncations = truncations)
+
+        assert returns.tolist() == pytest.approx([1.9, 1., 1.9, 1.])
+
+    def test_bootstrap_continues_the_last_episode(self):
+        returns = S.discounted_returns(T.as_tensor([1., 1.]), 0.5, bootstrap = 4.)
+
+        assert returns.tolist() == [1. + 0.5 * (1. + 0.5 * 4.), 1. + 0.5 * 4.]
+
+    def test_empty_rewards(self):
+        assert S.discounted_returns(T.zeros(0), 0.9).shape == (0,)
+
+def reference_advantages(rewards, values, values_next, dones, gamma, lambda_, environment_indices, truncations):
+    advantages = [0.] * len(rewards)
+
+    for environment_index in set(environment_indices):
+        advantage = 0.
+
+        for i in reversed([i for i in range(len(rewards)) if environment_indices[i] == environment_index]):
+            delta = rewards[i] + (0. if dones[i] else gamma * values_next[i]) - values[i]
+            advantage = delta + (0. if dones[i] or truncations[i] else gamma * lambda_ * advantage)
+            advantages[i] = advantage
+
+    return T.as_tensor(advantages, dtype = T.float64)
+
+class TestGeneralizedAdvantageEstimates(object):
+    def _random_rollout(self, length, environment_count, seed = 0):
+        generator = T.Generator().manual_seed(seed)
+
+        return (
+            T.randn(length, generator = generator, dtype = T.float64),
+            T.randn(length, generator = generator, dtype = T.float64),
+            T.randn(length, generator = generator, dtype = T.float64),
+            T.rand(length, generator = generator) < 0.1,
+            T.randint(environment_count, (length,), generator = generator),
+            T.rand(length, generator = generator) < 0.05
+        )
+
+    def test_interleaved_environments_match_the_reference(self):
+        rewards, values, values_next, dones, environment_indices, truncations = self._random_rollout(500, 4)
+
+        advantages = S.generalized_advantage_estimates(
+            rewards, values, values_next, dones, 0.99, 0.95,
+            environment_indices = environment_indices,
+            truncations = truncations
+        )
+
+        expected = reference_advantages(
+            rewards.tolist(), values.tolist(), values_next.tolist(), dones.tolist(), 0.99, 0.95,
+            environment_indices.tolist(), truncations.tolist()
+        )
+
+        assert T.allclose(advantages, expected, rtol = 0., atol = 1e-12)
+
+    def test_lambda_one_without_cuts_is_the_discounted_return_minus_the_value(self):
+        rewards = T.as_tensor([1., 2., 3.], dtype = T.float64)
+        values = T.as_tensor([0.5, 0.25, 0.125], dtype = T.float64)
+        values_next = T.as_tensor([0.25, 0.125, 2.], dtype = T.float64)
+
+        advantages = S.generalized_advantage_estimates(rewards, values, values_next, T.zeros(3, dtype = T.bool), 0.5, 1.)
+
+        assert T.allclose(advantages, S.discounted_returns(rewards, 0.5, bootstrap = 2.) - values)
+
+    def test_truncation_bootstraps_but_cuts_the_trace(self):
+        rewards = T.ones(4, dtype = T.float64)
+        values = T.zeros(4, dtype = T.float64)
+        values_next = T.full((4,), 10., dtype = T.float64)
+        dones = T.zeros(4, dtype = T.bool)
+        truncations = T.as_tensor([False, True, False, False])
+
+        advantages = S.generalized_advantage_estimates(rewards, values, values_next, dones, 0.5, 1., truncations = truncations)
+
+        # The truncated step still counts the next value, but nothing of the
+        # following episode flows back into it.
+        assert advantages[1].item() == 1. + 0.5 * 10.
+        assert advantages[0].item() == (1. + 5.) + 0.5 * advantages[1].item()
+
+    def test_long_rollouts_take_linear_memory(self):
+        rewards, values, values_next, dones, environment_indices, truncations = self._random_rollout(100000, 8)
+
+        advantages = S.generalized_advantage_estimates(
+            rewards, values, values_next, dones, 0.99, 0.95,
+            environment_indices = environment_indices,
+            truncations = truncations
+        )
+
+        assert advantages.shape == (100000,)
+
+class TestEpisodeTruncation(object):
+    def test_runner_marks_episodes_cut_off_at_the_maximum_length(self):
+        runner_factory = S.RunnerRLFactoryDiscreteActorCriticCartPoleV0()
+
+        hyperparameter_set = runner_factory.create_default_hyperparameter_set()
+        hyperparameter_set["episode_count"] = 1
+        hyperparameter_set.add("episode_max_length", 4)
+        hyperparameter_set.add("rollout_length", 1000)
+
+        runner = runner_factory.create_runner(hyperparameter_set = hyperparameter_set)
+        runner.run()
+
+        memory_buffer = runner.agent.memory_buffer
+
+        assert len(memory_buffer) == 5
+        assert memory_buffer.read_all(T.device("cpu")).truncations.tolist() == [False] * 4 + [True]